@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""List the variants in variants.json whose generated project changed since a git ref.
+
+Every template file changed since the ref is rendered, at the ref and in the working
+tree, with the context of each variant, exactly as cookiecutter would render it. A
+variant is affected when a changed file is generated for it at either point and the
+rendered path or content differs; paths the post-generation hook's manifest removes
+for a variant count as not generated. Edits inside ``{% if cookiecutter.web %}`` blocks,
+or to files under a directory gated by ``cookiecutter.api``, therefore only select
+the variants with those options enabled.
+
+Changes to cookiecutter.json, the post-generation hook or the scripts that generate
+and test projects affect every variant; changed entries in variants.json affect
+those variants; anything else outside the template directory affects none.
+
+Usage:
+    affected_variants.py REF [--explain]
+
+Prints affected variant names, one per line, in variants.json order. With
+``--explain``, also prints each changed file, the options its Jinja conditionals
+depend on and the variants it affects to stderr.
+
+Needs cookiecutter importable, e.g. ``uv run --no-project --with cookiecutter``.
+"""
+
+import argparse
+import importlib.util
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from cookiecutter.environment import StrictEnvironment
+from cookiecutter.generate import generate_context
+from cookiecutter.prompt import prompt_for_config
+from jinja2 import TemplateError
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent
+PROJECT_TEMPLATE = "{{cookiecutter.project_name}}"
+
+# Changes to these paths can alter every generated project or how it is tested
+GLOBAL_PATHS = (
+    "cookiecutter.json",
+    "hooks/",
+    "scripts/generate.bash",
+    "scripts/install.bash",
+    "scripts/lint.bash",
+    "scripts/test.bash",
+    "scripts/test-all-variants.bash",
+)
+VARIANTS_FILE = "variants.json"
+
+# variants.json keys that are named differently in cookiecutter.json
+VARIANT_OPTIONS = {
+    "api_lambda_tracing": "api_lambda_powertools_tracing",
+    "api_lambda_metrics": "api_lambda_powertools_metrics",
+}
+
+# Options generate.bash sets the same way for every variant
+FIXED_OPTIONS: dict[str, Any] = {
+    "author": "Test Author",
+    "email": "test@example.com",
+    "github_user": "testuser",
+    "license": "MIT",
+    "classifiers_intended_audience": "Intended Audience :: Developers",
+    "classifiers_development_status": "Development Status :: 3 - Alpha",
+    "classifiers_environment": "Environment :: Console",
+    "classifiers_typing": "Typing :: Typed",
+    "format_line_length": 120,
+    "include_uv_lock": True,
+    # test-all-variants.bash generates every variant with Docker support
+    "docker": True,
+}
+
+JINJA_TAG = re.compile(r"{%-?(.*?)-?%}", re.DOTALL)
+OPTION = re.compile(r"\bcookiecutter\.(\w+)")
+
+Rendered = tuple[str, bytes] | None
+
+
+def load_hook() -> Any:
+    """Import the post-generation hook, unrendered, for its manifest of removed paths."""
+    spec = importlib.util.spec_from_file_location("post_gen_project", TEMPLATE_DIR / "hooks" / "post_gen_project.py")
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+HOOK = load_hook()
+
+
+def git(*args: str) -> str:
+    """Run git in the template repository and return its output."""
+    return subprocess.run(
+        ["git", "-C", str(TEMPLATE_DIR), *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+def changed_paths(ref: str) -> list[tuple[str | None, str | None]]:
+    """Paths changed between a ref and the working tree, including untracked files.
+
+    Args:
+        ref: Git ref to compare with.
+
+    Returns:
+        (path at the ref, path in the working tree) pairs; None where the file does not exist.
+    """
+    changes: list[tuple[str | None, str | None]] = []
+    for line in git("diff", "--name-status", "-M", ref, "--").splitlines():
+        status, *paths = line.split("\t")
+        if status.startswith("R"):
+            changes.append((paths[0], paths[1]))
+        elif status == "A":
+            changes.append((None, paths[0]))
+        elif status == "D":
+            changes.append((paths[0], None))
+        else:
+            changes.append((paths[0], paths[0]))
+    for path in git("ls-files", "--others", "--exclude-standard").splitlines():
+        changes.append((None, path))
+    return changes
+
+
+def read_at(ref: str | None, path: str | None) -> bytes | None:
+    """Contents of a file at a ref, or in the working tree when ref is None."""
+    if path is None:
+        return None
+    if ref is None:
+        file = TEMPLATE_DIR / path
+        return file.read_bytes() if file.is_file() else None
+    result = subprocess.run(
+        ["git", "-C", str(TEMPLATE_DIR), "show", f"{ref}:{path}"],
+        capture_output=True,
+        check=False,
+    )
+    return result.stdout if result.returncode == 0 else None
+
+
+def load_variants(content: bytes | None) -> dict[str, dict[str, Any]]:
+    """Variants by name from the contents of variants.json."""
+    if content is None:
+        return {}
+    return {variant["name"]: variant for variant in json.loads(content)["variants"]}
+
+
+def variant_context(variant: dict[str, Any]) -> dict[str, Any]:
+    """The cookiecutter context generate.bash renders a variant with."""
+    options = {VARIANT_OPTIONS.get(key, key): value for key, value in variant.items() if key != "name"}
+    options.pop("docker", None)
+    options.setdefault("github_actions", True)
+    context = generate_context(
+        context_file=TEMPLATE_DIR / "cookiecutter.json",
+        extra_context={**options, **FIXED_OPTIONS, "project_name": f"test-{variant['name']}"},
+    )
+    return {"cookiecutter": prompt_for_config(context, no_input=True)}
+
+
+class VariantRenderer:
+    """Renders template files the way cookiecutter does for one variant."""
+
+    def __init__(self, context: dict[str, Any]) -> None:
+        self.context = context
+        self.env = StrictEnvironment(context=context, keep_trailing_newline=True)
+        options = context["cookiecutter"]
+        # Render the options into the hook the way cookiecutter does
+        self.removed = HOOK.removed_paths(
+            {name: HOOK.to_bool(str(options[name])) for name in HOOK.OPTIONS}, options["package_name"]
+        )
+
+    def render(self, path: str, content: bytes) -> Rendered:
+        """Render a template file's path and content.
+
+        Args:
+            path: Path relative to the project template directory.
+            content: Raw file contents.
+
+        Returns:
+            The rendered path and content, or None if the file is not generated for this variant.
+        """
+        parts = [self.env.from_string(part).render(**self.context) for part in Path(path).parts]
+        if not all(parts) or any(PurePosixPath(*parts).is_relative_to(removed) for removed in self.removed):
+            return None
+        try:
+            text = content.decode()
+        except UnicodeDecodeError:
+            # Binary files are copied without rendering
+            return "/".join(parts), content
+        return "/".join(parts), self.env.from_string(text).render(**self.context).encode()
+
+
+def dependencies(path: str, content: bytes | None) -> set[str]:
+    """Options referenced by the Jinja tags in a template file's path and content."""
+    text = path
+    if content is not None:
+        text += content.decode(errors="replace")
+    return {option for tag in JINJA_TAG.findall(text) for option in OPTION.findall(tag)}
+
+
+def project_path(path: str | None) -> str | None:
+    """Path relative to the project template, or None for files outside it."""
+    if path is None or not path.startswith(f"{PROJECT_TEMPLATE}/"):
+        return None
+    return path.removeprefix(f"{PROJECT_TEMPLATE}/")
+
+
+def affected_by(
+    old: tuple[str | None, bytes | None], new: tuple[str | None, bytes | None], renderers: dict[str, VariantRenderer]
+) -> list[str]:
+    """Variants whose generated project differs between two versions of a template file."""
+
+    def render(renderer: VariantRenderer, path: str | None, content: bytes | None) -> Rendered:
+        if path is None or content is None:
+            return None
+        return renderer.render(path, content)
+
+    affected = []
+    for name, renderer in renderers.items():
+        try:
+            differs = render(renderer, *old) != render(renderer, *new)
+        except TemplateError:
+            # A version that does not render fails generation, so the variant must be tested
+            differs = True
+        if differs:
+            affected.append(name)
+    return affected
+
+
+def affected_variants(ref: str, explain: bool = False) -> list[str]:
+    """Variants whose generated project or test setup changed since a git ref.
+
+    Args:
+        ref: Git ref to compare the working tree with.
+        explain: Print why each changed file affects the variants it does.
+
+    Returns:
+        Names of the affected variants, in variants.json order.
+    """
+    variants = load_variants(read_at(None, VARIANTS_FILE))
+    renderers = {name: VariantRenderer(variant_context(variant)) for name, variant in variants.items()}
+    affected: set[str] = set()
+
+    for old_path, new_path in changed_paths(ref):
+        path = new_path or old_path
+        assert path is not None
+        if path == VARIANTS_FILE:
+            previous = load_variants(read_at(ref, VARIANTS_FILE))
+            names = [name for name, variant in variants.items() if previous.get(name) != variant]
+            reason = "variant definitions"
+        elif path.startswith(GLOBAL_PATHS) or (old_path or "").startswith(GLOBAL_PATHS):
+            names = list(variants)
+            reason = "all variants"
+        elif (old := project_path(old_path)) is not None or project_path(new_path) is not None:
+            new = project_path(new_path)
+            old_content = read_at(ref, old_path)
+            new_content = read_at(None, new_path)
+            names = affected_by((old, old_content), (new, new_content), renderers)
+            options = dependencies(old or "", old_content) | dependencies(new or "", new_content)
+            reason = ", ".join(sorted(options)) or "no options"
+        else:
+            continue
+        affected.update(names)
+        if explain:
+            print(f"{path}: {reason} -> {', '.join(names) or 'none'}", file=sys.stderr)
+
+    return [name for name in variants if name in affected]
+
+
+def main() -> None:
+    """Print the variants affected by changes since the given ref."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("ref", help="Git ref to compare the working tree with, e.g. origin/main")
+    parser.add_argument("--explain", action="store_true", help="Print why each changed file affects variants")
+    args = parser.parse_args()
+
+    for name in affected_variants(args.ref, explain=args.explain):
+        print(name)
+
+
+if __name__ == "__main__":
+    main()
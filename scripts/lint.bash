@@ -42,7 +42,8 @@ run_lint() {
         uv run ruff format --check .
 
         echo "Running mypy..."
-        uv run mypy src/
+        # The django-stubs plugin imports the web settings, whose production default requires SECRET_KEY
+        ENVIRONMENT=development uv run mypy src/
 
         echo "Running vulture..."
         uv run vulture src/ --min-confidence 80
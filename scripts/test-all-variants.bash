@@ -17,25 +17,46 @@ trap cleanup SIGINT SIGTERM
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 TEMPLATE_DIR="$(dirname "${SCRIPT_DIR}")"
 DEFAULT_OUTPUT_DIR="${TEMPLATE_DIR}/.test-output"
+DEFAULT_JOBS="$(nproc 2>/dev/null || echo 2)"
 
 OUTPUT_DIR="${DEFAULT_OUTPUT_DIR}"
+JOBS="${DEFAULT_JOBS}"
+# Lines of a failed variant's log included in the summaries
+FAILURE_LOG_LINES=50
 
 help() {
     cat <<EOF
 Test all variant combinations of the cookiecutter template.
 
-Generates projects with different option combinations and runs:
+Generates projects with different option combinations and runs, for each:
   1. Project generation
-  2. Dependency installation
+  2. Dependency locking and installation
   3. Linting and type checks
-  4. Tests
+  4. Tests (plus integration tests for api_lambda variants)
+
+Variants run in parallel, each in its own project directory with its output in
+logs/<variant>.log. All of them share one uv cache, and variants whose locked
+dependencies are identical share one environment, installed once and kept in
+environments/ for later runs. Integration tests use fixed ports, so they run one
+variant at a time. Tests with timing budgets may fail when there are more jobs
+than CPUs.
+
+Results are written to summary.json and junit.xml in the output directory, with
+the time each step took.
+
+With --changed-since, only variants whose generated project differs from the one
+generated at the given git ref are tested; see affected_variants.py.
 
 Usage: $(basename "$0") [OPTIONS]
 
 Options:
-    -h, --help       Show this help message
-    -o, --output     Output directory (default: ${DEFAULT_OUTPUT_DIR})
-    --clean          Remove output directory before starting
+    -h, --help          Show this help message
+    -o, --output DIR    Output directory (default: ${DEFAULT_OUTPUT_DIR})
+    -j, --jobs N        Variants tested at once (default: ${DEFAULT_JOBS}, the number of CPUs)
+    -v, --variant NAME  Test only this variant (repeatable)
+    --changed-since REF Test only variants affected by changes since a git ref
+    --cache-dir DIR     uv cache directory (default: uv's own, shared with other projects)
+    --clean             Remove output directory before starting
 
 Variants tested:
   - minimal, cli-only, web-only, api-only, api-auth, api-lambda
@@ -44,120 +65,279 @@ Variants tested:
 Examples:
     $(basename "$0")
     $(basename "$0") --clean
-    $(basename "$0") --output /tmp/variants
+    $(basename "$0") --jobs 4 --output /tmp/variants
+    $(basename "$0") --variant minimal --variant api-lambda
+    $(basename "$0") --changed-since origin/main
 EOF
     return 0
 }
 
-test_all_variants() {
-    local output_dir="${1}"
-    local variants_file="${TEMPLATE_DIR}/variants.json"
+elapsed_since() {
+    local start="${1}"
+    awk -v start="${start}" -v end="${EPOCHREALTIME}" 'BEGIN { printf "%.1f", end - start }'
+}
 
-    if [[ ! -f "${variants_file}" ]]; then
-        echo "Error: variants.json not found at ${variants_file}" >&2
-        return 1
+environment_key() {
+    local project_dir="${1}"
+
+    # The interpreter and the locked third-party packages, without the project itself
+    (
+        cd "${project_dir}"
+        uv python find
+        uv export --frozen --no-emit-project --no-hashes --quiet
+    ) | sha256sum | cut -c1-16
+}
+
+lock_dependencies() {
+    local project_dir="${1}"
+
+    (
+        cd "${project_dir}"
+        uv lock
+    )
+}
+
+install_environment() {
+    local project_dir="${1}"
+    local key lock status=0
+
+    key=$(environment_key "${project_dir}") || return 1
+    local environment_dir="${OUTPUT_DIR}/environments/${key}"
+    ENVIRONMENT_DIR="${environment_dir}"
+
+    # Variants with the same key wait for whichever started installing first
+    exec {lock}>>"${environment_dir}.lock"
+    flock "${lock}"
+    if [[ -f "${environment_dir}/.installed" ]]; then
+        echo "Reusing environment ${environment_dir}"
+        REUSED_ENVIRONMENT="true"
+    else
+        rm -rf "${environment_dir}"
+        (
+            cd "${project_dir}"
+            # The project is imported from src/ by its tests and tools, so only its dependencies are shared
+            UV_PROJECT_ENVIRONMENT="${environment_dir}" uv sync --frozen --no-install-project
+        ) && touch "${environment_dir}/.installed" || status=$?
     fi
+    exec {lock}>&-
+    return "${status}"
+}
 
-    local failed=()
-    local passed=()
-    local variant_count
-    variant_count=$(jq '.variants | length' "${variants_file}")
-
-    for ((i = 0; i < variant_count; i++)); do
-        local name sentry_val async_val cli_val web_val api_val
-        local api_auth_val api_lambda_val api_lambda_tracing_val api_lambda_metrics_val
-        local api_pagination_val api_versioning_val github_actions_val
-
-        name=$(jq -r ".variants[$i].name" "${variants_file}")
-        sentry_val=$(jq -r ".variants[$i].sentry" "${variants_file}")
-        async_val=$(jq -r ".variants[$i].async" "${variants_file}")
-        cli_val=$(jq -r ".variants[$i].cli" "${variants_file}")
-        web_val=$(jq -r ".variants[$i].web" "${variants_file}")
-        api_val=$(jq -r ".variants[$i].api" "${variants_file}")
-        api_auth_val=$(jq -r ".variants[$i].api_auth" "${variants_file}")
-        api_lambda_val=$(jq -r ".variants[$i].api_lambda" "${variants_file}")
-        api_lambda_tracing_val=$(jq -r ".variants[$i].api_lambda_tracing" "${variants_file}")
-        api_lambda_metrics_val=$(jq -r ".variants[$i].api_lambda_metrics" "${variants_file}")
-        api_pagination_val=$(jq -r ".variants[$i].api_pagination" "${variants_file}")
-        api_versioning_val=$(jq -r ".variants[$i].api_versioning" "${variants_file}")
-        github_actions_val=$(jq -r ".variants[$i].github_actions // true" "${variants_file}")
-
-        local project_name="test-${name}"
-        local project_dir="${output_dir}/${project_name}"
-
-        echo ""
-        echo "========================================"
-        echo "Testing variant: ${name}"
-        echo "========================================"
-
-        if [[ -d "${project_dir}" ]]; then
-            rm -rf "${project_dir}"
-        fi
+run_integration_tests() {
+    local project_dir="${1}"
+
+    (
+        flock 9
+        "${SCRIPT_DIR}/test.bash" "${project_dir}" integration
+    ) 9>>"${OUTPUT_DIR}/.integration.lock"
+}
+
+run_step() {
+    local step="${1}"
+    shift
+    local start="${EPOCHREALTIME}"
+    local status=0
+
+    echo ""
+    echo "==> ${step}"
+    "$@" || status=$?
+    STEPS=$(jq -c --arg name "${step}" --argjson seconds "$(elapsed_since "${start}")" --argjson status "${status}" \
+        '. + [{name: $name, seconds: $seconds, passed: ($status == 0)}]' <<<"${STEPS}")
+    return "${status}"
+}
 
-        if "${SCRIPT_DIR}/generate.bash" \
-            --output "${output_dir}" \
+test_variant() {
+    local variant="${1}"
+    local name
+    name=$(jq -r '.name' <<<"${variant}")
+
+    local project_name="test-${name}"
+    local project_dir="${OUTPUT_DIR}/${project_name}"
+    local log_file="${OUTPUT_DIR}/logs/${name}.log"
+    local start="${EPOCHREALTIME}"
+    local failed_step=""
+    STEPS="[]"
+    ENVIRONMENT_DIR=""
+    REUSED_ENVIRONMENT="false"
+
+    rm -rf "${project_dir}"
+
+    {
+        run_step generate "${SCRIPT_DIR}/generate.bash" \
+            --output "${OUTPUT_DIR}" \
             --name "${project_name}" \
-            --sentry "${sentry_val}" \
-            --async "${async_val}" \
-            --cli "${cli_val}" \
-            --web "${web_val}" \
-            --api "${api_val}" \
-            --api-auth "${api_auth_val}" \
-            --api-lambda "${api_lambda_val}" \
-            --api-lambda-tracing "${api_lambda_tracing_val}" \
-            --api-lambda-metrics "${api_lambda_metrics_val}" \
-            --api-pagination "${api_pagination_val}" \
-            --api-versioning "${api_versioning_val}" \
+            --sentry "$(jq -r '.sentry' <<<"${variant}")" \
+            --async "$(jq -r '.async' <<<"${variant}")" \
+            --cli "$(jq -r '.cli' <<<"${variant}")" \
+            --web "$(jq -r '.web' <<<"${variant}")" \
+            --api "$(jq -r '.api' <<<"${variant}")" \
+            --api-auth "$(jq -r '.api_auth' <<<"${variant}")" \
+            --api-lambda "$(jq -r '.api_lambda' <<<"${variant}")" \
+            --api-lambda-tracing "$(jq -r '.api_lambda_tracing' <<<"${variant}")" \
+            --api-lambda-metrics "$(jq -r '.api_lambda_metrics' <<<"${variant}")" \
+            --api-pagination "$(jq -r '.api_pagination' <<<"${variant}")" \
+            --api-versioning "$(jq -r '.api_versioning' <<<"${variant}")" \
             --docker "true" \
-            --github-actions "${github_actions_val}"; then
-            if "${SCRIPT_DIR}/install.bash" "${project_dir}"; then
-                if "${SCRIPT_DIR}/lint.bash" "${project_dir}"; then
-                    if "${SCRIPT_DIR}/test.bash" "${project_dir}" unit; then
-                        # Run integration tests only if api_lambda=true
-                        if [[ "${api_lambda_val}" == "true" ]]; then
-                            if "${SCRIPT_DIR}/test.bash" "${project_dir}" integration; then
-                                passed+=("${name}")
-                                echo "PASSED: ${name}"
-                            else
-                                failed+=("${name} (integration tests failed)")
-                                echo "FAILED: ${name} (integration tests failed)"
-                            fi
-                        else
-                            passed+=("${name}")
-                            echo "PASSED: ${name}"
-                        fi
-                    else
-                        failed+=("${name} (unit tests failed)")
-                        echo "FAILED: ${name} (unit tests failed)"
-                    fi
-                else
-                    failed+=("${name} (lint failed)")
-                    echo "FAILED: ${name} (lint failed)"
-                fi
-            else
-                failed+=("${name} (install failed)")
-                echo "FAILED: ${name} (install failed)"
-            fi
-        else
-            failed+=("${name} (generation failed)")
-            echo "FAILED: ${name} (generation failed)"
+            --github-actions "$(jq -r '.github_actions // true' <<<"${variant}")" ||
+            failed_step="generate"
+
+        if [[ -z "${failed_step}" ]]; then
+            run_step lock lock_dependencies "${project_dir}" || failed_step="lock"
         fi
-    done
+
+        if [[ -z "${failed_step}" ]]; then
+            run_step install install_environment "${project_dir}" || failed_step="install"
+        fi
+
+        # Run everything below in the shared environment without syncing the project into it,
+        # putting src/ on the path as the project's editable install would
+        export UV_PROJECT_ENVIRONMENT="${ENVIRONMENT_DIR}"
+        export UV_NO_SYNC=1
+        export PYTHONPATH="${project_dir}/src"
+
+        if [[ -z "${failed_step}" ]]; then
+            run_step lint "${SCRIPT_DIR}/lint.bash" "${project_dir}" || failed_step="lint"
+        fi
+
+        if [[ -z "${failed_step}" ]]; then
+            run_step unit "${SCRIPT_DIR}/test.bash" "${project_dir}" unit || failed_step="unit"
+        fi
+
+        # Run integration tests only if api_lambda=true
+        if [[ -z "${failed_step}" ]] && [[ "$(jq -r '.api_lambda' <<<"${variant}")" == "true" ]]; then
+            run_step integration run_integration_tests "${project_dir}" || failed_step="integration"
+        fi
+    } >"${log_file}" 2>&1
+
+    local output=""
+    if [[ -n "${failed_step}" ]]; then
+        # Drop control characters such as color codes, which are not allowed in XML
+        output=$(tail -n "${FAILURE_LOG_LINES}" "${log_file}" | tr -d '\000-\010\013\014\016-\037')
+    fi
+
+    jq -n \
+        --arg name "${name}" \
+        --argjson passed "$([[ -z "${failed_step}" ]] && echo true || echo false)" \
+        --arg failed_step "${failed_step}" \
+        --argjson seconds "$(elapsed_since "${start}")" \
+        --argjson steps "${STEPS}" \
+        --arg environment "${ENVIRONMENT_DIR}" \
+        --argjson reused_environment "${REUSED_ENVIRONMENT}" \
+        --arg log "${log_file}" \
+        --arg output "${output}" \
+        '{name: $name, passed: $passed, failed_step: (if $failed_step == "" then null else $failed_step end),
+          seconds: $seconds, steps: $steps, environment: $environment,
+          reused_environment: $reused_environment, log: $log, output: $output}' \
+        >|"${OUTPUT_DIR}/results/${name}.json"
+
+    if [[ -z "${failed_step}" ]]; then
+        echo "PASSED: ${name} ($(jq -r '.seconds' "${OUTPUT_DIR}/results/${name}.json")s)"
+    else
+        echo "FAILED: ${name} (${failed_step} failed, see ${log_file})"
+    fi
+}
+
+write_reports() {
+    local wall_seconds="${1}"
+
+    jq -s --argjson wall_seconds "${wall_seconds}" --argjson jobs "${JOBS}" \
+        '{jobs: $jobs, wall_seconds: $wall_seconds,
+          variant_seconds: (map(.seconds) | add * 10 | round / 10),
+          passed: map(select(.passed)) | length, failed: map(select(.passed | not)) | length,
+          variants: .}' \
+        "${OUTPUT_DIR}"/results/*.json >|"${OUTPUT_DIR}/summary.json"
+
+    # One test suite per variant and one test case per step; steps after a failure are skipped
+    jq -r '
+        def xml: gsub("&"; "&amp;") | gsub("<"; "&lt;") | gsub(">"; "&gt;") | gsub("\""; "&quot;");
+        ["lock", "install", "lint", "unit"] as $required
+        | "<?xml version=\"1.0\" encoding=\"UTF-8\"?>",
+          "<testsuites name=\"variants\" tests=\"\(.variants | map(.steps | length) | add)\" failures=\"\(.failed)\" time=\"\(.wall_seconds)\">",
+          (.variants[] as $variant
+           | ($required - ($variant.steps | map(.name))) as $skipped
+           | "  <testsuite name=\"\($variant.name | xml)\" tests=\"\($variant.steps | length + ($skipped | length))\" failures=\"\(if $variant.passed then 0 else 1 end)\" skipped=\"\($skipped | length)\" time=\"\($variant.seconds)\">",
+             ($variant.steps[]
+              | if .passed then
+                    "    <testcase classname=\"\($variant.name | xml)\" name=\"\(.name)\" time=\"\(.seconds)\"/>"
+                else
+                    "    <testcase classname=\"\($variant.name | xml)\" name=\"\(.name)\" time=\"\(.seconds)\">",
+                    "      <failure message=\"\(.name) failed, see \($variant.log | xml)\">\($variant.output | xml)</failure>",
+                    "    </testcase>"
+                end),
+             ($skipped[] | "    <testcase classname=\"\($variant.name | xml)\" name=\"\(.)\"><skipped/></testcase>"),
+             "  </testsuite>"),
+          "</testsuites>"
+    ' "${OUTPUT_DIR}/summary.json" >|"${OUTPUT_DIR}/junit.xml"
+}
+
+print_summary() {
+    local summary="${OUTPUT_DIR}/summary.json"
 
     echo ""
     echo "========================================"
     echo "Summary"
     echo "========================================"
-    echo "Passed: ${#passed[@]}"
-    for p in "${passed[@]}"; do
-        echo "  - ${p}"
-    done
-    echo "Failed: ${#failed[@]}"
-    for f in "${failed[@]}"; do
-        echo "  - ${f}"
+    local name status seconds steps
+    while IFS=$'\t' read -r name status seconds steps; do
+        printf '%-16s %-20s %7ss  %s\n' "${name}" "${status}" "${seconds}" "${steps}"
+    done < <(jq -r '.variants[]
+        | [.name, (if .passed then "passed" else "FAILED (\(.failed_step))" end), .seconds,
+           (.steps | map("\(.name) \(.seconds)s") | join(", "))
+           + (if .reused_environment then " (reused environment)" else "" end)]
+        | @tsv' "${summary}")
+    echo ""
+    jq -r '"Passed: \(.passed), failed: \(.failed)",
+        "Wall time \(.wall_seconds)s with \(.jobs) jobs, \(.variant_seconds)s summed over variants"' "${summary}"
+    echo "Reports: ${summary}, ${OUTPUT_DIR}/junit.xml"
+}
+
+affected_variants() {
+    local ref="${1}"
+
+    uv run --no-project --quiet --with cookiecutter python "${SCRIPT_DIR}/affected_variants.py" "${ref}" --explain
+}
+
+test_all_variants() {
+    local variants_file="${TEMPLATE_DIR}/variants.json"
+
+    if [[ ! -f "${variants_file}" ]]; then
+        echo "Error: variants.json not found at ${variants_file}" >&2
+        return 1
+    fi
+
+    local variants=()
+    local variant
+    while IFS= read -r variant; do
+        variants+=("${variant}")
+    done < <(jq -c '.variants[] | select(($ARGS.positional | length) == 0 or (.name | IN($ARGS.positional[])))' \
+        "${variants_file}" --args "$@")
+
+    if [[ ${#variants[@]} -eq 0 ]]; then
+        echo "Error: no variant in ${variants_file} matches: $*" >&2
+        return 1
+    fi
+
+    rm -rf "${OUTPUT_DIR}/logs" "${OUTPUT_DIR}/results"
+    rm -f "${OUTPUT_DIR}/summary.json" "${OUTPUT_DIR}/junit.xml"
+    mkdir -p "${OUTPUT_DIR}/logs" "${OUTPUT_DIR}/results" "${OUTPUT_DIR}/environments"
+
+    echo "Testing ${#variants[@]} variants, ${JOBS} at a time; logs in ${OUTPUT_DIR}/logs"
+    local start="${EPOCHREALTIME}"
+    local running=0
+    for variant in "${variants[@]}"; do
+        if [[ ${running} -ge ${JOBS} ]]; then
+            wait -n || true
+            running=$((running - 1))
+        fi
+        test_variant "${variant}" &
+        running=$((running + 1))
     done
+    wait
+
+    write_reports "$(elapsed_since "${start}")"
+    print_summary
 
-    if [[ ${#failed[@]} -gt 0 ]]; then
+    if [[ $(jq '.failed' "${OUTPUT_DIR}/summary.json") -gt 0 ]]; then
         return 1
     fi
     return 0
@@ -165,6 +345,8 @@ test_all_variants() {
 
 main() {
     local clean="false"
+    local changed_since=""
+    local only=()
 
     while [[ $# -gt 0 ]]; do
         case "${1}" in
@@ -176,6 +358,22 @@ main() {
                 OUTPUT_DIR="${2}"
                 shift 2
                 ;;
+            -j|--jobs)
+                JOBS="${2}"
+                shift 2
+                ;;
+            -v|--variant)
+                only+=("${2}")
+                shift 2
+                ;;
+            --changed-since)
+                changed_since="${2}"
+                shift 2
+                ;;
+            --cache-dir)
+                export UV_CACHE_DIR="${2}"
+                shift 2
+                ;;
             --clean)
                 clean="true"
                 shift
@@ -188,6 +386,11 @@ main() {
         esac
     done
 
+    if ! [[ "${JOBS}" =~ ^[1-9][0-9]*$ ]]; then
+        echo "Error: --jobs must be a positive integer, got: ${JOBS}" >&2
+        return 1
+    fi
+
     if ! command -v jq &> /dev/null; then
         echo "Error: jq is not installed. Install with your package manager (e.g., apt install jq)" >&2
         return 1
@@ -203,14 +406,36 @@ main() {
         return 1
     fi
 
+    if ! command -v flock &> /dev/null; then
+        echo "Error: flock is not installed. Install util-linux with your package manager" >&2
+        return 1
+    fi
+
     if [[ "${clean}" == "true" ]] && [[ -d "${OUTPUT_DIR}" ]]; then
         echo "Cleaning output directory: ${OUTPUT_DIR}"
         rm -rf "${OUTPUT_DIR}"
     fi
 
+    if [[ -n "${changed_since}" ]]; then
+        local affected output name
+        output=$(affected_variants "${changed_since}") || return 1
+        affected=()
+        for name in ${output}; do
+            if [[ ${#only[@]} -eq 0 ]] || [[ " ${only[*]} " == *" ${name} "* ]]; then
+                affected+=("${name}")
+            fi
+        done
+        if [[ ${#affected[@]} -eq 0 ]]; then
+            echo "No variant is affected by changes since ${changed_since}"
+            return 0
+        fi
+        only=("${affected[@]}")
+    fi
+
     mkdir -p "${OUTPUT_DIR}"
+    OUTPUT_DIR="$(cd "${OUTPUT_DIR}" && pwd)"
 
-    test_all_variants "${OUTPUT_DIR}"
+    test_all_variants "${only[@]+"${only[@]}"}"
 
     return $?
 }
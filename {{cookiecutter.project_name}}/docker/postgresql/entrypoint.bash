@@ -13,6 +13,15 @@ main() {
         echo "DATABASE_URL constructed from individual environment variables"
     fi
 
+    # Size memory settings to the container on every start, so changing its limit takes effect on restart.
+    # Flags given in the compose command come later and take precedence.
+    if [[ "${1:-}" == "postgres" ]]; then
+        local tuning
+        mapfile -t tuning < <(tune-postgresql.bash)
+        set -- "$1" "${tuning[@]}" "${@:2}"
+        echo "PostgreSQL tuning: ${tuning[*]}"
+    fi
+
     exec docker-entrypoint.sh "$@"
 }
 
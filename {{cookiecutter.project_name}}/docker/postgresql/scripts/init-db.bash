@@ -5,7 +5,32 @@ set -o nounset
 set -o noclobber
 set -o pipefail
 
+enable_extensions() {
+    psql -v ON_ERROR_STOP=1 --username "${POSTGRES_USER}" --dbname "${POSTGRES_DB}" <<-'SQL'
+		CREATE EXTENSION IF NOT EXISTS pg_stat_statements;
+	SQL
+    echo "Enabled pg_stat_statements"
+}
+
+create_readonly_role() {
+    if [[ -z "${POSTGRES_READONLY_USER:-}" ]] || [[ -z "${POSTGRES_READONLY_PASSWORD:-}" ]]; then
+        echo "POSTGRES_READONLY_USER or POSTGRES_READONLY_PASSWORD not set, skipping read-only role"
+        return 0
+    fi
+
+    psql -v ON_ERROR_STOP=1 --username "${POSTGRES_USER}" --dbname "${POSTGRES_DB}" \
+        -v role="${POSTGRES_READONLY_USER}" -v password="${POSTGRES_READONLY_PASSWORD}" <<-'SQL'
+		CREATE ROLE :"role" LOGIN PASSWORD :'password';
+		-- SELECT on every table, view and sequence, including ones created later
+		GRANT pg_read_all_data TO :"role";
+		ALTER ROLE :"role" SET default_transaction_read_only = on;
+	SQL
+    echo "Created read-only role ${POSTGRES_READONLY_USER}"
+}
+
 main() {
+    enable_extensions
+    create_readonly_role
     echo "PostgreSQL initialization complete"
     return 0
 }
@@ -0,0 +1,43 @@
+#!/usr/bin/env bash
+# Show the statements with the highest total execution time from pg_stat_statements.
+#
+# Usage: docker compose exec postgresql top-queries.bash [LIMIT] [--reset]
+
+set -o errexit
+set -o nounset
+set -o noclobber
+set -o pipefail
+
+main() {
+    local limit=20
+
+    for arg in "$@"; do
+        case "${arg}" in
+            --reset)
+                psql -v ON_ERROR_STOP=1 --username "${POSTGRES_USER}" --dbname "${POSTGRES_DB}" \
+                    --quiet --command "SELECT pg_stat_statements_reset()" >/dev/null
+                echo "pg_stat_statements reset"
+                return 0
+                ;;
+            *) limit="${arg}" ;;
+        esac
+    done
+
+    psql -v ON_ERROR_STOP=1 --username "${POSTGRES_USER}" --dbname "${POSTGRES_DB}" \
+        -v limit="${limit}" <<-'SQL'
+		SELECT
+		    calls,
+		    round(total_exec_time::numeric, 1) AS total_ms,
+		    round(mean_exec_time::numeric, 2) AS mean_ms,
+		    rows,
+		    round((100 * total_exec_time / nullif(sum(total_exec_time) OVER (), 0))::numeric, 1) AS percent,
+		    left(regexp_replace(query, '\s+', ' ', 'g'), 120) AS query
+		FROM pg_stat_statements
+		WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+		ORDER BY total_exec_time DESC
+		LIMIT :limit;
+	SQL
+    return 0
+}
+
+main "$@"
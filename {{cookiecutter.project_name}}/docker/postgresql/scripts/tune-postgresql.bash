@@ -0,0 +1,62 @@
+#!/usr/bin/env bash
+# Print PostgreSQL "-c name=value" flags, one argument per line, sized to the container's memory limit.
+#
+# Memory is read from the cgroup limit (v2, then v1), falling back to host memory.
+# Override detection with POSTGRES_MEMORY_MB and the connection count with POSTGRES_MAX_CONNECTIONS.
+
+set -o errexit
+set -o nounset
+set -o noclobber
+set -o pipefail
+
+detect_memory_mb() {
+    local limit host_kb host_mb
+
+    if [[ -n "${POSTGRES_MEMORY_MB:-}" ]]; then
+        echo "${POSTGRES_MEMORY_MB}"
+        return 0
+    fi
+
+    host_kb="$(awk '/^MemTotal:/ { print $2 }' /proc/meminfo)"
+    host_mb=$((host_kb / 1024))
+
+    if [[ -r /sys/fs/cgroup/memory.max ]]; then
+        limit="$(cat /sys/fs/cgroup/memory.max)"
+    elif [[ -r /sys/fs/cgroup/memory/memory.limit_in_bytes ]]; then
+        limit="$(cat /sys/fs/cgroup/memory/memory.limit_in_bytes)"
+    else
+        limit="max"
+    fi
+
+    # Unlimited cgroups report "max" (v2) or a huge sentinel (v1)
+    if [[ "${limit}" == "max" ]] || ((limit / 1024 / 1024 >= host_mb)); then
+        echo "${host_mb}"
+    else
+        echo $((limit / 1024 / 1024))
+    fi
+}
+
+main() {
+    local memory_mb max_connections shared_buffers work_mem maintenance_work_mem
+
+    memory_mb="$(detect_memory_mb)"
+    max_connections="${POSTGRES_MAX_CONNECTIONS:-100}"
+
+    shared_buffers=$((memory_mb / 4))
+    # Each connection may run a few sorts or hashes at once, so divide what is left after shared_buffers
+    work_mem=$(((memory_mb - shared_buffers) * 1024 / (max_connections * 3)))
+    work_mem=$((work_mem < 1024 ? 1024 : work_mem))
+    maintenance_work_mem=$((memory_mb / 16))
+    maintenance_work_mem=$((maintenance_work_mem > 2048 ? 2048 : maintenance_work_mem))
+
+    printf "%s\n" -c "max_connections=${max_connections}"
+    printf "%s\n" -c "shared_buffers=${shared_buffers}MB"
+    printf "%s\n" -c "effective_cache_size=$((memory_mb * 3 / 4))MB"
+    printf "%s\n" -c "work_mem=${work_mem}kB"
+    printf "%s\n" -c "maintenance_work_mem=${maintenance_work_mem}MB"
+    printf "%s\n" -c "shared_preload_libraries=pg_stat_statements"
+    printf "%s\n" -c "pg_stat_statements.track=all"
+    return 0
+}
+
+main "$@"
@@ -31,6 +31,38 @@ class Settings(BaseSettings):
         description="Allowed CORS origins",
     )
     cors_allow_credentials: bool = Field(default=True, description="Allow credentials")
+
+    # Rate limiting
+    rate_limit_enabled: bool = Field(default=False, description="Limit the request rate of each client")
+    rate_limit_rate: float = Field(default=10.0, gt=0, description="Requests per second a client may sustain")
+    rate_limit_burst: int = Field(default=20, ge=1, description="Requests a client may make at once")
+    rate_limit_redis_url: str | None = Field(
+        default=None,
+        description="Redis URL of buckets shared by all processes, in-process buckets if unset",
+    )
+    rate_limit_api_key_header: str | None = Field(
+        default=None,
+        description="Header telling clients apart by API key, only if unknown keys are rejected",
+    )
+    rate_limit_exempt_paths: list[str] = Field(default=["/health"], description="Path prefixes never limited")
+
+    # Load shedding
+    load_shedding_enabled: bool = Field(default=False, description="Shed requests over an adaptive concurrency limit")
+    load_shedding_latency_target_ms: float = Field(
+        default=500.0, gt=0, description="Latency above which the concurrency limit is lowered"
+    )
+    load_shedding_max_limit: int = Field(default=200, ge=1, description="Highest concurrency limit")
+    load_shedding_queue_size: int = Field(default=20, ge=0, description="Requests over the limit that may wait")
+    load_shedding_queue_timeout_ms: float = Field(default=50.0, ge=0, description="Longest wait for a slot")
+    load_shedding_exempt_paths: list[str] = Field(
+        default=["/health"], description="Path prefixes never shed, e.g. priority routes"
+    )
+    {%- if cookiecutter.api_versioning %}
+
+    # Batch requests
+    batch_max_requests: int = Field(default=100, ge=1, description="Most requests in one batch")
+    batch_concurrency: int = Field(default=10, ge=1, description="Requests of a batch run at once")
+    {%- endif %}
     {%- if cookiecutter.api_auth %}
 
     # JWT Authentication
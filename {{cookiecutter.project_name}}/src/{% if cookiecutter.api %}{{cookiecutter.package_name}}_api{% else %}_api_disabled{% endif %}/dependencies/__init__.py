@@ -6,7 +6,10 @@ import structlog
 from fastapi import Depends
 
 from {{cookiecutter.package_name}}.logging import get_logger
+from {{cookiecutter.package_name}}.profiling import Profiler, get_profiler
 from {{cookiecutter.package_name}}_api.config import Settings, get_settings
+from {{cookiecutter.package_name}}_api.load_shedding import ConcurrencyLimiter, get_concurrency_limiter
+from {{cookiecutter.package_name}}_api.rate_limit import RateLimiter, get_rate_limiter
 
 
 def get_request_logger() -> structlog.typing.FilteringBoundLogger:
@@ -20,3 +23,6 @@ def get_request_logger() -> structlog.typing.FilteringBoundLogger:
 
 LoggerDep = Annotated[structlog.typing.FilteringBoundLogger, Depends(get_request_logger)]
 SettingsDep = Annotated[Settings, Depends(get_settings)]
+ProfilerDep = Annotated[Profiler, Depends(get_profiler)]
+ConcurrencyLimiterDep = Annotated[ConcurrencyLimiter, Depends(get_concurrency_limiter)]
+RateLimiterDep = Annotated[RateLimiter, Depends(get_rate_limiter)]
@@ -0,0 +1,185 @@
+"""Adaptive concurrency limiting, shedding the requests a slow API cannot serve in time.
+
+When a dependency slows down, requests pile up in the server: each waits behind
+the others, latency grows until every request times out, and the server spends
+its time on answers nobody waits for any more. ConcurrencyLimiter instead caps
+the requests in flight and answers the rest at once with 503, so the ones it
+admits are still served in time.
+
+The cap adapts to the latency of the admitted requests by additive increase,
+multiplicative decrease (AIMD), the way TCP adapts its congestion window: each
+request served within the latency target raises the limit by ``1 / limit``, about
+one per round trip, and a request slower than the target cuts it, at most once per
+round trip, in proportion to the overshoot: by a tenth just over the target, by
+half at twice the target or more. The limit so settles where latency meets the
+target, whatever the capacity of the dependencies of the moment.
+
+A few requests over the limit may wait for a slot, briefly, so that short bursts
+are not rejected. Configuration comes from the LOAD_SHEDDING_* settings, see
+get_concurrency_limiter. Each process limits the requests it serves; a Lambda
+execution environment serves one request at a time, so it has nothing to shed.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+
+from {{cookiecutter.package_name}}_api.config import get_settings
+
+# Bounds of the share of the limit kept when a request is slower than the target
+MAX_BACKOFF = 0.9
+MIN_BACKOFF = 0.5
+MIN_LIMIT = 1.0
+
+
+@dataclass
+class LoadSheddingMetrics:
+    """Counts of the limiter's decisions since the process started.
+
+    Attributes:
+        admitted: Requests admitted, at once or after waiting.
+        rejected: Requests answered 503, at once or after waiting.
+        slow: Admitted requests slower than the latency target.
+    """
+
+    admitted: int = 0
+    rejected: int = 0
+    slow: int = 0
+
+
+class ConcurrencyLimiter:
+    """Caps the requests in flight at a limit that adapts to their latency."""
+
+    def __init__(
+        self,
+        latency_target: float,
+        max_limit: int = 200,
+        initial_limit: int = 20,
+        queue_size: int = 0,
+        queue_timeout: float = 0.05,
+        exempt_paths: tuple[str, ...] = (),
+        enabled: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Configure the limiter.
+
+        Args:
+            latency_target: Seconds a request may take before the limit is lowered.
+            max_limit: Highest the limit may grow.
+            initial_limit: Limit until the first requests are measured.
+            queue_size: Requests over the limit that may wait for a slot.
+            queue_timeout: Seconds a request may wait for a slot.
+            exempt_paths: Path prefixes whose requests are never limited nor counted.
+            enabled: Whether the limiter should be installed.
+            clock: Monotonic clock in seconds.
+        """
+        self.latency_target = latency_target
+        self.max_limit = max_limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.exempt_paths = exempt_paths
+        self.enabled = enabled
+        self.clock = clock
+        self.in_flight = 0
+        self.metrics = LoadSheddingMetrics()
+        self._limit = float(min(initial_limit, max_limit))
+        self._backed_off_at = float("-inf")
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def limit(self) -> int:
+        """Requests that may be in flight at once."""
+        return int(self._limit)
+
+    @property
+    def queued(self) -> int:
+        """Requests waiting for a slot."""
+        return len(self._waiters)
+
+    async def acquire(self) -> float | None:
+        """Take a slot for a request, waiting for one if the queue has room.
+
+        Returns:
+            When the request was admitted, to pass to ``release``, or None if it is rejected.
+        """
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self.metrics.admitted += 1
+            return self.clock()
+        if len(self._waiters) >= self.queue_size:
+            self.metrics.rejected += 1
+            return None
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await waiter
+        except TimeoutError:
+            # The slot may have been handed over just as the wait timed out
+            if not waiter.done() or waiter.cancelled():
+                self._forget(waiter)
+                self.metrics.rejected += 1
+                return None
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._hand_over()
+            else:
+                self._forget(waiter)
+            raise
+        self.metrics.admitted += 1
+        return self.clock()
+
+    def release(self, admitted_at: float) -> None:
+        """Give back a request's slot and adapt the limit to its latency.
+
+        Args:
+            admitted_at: What ``acquire`` returned for the request.
+        """
+        now = self.clock()
+        latency = now - admitted_at
+        if latency > self.latency_target:
+            self.metrics.slow += 1
+            # Requests admitted before the last decrease only tell that it was needed
+            if admitted_at >= self._backed_off_at:
+                backoff = min(max(self.latency_target / latency, MIN_BACKOFF), MAX_BACKOFF)
+                self._limit = max(self._limit * backoff, MIN_LIMIT)
+                self._backed_off_at = now
+        elif self.in_flight * 2 >= self._limit:
+            # Only raised while the limit is what holds requests back
+            self._limit = min(self._limit + 1 / self._limit, self.max_limit)
+        self._hand_over()
+
+    def _hand_over(self) -> None:
+        """Free a slot and give the free slots to the requests waiting for one."""
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self.in_flight += 1
+
+    def _forget(self, waiter: asyncio.Future[None]) -> None:
+        """Stop a request from waiting for a slot."""
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+
+
+@lru_cache
+def get_concurrency_limiter() -> ConcurrencyLimiter:
+    """Get the process-wide concurrency limiter configured from the settings.
+
+    Returns:
+        The concurrency limiter; check ``enabled`` before installing it.
+    """
+    settings = get_settings()
+    return ConcurrencyLimiter(
+        latency_target=settings.load_shedding_latency_target_ms / 1000,
+        max_limit=settings.load_shedding_max_limit,
+        queue_size=settings.load_shedding_queue_size,
+        queue_timeout=settings.load_shedding_queue_timeout_ms / 1000,
+        exempt_paths=tuple(settings.load_shedding_exempt_paths),
+        enabled=settings.load_shedding_enabled,
+    )
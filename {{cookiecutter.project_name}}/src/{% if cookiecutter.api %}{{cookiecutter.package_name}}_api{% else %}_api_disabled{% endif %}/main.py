@@ -11,17 +11,23 @@ from fastapi_pagination import add_pagination
 {%- endif %}
 
 from {{cookiecutter.package_name}}.logging import get_logger
+from {{cookiecutter.package_name}}.profiling import get_profiler
 {%- if cookiecutter.sentry %}
 from {{cookiecutter.package_name}}.sentry import init_sentry
 {%- endif %}
 from {{cookiecutter.package_name}}_api.config import settings
 from {{cookiecutter.package_name}}_api.exceptions import configure_exception_handlers
+from {{cookiecutter.package_name}}_api.load_shedding import get_concurrency_limiter
+from {{cookiecutter.package_name}}_api.middleware.load_shedding import LoadSheddingMiddleware
 from {{cookiecutter.package_name}}_api.middleware.logging import LoggingMiddleware
+from {{cookiecutter.package_name}}_api.middleware.profiling import ProfilingMiddleware
+from {{cookiecutter.package_name}}_api.middleware.rate_limit import RateLimitMiddleware
 from {{cookiecutter.package_name}}_api.middleware.request_id import RequestIdMiddleware
+from {{cookiecutter.package_name}}_api.rate_limit import get_rate_limiter
 {%- if cookiecutter.api_auth %}
-from {{cookiecutter.package_name}}_api.routers import auth, health
+from {{cookiecutter.package_name}}_api.routers import auth, health, profiling
 {%- else %}
-from {{cookiecutter.package_name}}_api.routers import health
+from {{cookiecutter.package_name}}_api.routers import health, profiling
 {%- endif %}
 {%- if cookiecutter.api_versioning %}
 from {{cookiecutter.package_name}}_api.routers.v1 import router as v1_router
@@ -73,11 +79,30 @@ app.add_middleware(
 app.add_middleware(LoggingMiddleware)
 app.add_middleware(RequestIdMiddleware)
 
+# Opt-in load shedding, inside the rate limiting so that only the requests of clients within their rate count
+concurrency_limiter = get_concurrency_limiter()
+if concurrency_limiter.enabled:
+    app.add_middleware(LoadSheddingMiddleware, limiter=concurrency_limiter)
+
+# Opt-in rate limiting, outside the logging so that rejecting a request costs little
+rate_limiter = get_rate_limiter()
+if rate_limiter.enabled:
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
+# Opt-in profiling, outermost so it covers the whole request
+profiler = get_profiler()
+if profiler.enabled:
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
 # Configure exception handlers
 configure_exception_handlers(app)
 
 # Include routers
 app.include_router(health.router, tags=["Health"])
+if concurrency_limiter.enabled:
+    app.include_router(health.load_router, tags=["Health"])
+if profiler.enabled:
+    app.include_router(profiling.router)
 {%- if cookiecutter.api_auth %}
 app.include_router(auth.router)
 {%- endif %}
@@ -1,6 +1,15 @@
 """Middleware package."""
 
+from {{cookiecutter.package_name}}_api.middleware.load_shedding import LoadSheddingMiddleware
 from {{cookiecutter.package_name}}_api.middleware.logging import LoggingMiddleware
+from {{cookiecutter.package_name}}_api.middleware.profiling import ProfilingMiddleware
+from {{cookiecutter.package_name}}_api.middleware.rate_limit import RateLimitMiddleware
 from {{cookiecutter.package_name}}_api.middleware.request_id import RequestIdMiddleware
 
-__all__ = ["LoggingMiddleware", "RequestIdMiddleware"]
+__all__ = [
+    "LoadSheddingMiddleware",
+    "LoggingMiddleware",
+    "ProfilingMiddleware",
+    "RateLimitMiddleware",
+    "RequestIdMiddleware",
+]
@@ -0,0 +1,47 @@
+"""Load shedding middleware rejecting the requests over the concurrency limit."""
+
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from {{cookiecutter.package_name}}_api.load_shedding import ConcurrencyLimiter, get_concurrency_limiter
+
+# Seconds a rejected client should wait; the limit adapts within a few round trips
+RETRY_AFTER = 1
+
+
+class LoadSheddingMiddleware:
+    """Middleware answering 503 at once to the requests the API has no room for.
+
+    Only installed when LOAD_SHEDDING_ENABLED is set, see {{cookiecutter.package_name}}_api.load_shedding.
+    The admitted requests' latency, until the response is sent, adapts the limit.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: ConcurrencyLimiter | None = None) -> None:
+        self.app = app
+        self.limiter = limiter or get_concurrency_limiter()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Admit the request or shed it.
+
+        Args:
+            scope: The request's ASGI scope.
+            receive: The ASGI receive channel.
+            send: The ASGI send channel.
+        """
+        if scope["type"] != "http" or scope["path"].startswith(self.limiter.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+        admitted_at = await self.limiter.acquire()
+        if admitted_at is None:
+            response = ORJSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"error": "Service overloaded", "details": {"retry_after": RETRY_AFTER}},
+                headers={"Retry-After": str(RETRY_AFTER)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.release(admitted_at)
@@ -0,0 +1,47 @@
+"""Profiling middleware for sampling slow or selected requests."""
+
+from collections.abc import Awaitable, Callable
+
+import anyio.to_thread
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp
+
+from {{cookiecutter.package_name}}.profiling import TOKEN_HEADER, Profile, Profiler, get_profiler
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """Middleware that profiles requests as configured by the profiler.
+
+    Only installed when PROFILING_ENABLED is set, see {{cookiecutter.package_name}}.profiling.
+    """
+
+    def __init__(self, app: ASGIApp, profiler: Profiler | None = None) -> None:
+        super().__init__(app)
+        self.profiler = profiler or get_profiler()
+
+    async def dispatch(
+        self,
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]],
+    ) -> Response:
+        """Process the request inside a profiling scope.
+
+        A kept profile is written from a worker thread, not to block the event loop.
+
+        Args:
+            request: The incoming request.
+            call_next: The next middleware or route handler.
+
+        Returns:
+            The response from the route handler.
+        """
+        kept: list[Profile] = []
+        token = request.headers.get(TOKEN_HEADER)
+        try:
+            with self.profiler.profile_request(request.method, request.url.path, token, write=False) as kept:
+                return await call_next(request)
+        finally:
+            for profile in kept:
+                await anyio.to_thread.run_sync(self.profiler.write, profile)
@@ -0,0 +1,53 @@
+"""Rate limiting middleware rejecting clients over their request rate."""
+
+import math
+
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from {{cookiecutter.package_name}}_api.rate_limit import Decision, RateLimiter, get_rate_limiter
+
+
+def too_many_requests(decision: Decision) -> ORJSONResponse:
+    """Build the 429 response of a rejected request.
+
+    Args:
+        decision: The rejection.
+
+    Returns:
+        The response, telling the client when to retry.
+    """
+    retry_after = math.ceil(decision.retry_after)
+    return ORJSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"error": "Too many requests", "details": {"retry_after": retry_after}},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+class RateLimitMiddleware:
+    """Middleware answering 429 with a Retry-After header to clients over their rate.
+
+    Only installed when RATE_LIMIT_ENABLED is set, see {{cookiecutter.package_name}}_api.rate_limit. A plain
+    ASGI middleware, it adds no task or response wrapping to the requests it admits.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter | None = None) -> None:
+        self.app = app
+        self.limiter = limiter or get_rate_limiter()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Admit the request or reject it.
+
+        Args:
+            scope: The request's ASGI scope.
+            receive: The ASGI receive channel.
+            send: The ASGI send channel.
+        """
+        if scope["type"] == "http":
+            decision = await self.limiter.check(scope)
+            if decision is not None and not decision.allowed:
+                await too_many_requests(decision)(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
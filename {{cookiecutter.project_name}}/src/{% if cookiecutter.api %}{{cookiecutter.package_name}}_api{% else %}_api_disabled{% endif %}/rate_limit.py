@@ -0,0 +1,361 @@
+"""Per-client rate limiting with the generic cell rate algorithm (GCRA).
+
+GCRA is a token bucket kept as a single number per client, the theoretical arrival
+time (TAT) of its next request: a client making one request every ``1 / rate``
+seconds keeps its TAT at the current time, and each request pushes it one interval
+further. A request is admitted while the TAT stays less than ``burst`` intervals
+ahead of the clock, so a client may make ``burst`` requests at once and then
+``rate`` per second; when rejected, it learns exactly when to retry.
+
+Buckets live in the process (MemoryBackend) or in Redis (RedisBackend), where a Lua
+script reads and updates a client's TAT atomically on Redis' own clock, so that all
+workers, containers and Lambda environments share the limits. The Redis backend
+needs the ``redis`` package.
+
+Clients are told apart by the subject of their bearer token, by an API key header,
+or by their IP address, in that order, see RateLimiter.client_key. Configuration
+comes from the RATE_LIMIT_* settings, see get_rate_limiter.
+"""
+
+import hashlib
+import math
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Protocol
+
+{% if cookiecutter.api_lambda_powertools_metrics -%}
+from aws_lambda_powertools import Metrics
+from aws_lambda_powertools.metrics import MetricUnit
+{% endif -%}
+from starlette.types import Scope
+
+from {{cookiecutter.package_name}}.logging import get_logger
+{%- if cookiecutter.api_auth %}
+from {{cookiecutter.package_name}}_api.auth.jwt import verify_token
+{%- endif %}
+from {{cookiecutter.package_name}}_api.config import get_settings
+{%- if cookiecutter.api_auth %}
+from {{cookiecutter.package_name}}_api.exceptions import UnauthorizedError
+{%- endif %}
+
+logger = get_logger()
+{%- if cookiecutter.api_lambda_powertools_metrics %}
+# Flushed by the Lambda handler with its own metrics
+powertools_metrics = Metrics()
+{%- endif %}
+
+# KEYS[1]: the client's bucket; ARGV: the interval between requests in seconds, the burst,
+# the requests to take. Returns whether they are admitted, the requests left, and the
+# seconds until the next one is admitted and until the bucket is full; Lua numbers are
+# cut to integers on the way out of a script, so the times are returned as strings.
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local tat = math.max(tonumber(redis.call("GET", KEYS[1])) or now, now)
+local allow_at = tat + math.min(cost, burst) * interval - burst * interval
+if now < allow_at then
+    return {0, 0, tostring(allow_at - now), tostring(tat - now)}
+end
+local spent_at = tat + cost * interval - burst * interval
+tat = tat + cost * interval
+redis.call("SET", KEYS[1], tostring(tat), "PX", math.ceil((tat - now) * 1000))
+return {1, math.max(math.floor((now - spent_at) / interval), 0), "0", tostring(tat - now)}
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class Decision:
+    """Whether a request is admitted.
+
+    Attributes:
+        allowed: Whether the request may proceed.
+        remaining: Requests the client may still make at once.
+        retry_after: Seconds until the client's next request is admitted, 0 if allowed.
+        reset_after: Seconds until the client's bucket is full again.
+    """
+
+    allowed: bool
+    remaining: int
+    retry_after: float
+    reset_after: float
+
+
+def gcra(tat: float, now: float, interval: float, burst: int, cost: int = 1) -> tuple[float, Decision]:
+    """Admit a request or not, as GCRA_SCRIPT does in Redis.
+
+    A request costing more than the burst is admitted once the bucket is full, and
+    then holds the client back for its whole cost.
+
+    Args:
+        tat: The client's theoretical arrival time, ``now`` or earlier if it has none.
+        now: The current time.
+        interval: Seconds between requests at the sustained rate.
+        burst: Requests the client may make at once.
+        cost: Requests the request counts as.
+
+    Returns:
+        The client's new theoretical arrival time and the decision.
+    """
+    tat = max(tat, now)
+    allow_at = tat + min(cost, burst) * interval - burst * interval
+    if now < allow_at:
+        return tat, Decision(False, 0, allow_at - now, tat - now)
+    spent_at = tat + cost * interval - burst * interval
+    tat += cost * interval
+    return tat, Decision(True, max(math.floor((now - spent_at) / interval), 0), 0.0, tat - now)
+
+
+class RateLimitBackend(Protocol):
+    """Where the clients' buckets are kept."""
+
+    async def acquire(self, key: str, interval: float, burst: int, cost: int = 1) -> Decision:
+        """Take requests from a client's bucket.
+
+        Args:
+            key: The client.
+            interval: Seconds between requests at the sustained rate.
+            burst: Requests the client may make at once.
+            cost: Requests to take.
+
+        Returns:
+            Whether the requests are admitted.
+        """
+        ...
+
+
+class MemoryBackend:
+    """Buckets in the process, each worker limiting the requests it serves.
+
+    A client's entry is only needed until its bucket is full again, so once there
+    are more than ``max_keys`` entries the ones that have reached that point are
+    dropped.
+    """
+
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_keys = max_keys
+        self.clock = clock
+        self._tats: dict[str, float] = {}
+
+    async def acquire(self, key: str, interval: float, burst: int, cost: int = 1) -> Decision:
+        """Take requests from a client's bucket.
+
+        Args:
+            key: The client.
+            interval: Seconds between requests at the sustained rate.
+            burst: Requests the client may make at once.
+            cost: Requests to take.
+
+        Returns:
+            Whether the requests are admitted.
+        """
+        now = self.clock()
+        tat, decision = gcra(self._tats.get(key, now), now, interval, burst, cost)
+        if decision.allowed:
+            self._tats[key] = tat
+            if len(self._tats) > self.max_keys:
+                self._tats = {client: full_at for client, full_at in self._tats.items() if full_at > now}
+        return decision
+
+    def __len__(self) -> int:
+        """Number of clients whose bucket is kept."""
+        return len(self._tats)
+
+
+class RedisBackend:
+    """Buckets in Redis, shared by every process."""
+
+    def __init__(self, client: Any, prefix: str = "rate-limit:") -> None:
+        """Register the GCRA script with a client.
+
+        Args:
+            client: A ``redis.asyncio.Redis`` client.
+            prefix: Prefix of the bucket keys.
+        """
+        self.prefix = prefix
+        # Runs the script by its SHA, loading it first where Redis does not know it yet
+        self._script = client.register_script(GCRA_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        """Connect to Redis.
+
+        Args:
+            url: Redis URL, e.g. redis://localhost:6379/0.
+
+        Returns:
+            The backend.
+        """
+        from redis.asyncio import Redis
+
+        return cls(Redis.from_url(url))
+
+    async def acquire(self, key: str, interval: float, burst: int, cost: int = 1) -> Decision:
+        """Take requests from a client's bucket.
+
+        Args:
+            key: The client.
+            interval: Seconds between requests at the sustained rate.
+            burst: Requests the client may make at once.
+            cost: Requests to take.
+
+        Returns:
+            Whether the requests are admitted.
+        """
+        allowed, remaining, retry_after, reset_after = await self._script(
+            keys=[self.prefix + key], args=[repr(interval), burst, cost]
+        )
+        return Decision(bool(allowed), int(remaining), float(retry_after), float(reset_after))
+
+
+@dataclass
+class RateLimitMetrics:
+    """Counts of the limiter's decisions since the process started.
+
+    Attributes:
+        allowed: Requests admitted.
+        rejected: Requests rejected, by the kind of client key: user, key or ip.{% if cookiecutter.api_lambda_powertools_metrics %}
+            Rejections are also sent to CloudWatch as the RateLimitedRequests metric.{% endif %}
+        backend_errors: Requests admitted because the backend failed.
+    """
+
+    allowed: int = 0
+    rejected: Counter[str] = field(default_factory=Counter)
+    backend_errors: int = 0
+
+
+class RateLimiter:
+    """Admits or rejects requests by the rate of their client."""
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        rate: float,
+        burst: int,
+        exempt_paths: tuple[str, ...] = (),
+        api_key_header: str | None = None,
+        enabled: bool = True,
+    ) -> None:
+        """Configure the limiter.
+
+        Args:
+            backend: Where the buckets are kept.
+            rate: Requests per second a client may sustain.
+            burst: Requests a client may make at once.
+            exempt_paths: Path prefixes whose requests are never limited.
+            api_key_header: Header telling clients apart by API key, if the API has keys.
+            enabled: Whether the limiter should be installed.
+        """
+        self.backend = backend
+        self.rate = rate
+        self.interval = 1 / rate
+        self.burst = burst
+        self.exempt_paths = exempt_paths
+        self.api_key_header = api_key_header.lower().encode("latin-1") if api_key_header else None
+        self.enabled = enabled
+        self.metrics = RateLimitMetrics()
+
+    def client_key(self, scope: Scope) -> tuple[str, str]:
+        """Tell which client made a request.
+        {%- if cookiecutter.api_auth %}
+
+        A valid bearer token names the client by its subject. The verified token is
+        kept in the request state, where get_current_user finds it rather than
+        verifying it again.
+        {%- endif %}
+
+        Otherwise the API key header names the client, if configured and sent, hashed
+        so that keys are not stored, and at last its IP address does. API keys are
+        only worth telling clients apart by if the API rejects unknown ones, or a
+        client escapes its limit by sending a new key each time.
+
+        Args:
+            scope: The request's ASGI scope.
+
+        Returns:
+            The kind of key, ``user``, ``key`` or ``ip``, and the key.
+        """
+        {%- if cookiecutter.api_auth %}
+        authorization = api_key = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                authorization = value
+            elif name == self.api_key_header:
+                api_key = value
+        if authorization is not None:
+            scheme, _, token = authorization.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                try:
+                    user = verify_token(token)
+                except UnauthorizedError:
+                    user = None
+                if user is not None:
+                    scope.setdefault("state", {})["verified_token"] = (token, user)
+                    return "user", f"user:{user.sub}"
+        {%- else %}
+        api_key = None
+        if self.api_key_header is not None:
+            for name, value in scope["headers"]:
+                if name == self.api_key_header:
+                    api_key = value
+        {%- endif %}
+        if api_key:
+            return "key", f"key:{hashlib.blake2b(api_key, digest_size=16).hexdigest()}"
+        client = scope.get("client")
+        return "ip", f"ip:{client[0] if client else 'unknown'}"
+
+    async def check(self, scope: Scope, cost: int = 1) -> Decision | None:
+        """Admit a request or not.
+
+        The request is admitted when the backend fails, so that an outage of Redis
+        does not take the API down with it.
+
+        Args:
+            scope: The request's ASGI scope.
+            cost: Requests it counts as, e.g. the requests of a batch.
+
+        Returns:
+            The decision, or None if the request's path is exempt.
+        """
+        if scope["path"].startswith(self.exempt_paths):
+            return None
+        kind, key = self.client_key(scope)
+        try:
+            decision = await self.backend.acquire(key, self.interval, self.burst, cost)
+        except Exception:
+            self.metrics.backend_errors += 1
+            logger.warning("Rate limit backend failed, admitting the request", path=scope["path"], exc_info=True)
+            return None
+        if decision.allowed:
+            self.metrics.allowed += 1
+        else:
+            self.metrics.rejected[kind] += 1
+            {%- if cookiecutter.api_lambda_powertools_metrics %}
+            powertools_metrics.add_metric(name="RateLimitedRequests", unit=MetricUnit.Count, value=1)
+            {%- endif %}
+            logger.warning("Rate limited", client=kind, path=scope["path"], retry_after=decision.retry_after)
+        return decision
+
+
+@lru_cache
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter configured from the settings.
+
+    Returns:
+        The rate limiter; check ``enabled`` before installing it.
+    """
+    settings = get_settings()
+    url = settings.rate_limit_redis_url
+    return RateLimiter(
+        RedisBackend.from_url(url) if url else MemoryBackend(),
+        rate=settings.rate_limit_rate,
+        burst=settings.rate_limit_burst,
+        exempt_paths=tuple(settings.rate_limit_exempt_paths),
+        api_key_header=settings.rate_limit_api_key_header,
+        enabled=settings.rate_limit_enabled,
+    )
@@ -1,10 +1,16 @@
-"""Health check endpoint."""
+"""Health check endpoints."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter{% if cookiecutter.api_auth %}, Depends{% endif %}
+{% if cookiecutter.api_auth %}
+from {{cookiecutter.package_name}}_api.auth import get_current_user
+{%- endif %}
+from {{cookiecutter.package_name}}_api.dependencies import ConcurrencyLimiterDep
+from {{cookiecutter.package_name}}_api.routing import SchemaRoute
+from {{cookiecutter.package_name}}_api.schemas.health import HealthResponse, LoadResponse
 
-from {{cookiecutter.package_name}}_api.schemas.health import HealthResponse
-
-router = APIRouter()
+router = APIRouter(route_class=SchemaRoute)
+# Included only with load shedding enabled{% if cookiecutter.api_auth %}, for signed-in users{% endif %}: the limiter's state shows how to overload the API
+load_router = APIRouter(route_class=SchemaRoute{% if cookiecutter.api_auth %}, dependencies=[Depends(get_current_user)]{% endif %})
 
 
 @router.get("/health", response_model=HealthResponse)
@@ -15,3 +21,25 @@ async def health_check() -> HealthResponse:
         Health status response.
     """
     return HealthResponse(status="healthy", version="{{cookiecutter.version}}")
+
+
+@load_router.get("/health/load", response_model=LoadResponse)
+async def load(limiter: ConcurrencyLimiterDep) -> LoadResponse:
+    """Report the concurrency limit and the requests in flight and waiting.
+
+    Under ``/health``, so never shed; each process reports its own limiter.
+
+    Args:
+        limiter: The process-wide concurrency limiter.
+
+    Returns:
+        The current limit, the requests in flight and queued, and the decision counts.
+    """
+    return LoadResponse(
+        limit=limiter.limit,
+        in_flight=limiter.in_flight,
+        queued=limiter.queued,
+        admitted=limiter.metrics.admitted,
+        rejected=limiter.metrics.rejected,
+        slow=limiter.metrics.slow,
+    )
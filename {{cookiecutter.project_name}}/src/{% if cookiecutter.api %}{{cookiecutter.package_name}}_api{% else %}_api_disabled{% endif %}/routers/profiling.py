@@ -0,0 +1,88 @@
+"""Admin endpoints for timed profiling captures."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, Query, status
+from fastapi.responses import FileResponse
+
+from {{cookiecutter.package_name}}.profiling import ADMIN_PATH, MAX_CAPTURE_SECONDS, TOKEN_HEADER
+from {{cookiecutter.package_name}}_api.dependencies import ProfilerDep
+from {{cookiecutter.package_name}}_api.exceptions import APIError, NotFoundError
+from {{cookiecutter.package_name}}_api.routing import SchemaRoute
+from {{cookiecutter.package_name}}_api.schemas.profiling import ProfileCaptureResponse, ProfileListResponse
+
+
+def require_profiling_token(
+    profiler: ProfilerDep,
+    token: Annotated[str | None, Header(alias=TOKEN_HEADER)] = None,
+) -> None:
+    """Only let through requests carrying the profiling token.
+
+    Args:
+        profiler: The configured profiler.
+        token: Value of the X-Profiling-Token header.
+
+    Raises:
+        APIError: If the token is missing or wrong, or no token is configured.
+    """
+    if not profiler.token_matches(token):
+        raise APIError("Invalid profiling token", status.HTTP_403_FORBIDDEN)
+
+
+router = APIRouter(
+    prefix=ADMIN_PATH,
+    tags=["Profiling"],
+    dependencies=[Depends(require_profiling_token)],
+    route_class=SchemaRoute,
+)
+
+
+@router.post("/captures", response_model=ProfileCaptureResponse, status_code=status.HTTP_202_ACCEPTED)
+async def capture_profile(
+    profiler: ProfilerDep,
+    seconds: Annotated[float, Query(gt=0, le=MAX_CAPTURE_SECONDS, description="Capture duration")] = 10.0,
+) -> ProfileCaptureResponse:
+    """Start sampling every thread of this process for a while, in the background.
+
+    Args:
+        profiler: The configured profiler.
+        seconds: How long to sample.
+
+    Returns:
+        The file name the profile will be written to once the capture ends, and its duration.
+    """
+    _, path = profiler.capture_in_background(seconds)
+    return ProfileCaptureResponse(name=path.name, seconds=seconds)
+
+
+@router.get("/profiles", response_model=ProfileListResponse)
+async def list_profiles(profiler: ProfilerDep) -> ProfileListResponse:
+    """List the written profiles.
+
+    Args:
+        profiler: The configured profiler.
+
+    Returns:
+        File names of the profiles, newest first.
+    """
+    return ProfileListResponse(profiles=[path.name for path in profiler.profiles()])
+
+
+@router.get("/profiles/{name}", response_class=FileResponse)
+async def download_profile(profiler: ProfilerDep, name: str) -> FileResponse:
+    """Download a profile.
+
+    Args:
+        profiler: The configured profiler.
+        name: File name of the profile.
+
+    Returns:
+        The profile file.
+
+    Raises:
+        NotFoundError: If there is no profile with this name.
+    """
+    for path in profiler.profiles():
+        if path.name == name:
+            return FileResponse(path, filename=name)
+    raise NotFoundError("Profile not found")
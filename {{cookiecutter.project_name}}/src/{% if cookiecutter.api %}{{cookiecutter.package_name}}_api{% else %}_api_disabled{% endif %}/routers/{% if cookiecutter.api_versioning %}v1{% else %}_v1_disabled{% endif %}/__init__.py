@@ -1,12 +1,14 @@
 """API v1 router module.
 
 This module aggregates all v1 API endpoints under a common /v1 prefix.
-Add your versioned routes by importing routers and including them here.
+Add your versioned routes by importing routers and including them here;
+POST /v1/batch runs several requests for them in one, see batch.py.
 
 Usage:
     # In your router module (e.g., routers/v1/items.py):
     from fastapi import APIRouter
-    router = APIRouter(prefix="/items", tags=["items"])
+    from {{cookiecutter.package_name}}_api.routing import SchemaRoute
+    router = APIRouter(prefix="/items", tags=["items"], route_class=SchemaRoute)
 
     @router.get("/")
     async def list_items():
@@ -19,8 +21,9 @@ Usage:
 
 from fastapi import APIRouter
 
-from {{cookiecutter.package_name}}_api.routers.v1 import example
+from {{cookiecutter.package_name}}_api.routers.v1 import batch, example
 
 router = APIRouter(prefix="/v1", tags=["v1"])
 
+router.include_router(batch.router)
 router.include_router(example.router)
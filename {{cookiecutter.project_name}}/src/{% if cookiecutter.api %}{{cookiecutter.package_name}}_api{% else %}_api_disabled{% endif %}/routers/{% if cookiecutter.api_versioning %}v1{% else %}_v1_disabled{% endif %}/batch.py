@@ -0,0 +1,201 @@
+"""Batch endpoint running several v1 requests in one.
+
+Each request a client makes pays its round trip, the middleware (CORS, request ID,
+logging){% if cookiecutter.api_auth %} and the verification of its bearer token{% endif %}. POST /v1/batch takes up to
+BATCH_MAX_REQUESTS requests for the other v1 endpoints and runs them concurrently,
+BATCH_CONCURRENCY at a time, straight through the application's routes and
+exception handlers: the middleware runs once for the whole batch. Each request
+inherits the batch's headers, except those it sets itself{% if cookiecutter.api_auth %}, and with them the token
+verified for the batch, which is not verified again{% endif %}. With rate limiting on,
+a batch counts as as many requests as it holds.
+
+Example usage:
+    POST /v1/batch
+    {"requests": [{"path": "/v1/example/"}, {"method": "POST", "path": "/v1/items", "body": {"name": "a"}}]}
+    -> {"results": [{"status": 200, "headers": {...}, "body": {...}}, {"status": 201, ...}]}
+"""
+
+import asyncio
+from typing import Any
+from urllib.parse import unquote
+
+import orjson
+from fastapi import APIRouter{% if cookiecutter.api_auth %}, Depends{% endif %}, Request, status
+from fastapi.middleware.asyncexitstack import AsyncExitStackMiddleware
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from starlette.middleware.exceptions import ExceptionMiddleware
+from starlette.routing import BaseRoute, Match, Router
+from starlette.types import ASGIApp, Message, Scope
+
+from {{cookiecutter.package_name}}.logging import get_logger
+{%- if cookiecutter.api_auth %}
+from {{cookiecutter.package_name}}_api.auth import get_current_user
+{%- endif %}
+from {{cookiecutter.package_name}}_api.dependencies import RateLimiterDep, SettingsDep
+from {{cookiecutter.package_name}}_api.exceptions import BadRequestError
+from {{cookiecutter.package_name}}_api.middleware.rate_limit import too_many_requests
+from {{cookiecutter.package_name}}_api.routing import SchemaRoute
+from {{cookiecutter.package_name}}_api.schemas.batch import BatchItem, BatchRequest, BatchResponse, BatchResult
+
+logger = get_logger()
+
+router = APIRouter(tags=["batch"], route_class=SchemaRoute)
+
+# Scope keys a request of the batch shares with the batch
+SHARED_SCOPE_KEYS = ("type", "asgi", "http_version", "scheme", "server", "client", "root_path", "app", "extensions")
+# Headers describing the batch's own body
+BODY_HEADERS = frozenset({b"content-length", b"content-type", b"transfer-encoding"})
+
+
+@router.post("/batch", response_model=BatchResponse{% if cookiecutter.api_auth %}, dependencies=[Depends(get_current_user)]{% endif %})
+async def run_batch(
+    batch: BatchRequest, request: Request, settings: SettingsDep, rate_limiter: RateLimiterDep
+) -> BatchResponse | ORJSONResponse:
+    """Run the requests of a batch.
+
+    Args:
+        batch: The requests to run.
+        request: The batch request.
+        settings: Application settings.
+        rate_limiter: The rate limiter, which has counted the batch as one request if enabled.
+
+    Returns:
+        What each request answered, in the order of the requests, or 429 if the client
+        cannot make that many requests yet.
+
+    Raises:
+        BadRequestError: If the batch holds more than BATCH_MAX_REQUESTS requests.
+    """
+    if len(batch.requests) > settings.batch_max_requests:
+        raise BadRequestError(f"A batch holds at most {settings.batch_max_requests} requests")
+    if rate_limiter.enabled and len(batch.requests) > 1:
+        decision = await rate_limiter.check(request.scope, cost=len(batch.requests) - 1)
+        if decision is not None and not decision.allowed:
+            return too_many_requests(decision)
+    batch_route: APIRoute = request.scope["route"]
+    prefix = batch_route.path.rpartition("/")[0] + "/"
+    # The innermost layers of the application's middleware stack, which its routes expect
+    app = ExceptionMiddleware(AsyncExitStackMiddleware(request.app.router), handlers=request.app.exception_handlers)
+    limit = asyncio.Semaphore(settings.batch_concurrency)
+
+    async def run(item: BatchItem) -> BatchResult:
+        body = b"" if item.body is None else orjson.dumps(item.body)
+        scope = item_scope(request.scope, item, body)
+        # Checked on the decoded path, as routed, so that escapes cannot smuggle a batch into a batch
+        path = unquote(item.path.partition("?")[0])
+        if not path.startswith(prefix) or matched_route(request.app.router, scope) is batch_route:
+            error = f"Only {prefix}* endpoints other than {batch_route.path} can be batched"
+            return BatchResult(status=status.HTTP_400_BAD_REQUEST, headers={}, body={"error": error})
+        async with limit:
+            return await dispatch(app, scope, body)
+
+    return BatchResponse(results=list(await asyncio.gather(*(run(item) for item in batch.requests))))
+
+
+def item_scope(batch_scope: Scope, item: BatchItem, body: bytes) -> Scope:
+    """Build the ASGI scope of a request of a batch.
+
+    Args:
+        batch_scope: Scope of the batch request.
+        item: The request.
+        body: Its encoded JSON body, empty if none.
+
+    Returns:
+        The request's scope.
+    """
+    path, _, query = item.path.partition("?")
+    own = {name.lower().encode("latin-1"): value.encode("latin-1") for name, value in item.headers.items()}
+    headers = [(name, value) for name, value in batch_scope["headers"] if name not in BODY_HEADERS and name not in own]
+    headers.extend(own.items())
+    if body:
+        headers.extend([(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())])
+    root_path: str = batch_scope.get("root_path", "")
+    return {
+        **{key: batch_scope[key] for key in SHARED_SCOPE_KEYS if key in batch_scope},
+        "method": item.method,
+        "path": root_path + unquote(path),
+        "raw_path": (root_path + path).encode(),
+        "query_string": query.encode(),
+        "headers": headers,
+        "state": dict(batch_scope.get("state", {})),
+    }
+
+
+def matched_route(router: Router, scope: Scope) -> BaseRoute | None:
+    """Find the route a request goes to.
+
+    Args:
+        router: The application's router.
+        scope: Scope of the request.
+
+    Returns:
+        The first route fully matching the request, None if there is none.
+    """
+    for route in router.routes:
+        match, _ = route.matches(scope)
+        if match is Match.FULL:
+            return route
+    return None
+
+
+async def dispatch(app: ASGIApp, scope: Scope, body: bytes) -> BatchResult:
+    """Run one request of a batch through an ASGI app.
+
+    Args:
+        app: The application's routes and exception handlers.
+        scope: Scope of the request.
+        body: Its body.
+
+    Returns:
+        What the request answered.
+    """
+    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    headers: dict[str, str] = {}
+    chunks: list[bytes] = []
+    pending: list[Message] = [{"type": "http.request", "body": body, "more_body": False}]
+    answered = asyncio.Event()
+
+    async def receive() -> Message:
+        if pending:
+            return pending.pop()
+        await answered.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            headers.update((name.decode("latin-1"), value.decode("latin-1")) for name, value in message["headers"])
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                answered.set()
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        logger.exception("Batch request failed", path=scope["path"])
+        return BatchResult(
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR, headers={}, body={"error": "Internal server error"}
+        )
+    finally:
+        answered.set()
+    return BatchResult(status=status_code, headers=headers, body=decode(headers, b"".join(chunks)))
+
+
+def decode(headers: dict[str, str], content: bytes) -> Any:
+    """Decode a response body.
+
+    Args:
+        headers: Response headers.
+        content: Response body.
+
+    Returns:
+        The JSON of a JSON response, the text of any other, None if empty.
+    """
+    if not content:
+        return None
+    if headers.get("content-type", "").startswith("application/json"):
+        return orjson.loads(content)
+    return content.decode(errors="replace")
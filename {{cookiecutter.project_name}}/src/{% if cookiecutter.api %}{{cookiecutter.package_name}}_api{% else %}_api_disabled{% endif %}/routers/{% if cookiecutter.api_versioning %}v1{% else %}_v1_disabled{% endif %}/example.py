@@ -9,7 +9,9 @@ Example usage:
 
 from fastapi import APIRouter
 
-router = APIRouter(prefix="/example", tags=["example"])
+from {{cookiecutter.package_name}}_api.routing import SchemaRoute
+
+router = APIRouter(prefix="/example", tags=["example"], route_class=SchemaRoute)
 
 
 @router.get("/")
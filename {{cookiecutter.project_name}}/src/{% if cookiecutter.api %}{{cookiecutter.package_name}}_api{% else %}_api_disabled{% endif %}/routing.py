@@ -0,0 +1,145 @@
+"""Route class serializing schema responses straight to JSON.
+
+For a route with a ``response_model``, FastAPI validates what the endpoint returns
+against the model, dumps it to Python objects (dicts, lists, strings) and only then
+has the response class, ORJSONResponse here, turn those objects into JSON: the model
+is walked twice. When an endpoint returns an instance of the very schema it declares,
+there is nothing to validate, and pydantic can write the JSON itself in one pass.
+
+SchemaRoute does so for routes whose response model is a BaseSchema or a list of one,
+with the response model's include, exclude and alias options. Anything else, a dict,
+a subclass instance with fields the model would filter out, a route setting headers
+through an injected Response, takes FastAPI's usual path.
+
+Usage:
+    router = APIRouter(prefix="/items", route_class=SchemaRoute)
+"""
+
+import functools
+import inspect
+from collections.abc import Callable, Coroutine
+from dataclasses import replace
+from typing import Any, get_args, get_origin
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.dependencies.models import Dependant
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, get_request_handler
+from pydantic import TypeAdapter
+from starlette.requests import Request
+from starlette.responses import Response
+
+from {{cookiecutter.package_name}}_api.schemas.base import BaseSchema
+
+
+@functools.cache
+def json_adapter(annotation: Any) -> TypeAdapter[Any]:
+    """Get the cached serializer of a response model.
+
+    Args:
+        annotation: A schema class, or a list of one.
+
+    Returns:
+        Type adapter dumping values of the annotation to JSON.
+    """
+    return TypeAdapter(annotation)
+
+
+def schema_model(annotation: Any) -> tuple[type[BaseSchema], bool] | None:
+    """Get the schema a response model is made of.
+
+    Args:
+        annotation: The response model of a route.
+
+    Returns:
+        The schema and whether the response is a list of it, or None if the
+        response model is neither a schema nor a list of one.
+    """
+    many = get_origin(annotation) is list
+    model = get_args(annotation)[0] if many else annotation
+    if inspect.isclass(model) and issubclass(model, BaseSchema):
+        return model, many
+    return None
+
+
+def _sets_response(dependant: Dependant) -> bool:
+    """Whether the endpoint or one of its dependencies takes the Response to set headers or a status on."""
+    return dependant.response_param_name is not None or any(_sets_response(sub) for sub in dependant.dependencies)
+
+
+class SchemaRoute(APIRoute):
+    """APIRoute writing the endpoint's own schema instances to JSON in one pass."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        """Build the request handler, calling the endpoint through a serializer when the route allows it.
+
+        Returns:
+            The ASGI request handler of the route.
+        """
+        serialize = self._serializer()
+        if serialize is None:
+            return super().get_route_handler()
+        call = self.dependant.call
+        if self.dependant.is_coroutine_callable:
+
+            async def endpoint(**values: Any) -> Any:
+                return serialize(await call(**values))  # type: ignore[misc]
+
+        else:
+
+            def endpoint(**values: Any) -> Any:  # type: ignore[misc]
+                return serialize(call(**values))  # type: ignore[misc]
+
+        return get_request_handler(
+            dependant=replace(self.dependant, call=endpoint),
+            body_field=self.body_field,
+            status_code=self.status_code,
+            response_class=self.response_class,
+            response_field=self.secure_cloned_response_field,
+            response_model_include=self.response_model_include,
+            response_model_exclude=self.response_model_exclude,
+            response_model_by_alias=self.response_model_by_alias,
+            response_model_exclude_unset=self.response_model_exclude_unset,
+            response_model_exclude_defaults=self.response_model_exclude_defaults,
+            response_model_exclude_none=self.response_model_exclude_none,
+            dependency_overrides_provider=self.dependency_overrides_provider,
+            embed_body_fields=self._embed_body_fields,
+        )
+
+    def _serializer(self) -> Callable[[Any], Any] | None:
+        """Get the function turning the endpoint's trusted return values into responses.
+
+        Returns:
+            A function answering a schema instance, or a list of them, with its JSON
+            and passing anything else through, or None if the route does not allow it.
+        """
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        schema = schema_model(self.response_model)
+        if schema is None or not issubclass(response_class, JSONResponse) or _sets_response(self.dependant):
+            return None
+        model, many = schema
+        dump_json = json_adapter(self.response_model).dump_json
+        options: dict[str, Any] = {
+            "include": self.response_model_include,
+            "exclude": self.response_model_exclude,
+            "by_alias": self.response_model_by_alias,
+            "exclude_unset": self.response_model_exclude_unset,
+            "exclude_defaults": self.response_model_exclude_defaults,
+            "exclude_none": self.response_model_exclude_none,
+        }
+        status_code = self.status_code or 200
+        media_type = response_class.media_type
+
+        def serialize(value: Any) -> Any:
+            # Only exact instances are trusted: a subclass may carry fields the model filters out
+            if many:
+                trusted = type(value) is list and all(type(item) is model for item in value)
+            else:
+                trusted = type(value) is model
+            if not trusted:
+                return value
+            return Response(dump_json(value, **options), status_code, media_type=media_type)
+
+        return serialize
@@ -8,3 +8,14 @@ class HealthResponse(BaseSchema):
 
     status: str
     version: str
+
+
+class LoadResponse(BaseSchema):
+    """State of the concurrency limiter of the process that answered."""
+
+    limit: int
+    in_flight: int
+    queued: int
+    admitted: int
+    rejected: int
+    slow: int
@@ -0,0 +1,16 @@
+"""Profiling schemas."""
+
+from {{cookiecutter.package_name}}_api.schemas.base import BaseSchema
+
+
+class ProfileCaptureResponse(BaseSchema):
+    """A timed capture running in the background, written to the profile directory when it ends."""
+
+    name: str
+    seconds: float
+
+
+class ProfileListResponse(BaseSchema):
+    """Profiles in the profile directory, newest first."""
+
+    profiles: list[str]
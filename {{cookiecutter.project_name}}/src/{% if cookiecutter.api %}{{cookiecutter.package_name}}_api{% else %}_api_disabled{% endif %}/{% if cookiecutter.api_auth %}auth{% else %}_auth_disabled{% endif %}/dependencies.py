@@ -2,7 +2,7 @@
 
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from fastapi.security import OAuth2PasswordBearer
 
 from {{cookiecutter.package_name}}_api.auth.jwt import verify_token
@@ -12,11 +12,16 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 
 async def get_current_user(
+    request: Request,
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> TokenData:
     """Get current authenticated user from JWT token.
 
+    The verified token is kept in the request state, which the requests of a
+    batch inherit, so that a token is verified once per batch.
+
     Args:
+        request: The current request.
         token: JWT token from Authorization header.
 
     Returns:
@@ -25,7 +30,12 @@ async def get_current_user(
     Raises:
         UnauthorizedError: If token is invalid.
     """
-    return verify_token(token)
+    verified: tuple[str, TokenData] | None = getattr(request.state, "verified_token", None)
+    if verified is not None and verified[0] == token:
+        return verified[1]
+    user = verify_token(token)
+    request.state.verified_token = (token, user)
+    return user
 
 
 CurrentUserDep = Annotated[TokenData, Depends(get_current_user)]
@@ -1,19 +1,32 @@
 """CLI entry point for {{cookiecutter.project_name}}."""
 
-from typing import Annotated
+from typing import Annotated, ClassVar
 
 import typer
 
-from {{cookiecutter.package_name}}.logging import get_logger
+from {{cookiecutter.package_name}}_cli.lazy import LazyTyperGroup
+
+
+class CommandGroup(LazyTyperGroup):
+    """Top-level commands, imported only when invoked to keep startup fast."""
+
+    lazy_commands: ClassVar[dict[str, tuple[str, str]]] = {
+        "version": ("{{cookiecutter.package_name}}_cli.commands.about:version", "Show the application version."),
+        "info": ("{{cookiecutter.package_name}}_cli.commands.about:info", "Show application information."),
+        "process": (
+            "{{cookiecutter.package_name}}_cli.commands.process:process",
+            "Apply a function to every record of a file in parallel.",
+        ),
+    }
+
 
 app = typer.Typer(
     name="{{cookiecutter.project_name}}",
     help="{{cookiecutter.friendly_name}} CLI.",
+    cls=CommandGroup,
     no_args_is_help=True,
 )
 
-logger = get_logger()
-
 
 @app.callback()
 def main(
@@ -24,20 +37,10 @@ def main(
 ) -> None:
     """{{cookiecutter.friendly_name}} command-line interface."""
     if verbose:
-        logger.debug("Verbose mode enabled.")
-
-
-@app.command()
-def version() -> None:
-    """Show the application version."""
-    typer.echo("{{cookiecutter.project_name}} v{{cookiecutter.version}}")
-
+        # Configuring structlog is costly, so only pay for it when something is logged
+        from {{cookiecutter.package_name}}.logging import get_logger
 
-@app.command()
-def info() -> None:
-    """Show application information."""
-    typer.echo("{{cookiecutter.friendly_name}}")
-    typer.echo("Author: {{cookiecutter.author}}")
+        get_logger().debug("Verbose mode enabled.")
 
 
 if __name__ == "__main__":
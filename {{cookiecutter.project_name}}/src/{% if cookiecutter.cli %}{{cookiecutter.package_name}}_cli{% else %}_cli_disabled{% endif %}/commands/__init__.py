@@ -0,0 +1 @@
+"""CLI command implementations, imported only when their command runs."""
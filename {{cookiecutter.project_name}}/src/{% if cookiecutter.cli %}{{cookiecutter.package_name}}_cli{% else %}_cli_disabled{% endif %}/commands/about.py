@@ -0,0 +1,14 @@
+"""Commands that describe the application."""
+
+import typer
+
+
+def version() -> None:
+    """Show the application version."""
+    typer.echo("{{cookiecutter.project_name}} v{{cookiecutter.version}}")
+
+
+def info() -> None:
+    """Show application information."""
+    typer.echo("{{cookiecutter.friendly_name}}")
+    typer.echo("Author: {{cookiecutter.author}}")
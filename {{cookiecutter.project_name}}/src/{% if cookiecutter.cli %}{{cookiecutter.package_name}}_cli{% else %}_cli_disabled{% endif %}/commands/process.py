@@ -0,0 +1,114 @@
+"""Batch processing command."""
+
+import os
+import sys
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import IO, Annotated
+
+import typer
+from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, ProgressColumn, Task, TextColumn, TimeElapsedColumn
+from rich.text import Text
+
+from {{cookiecutter.package_name}}_cli.processing import (
+    Checkpoint,
+    ExecutorKind,
+    RecordFormat,
+    count_records,
+    encode_result,
+    load_function,
+    process_records,
+    read_records,
+)
+
+
+class ThroughputColumn(ProgressColumn):
+    """Records processed per second."""
+
+    def render(self, task: Task) -> Text:
+        """Render the current throughput."""
+        return Text(f"{task.speed or 0:,.0f} records/s", style="progress.data.speed")
+
+
+def process(
+    function: Annotated[
+        str,
+        typer.Argument(help="Function applied to each record, as package.module:function; None results are dropped."),
+    ],
+    input_path: Annotated[str, typer.Argument(metavar="INPUT", help="Input file, or - for stdin.")] = "-",
+    output: Annotated[str, typer.Option("--output", "-o", help="Output file, or - for stdout.")] = "-",
+    jobs: Annotated[int, typer.Option("--jobs", "-j", min=0, help="Number of workers, 0 for one per CPU.")] = 0,
+    executor: Annotated[
+        ExecutorKind, typer.Option(help="Processes for CPU-bound functions, threads for I/O-bound ones.")
+    ] = ExecutorKind.PROCESS,
+    chunk_size: Annotated[int, typer.Option(min=1, help="Records sent to a worker at a time.")] = 100,
+    ordered: Annotated[bool, typer.Option("--ordered/--unordered", help="Keep output in input order.")] = True,
+    record_format: Annotated[
+        RecordFormat, typer.Option("--format", help="Plain text lines, or one JSON document per line.")
+    ] = RecordFormat.LINES,
+    checkpoint_path: Annotated[
+        Path | None,
+        typer.Option("--checkpoint", help="Record progress here and resume from it; output is appended on resume."),
+    ] = None,
+    progress: Annotated[bool, typer.Option("--progress/--no-progress", help="Show a progress bar on stderr.")] = True,
+) -> None:
+    """Apply a function to every record of a file in parallel."""
+    try:
+        callback = load_function(function)
+        checkpoint = Checkpoint(checkpoint_path, chunk_size)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    workers = jobs or os.cpu_count() or 1
+
+    input_stream: IO[bytes]
+    output_stream: IO[bytes]
+    bar = Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        ThroughputColumn(),
+        TimeElapsedColumn(),
+        console=Console(stderr=True),
+        disable=not progress,
+    )
+    # Counting reads the whole input once more, only worth it for the bar
+    total = count_records(input_path) if progress else None
+    task = bar.add_task("Processing", total=total, completed=checkpoint.records_done)
+    processed = skipped = 0
+    start = time.perf_counter()
+
+    with (
+        nullcontext(sys.stdin.buffer) if input_path == "-" else open(input_path, "rb") as input_stream,
+        nullcontext(sys.stdout.buffer)
+        if output == "-"
+        else open(output, "ab" if checkpoint.resumed else "wb") as output_stream,
+        bar,
+    ):
+        chunks = process_records(
+            callback,
+            read_records(input_stream, record_format),
+            jobs=workers,
+            executor=executor,
+            chunk_size=chunk_size,
+            ordered=ordered,
+            checkpoint=checkpoint,
+        )
+        for index, results in chunks:
+            encoded = [encode_result(result, record_format) for result in results if result is not None]
+            output_stream.writelines(encoded)
+            output_stream.flush()
+            checkpoint.mark_done(index)
+            processed += len(results)
+            skipped += len(results) - len(encoded)
+            bar.advance(task, len(results))
+
+    elapsed = time.perf_counter() - start
+    dropped = f", {skipped} of them returning None and not written," if skipped else ""
+    typer.echo(
+        f"Processed {processed} records{dropped} in {elapsed:.1f}s "
+        f"({processed / elapsed if elapsed else 0:,.0f} records/s) "
+        f"with {workers} {executor.value} workers",
+        err=True,
+    )
@@ -0,0 +1,56 @@
+"""Lazily loaded Typer commands.
+
+Subcommands are registered by import path and help text, so ``--help`` and
+commands that do not need them never import the other commands' modules.
+"""
+
+from importlib import import_module
+from typing import Any, ClassVar
+
+import click
+import typer
+from typer.core import TyperCommand, TyperGroup
+
+
+class LazyCommand(TyperCommand):
+    """Placeholder listed in help until its command is invoked."""
+
+    def __init__(self, name: str, import_path: str, help: str) -> None:
+        super().__init__(name=name, help=help, callback=None)
+        self.import_path = import_path
+
+    def load(self) -> click.Command:
+        """Import the command function and build the real command.
+
+        Returns:
+            The command, as Typer would have built it if registered eagerly.
+        """
+        module_name, _, function_name = self.import_path.partition(":")
+        function = getattr(import_module(module_name), function_name)
+        app = typer.Typer(add_completion=False)
+        app.command(name=self.name, help=self.help)(function)
+        return typer.main.get_command(app)
+
+
+class LazyTyperGroup(TyperGroup):
+    """Typer group that imports subcommands only when they are invoked.
+
+    Subclass it, list the subcommands in ``lazy_commands`` as
+    ``{name: ("package.module:function", "Help text.")}``, and pass the
+    subclass to ``typer.Typer(cls=...)``.
+    """
+
+    lazy_commands: ClassVar[dict[str, tuple[str, str]]] = {}
+
+    def __init__(self, **attrs: Any) -> None:
+        super().__init__(**attrs)
+        for name, (import_path, help_text) in self.lazy_commands.items():
+            self.add_command(LazyCommand(name, import_path, help_text))
+
+    def resolve_command(
+        self, ctx: click.Context, args: list[str]
+    ) -> tuple[str | None, click.Command | None, list[str]]:
+        """Replace the invoked placeholder with the real command before resolving it."""
+        if args and isinstance(command := self.commands.get(args[0]), LazyCommand):
+            self.add_command(command.load())
+        return super().resolve_command(ctx, args)
@@ -0,0 +1,233 @@
+"""Parallel processing of records streamed from a file.
+
+Records are read lazily, grouped into chunks, and fanned out to a process or
+thread pool. At most two chunks per worker are in flight, so memory use does not
+grow with input size. Completed chunks can be recorded in a checkpoint file so
+an interrupted run resumes where it stopped.
+"""
+
+import json
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from enum import StrEnum
+from importlib import import_module
+from itertools import batched
+from pathlib import Path
+from typing import IO, Any, cast
+
+import orjson
+
+
+class ExecutorKind(StrEnum):
+    """Pool used to run the function."""
+
+    PROCESS = "process"
+    THREAD = "thread"
+
+
+class RecordFormat(StrEnum):
+    """How input and output records are encoded."""
+
+    LINES = "lines"
+    NDJSON = "ndjson"
+
+
+def load_function(path: str) -> Callable[[Any], Any]:
+    """Import a function from a ``package.module:function`` path.
+
+    Args:
+        path: Import path of the function.
+
+    Returns:
+        The function.
+
+    Raises:
+        ValueError: If the path is malformed or does not point to a callable.
+    """
+    module_name, _, function_name = path.partition(":")
+    if not module_name or not function_name:
+        raise ValueError(f"Expected package.module:function, got {path!r}")
+    try:
+        function = getattr(import_module(module_name), function_name)
+    except (ImportError, AttributeError) as exc:
+        raise ValueError(f"Cannot import {path!r}: {exc}") from exc
+    if not callable(function):
+        raise ValueError(f"{path!r} is not callable")
+    return cast(Callable[[Any], Any], function)
+
+
+def read_records(stream: IO[bytes], fmt: RecordFormat) -> Iterator[Any]:
+    """Stream records from a binary stream.
+
+    Args:
+        stream: Input stream.
+        fmt: LINES yields each line as a string, NDJSON yields each non-blank line decoded.
+
+    Yields:
+        One record per line.
+    """
+    for line in stream:
+        if fmt is RecordFormat.NDJSON:
+            if line.strip():
+                yield orjson.loads(line)
+        else:
+            yield line.rstrip(b"\r\n").decode()
+
+
+def count_records(path: str) -> int | None:
+    """Count the lines of an input file without decoding it.
+
+    Args:
+        path: Input file; ``-`` (stdin) cannot be counted.
+
+    Returns:
+        Number of lines, or None for stdin.
+    """
+    if path == "-":
+        return None
+    count = 0
+    last = b"\n"
+    with open(path, "rb") as stream:
+        while block := stream.read(1024 * 1024):
+            count += block.count(b"\n")
+            last = block[-1:]
+    return count if last == b"\n" else count + 1
+
+
+def encode_result(result: Any, fmt: RecordFormat) -> bytes:
+    """Encode one result as an output line.
+
+    Args:
+        result: Value returned by the function.
+        fmt: Output encoding.
+
+    Returns:
+        The encoded line, including the trailing newline.
+    """
+    if fmt is RecordFormat.NDJSON:
+        return orjson.dumps(result, option=orjson.OPT_APPEND_NEWLINE)
+    return f"{result}\n".encode()
+
+
+class Checkpoint:
+    """Completed chunks of a run, saved as JSON after every chunk so the run can resume.
+
+    Chunks are identified by their position in the input, so a resumed run must use
+    the same input and chunk size.
+    """
+
+    def __init__(self, path: Path | None, chunk_size: int) -> None:
+        self.path = path
+        self.chunk_size = chunk_size
+        # Chunks [0, done_through) are complete, plus any chunks in done
+        self.done_through = 0
+        self.done: set[int] = set()
+        if path is not None and path.exists():
+            data = json.loads(path.read_text())
+            if data["chunk_size"] != chunk_size:
+                raise ValueError(f"{path} was written with --chunk-size {data['chunk_size']}, not {chunk_size}")
+            self.done_through = data["done_through"]
+            self.done = set(data["done"])
+
+    @property
+    def resumed(self) -> bool:
+        """Whether any chunk was completed by an earlier run."""
+        return self.done_through > 0 or bool(self.done)
+
+    @property
+    def records_done(self) -> int:
+        """Approximate number of records already processed."""
+        return (self.done_through + len(self.done)) * self.chunk_size
+
+    def is_done(self, index: int) -> bool:
+        """Whether a chunk was already processed."""
+        return index < self.done_through or index in self.done
+
+    def mark_done(self, index: int) -> None:
+        """Record a chunk as processed and save the checkpoint."""
+        self.done.add(index)
+        while self.done_through in self.done:
+            self.done.remove(self.done_through)
+            self.done_through += 1
+        self.save()
+
+    def save(self) -> None:
+        """Atomically write the checkpoint file."""
+        if self.path is None:
+            return
+        data = {"chunk_size": self.chunk_size, "done_through": self.done_through, "done": sorted(self.done)}
+        temporary = self.path.with_name(f"{self.path.name}.tmp")
+        temporary.write_text(json.dumps(data))
+        os.replace(temporary, self.path)
+
+
+def _apply_chunk(function: Callable[[Any], Any], chunk: list[Any]) -> list[Any]:
+    """Apply the function to every record of a chunk inside a worker."""
+    return [function(record) for record in chunk]
+
+
+def process_records(
+    function: Callable[[Any], Any],
+    records: Iterable[Any],
+    *,
+    jobs: int,
+    executor: ExecutorKind = ExecutorKind.PROCESS,
+    chunk_size: int = 100,
+    ordered: bool = True,
+    checkpoint: Checkpoint | None = None,
+) -> Iterator[tuple[int, list[Any]]]:
+    """Apply a function to every record in parallel.
+
+    Args:
+        function: Function applied to each record; must be importable by name for the process pool.
+        records: Input records, consumed lazily.
+        jobs: Number of workers; 1 runs in the calling thread without a pool.
+        executor: Process pool for CPU-bound functions, thread pool for I/O-bound ones.
+        chunk_size: Records sent to a worker at a time.
+        ordered: Yield chunks in input order; otherwise yield them as they complete.
+        checkpoint: Chunks it marks as done are skipped.
+
+    Yields:
+        Chunk index and the function's results for that chunk's records.
+    """
+    chunks = (
+        (index, list(chunk))
+        for index, chunk in enumerate(batched(records, chunk_size))
+        if checkpoint is None or not checkpoint.is_done(index)
+    )
+
+    if jobs == 1:
+        for index, chunk in chunks:
+            yield index, _apply_chunk(function, chunk)
+        return
+
+    pool: Executor = ProcessPoolExecutor(jobs) if executor is ExecutorKind.PROCESS else ThreadPoolExecutor(jobs)
+    max_in_flight = jobs * 2
+    try:
+        if ordered:
+            queue: deque[tuple[int, Future[list[Any]]]] = deque()
+            for index, chunk in chunks:
+                queue.append((index, pool.submit(_apply_chunk, function, chunk)))
+                if len(queue) >= max_in_flight:
+                    head_index, head = queue.popleft()
+                    yield head_index, head.result()
+            while queue:
+                head_index, head = queue.popleft()
+                yield head_index, head.result()
+        else:
+            pending: dict[Future[list[Any]], int] = {}
+            for index, chunk in chunks:
+                pending[pool.submit(_apply_chunk, function, chunk)] = index
+                if len(pending) >= max_in_flight:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        yield pending.pop(future), future.result()
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    yield pending.pop(future), future.result()
+    finally:
+        # On errors or Ctrl-C, drop queued chunks instead of finishing them
+        pool.shutdown(cancel_futures=True)
@@ -0,0 +1,250 @@
+"""Streaming bulk import and export of model rows as CSV or NDJSON.
+
+Rows are streamed in fixed-size batches so memory stays flat regardless of
+file size: imports write each batch in its own transaction using either
+``bulk_create`` or PostgreSQL ``COPY``, exports read through
+``QuerySet.iterator(chunk_size=...)``, which uses server-side cursors on
+PostgreSQL.
+"""
+
+import csv
+import resource
+import sys
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import suppress
+from itertools import batched
+from pathlib import Path
+from typing import Any
+
+import orjson
+from django.db import connections, transaction
+from django.db.models import Model, QuerySet
+
+FORMATS = ("csv", "ndjson")
+IMPORT_METHODS = ("bulk_create", "copy")
+
+
+class BulkProgress:
+    """Running totals for a bulk import or export."""
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.started_at = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the operation started."""
+        return time.perf_counter() - self.started_at
+
+    @property
+    def rows_per_second(self) -> float:
+        """Average throughput so far."""
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    @staticmethod
+    def peak_memory_mib() -> float:
+        """Peak resident set size of the current process in MiB."""
+        # On Linux ru_maxrss survives exec and may report the parent's peak, VmHWM does not
+        with suppress(OSError):
+            for line in Path("/proc/self/status").read_text().splitlines():
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and in KiB elsewhere
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+    def __str__(self) -> str:
+        """Summarize progress for display."""
+        return (
+            f"{self.rows} rows in {self.elapsed:.1f}s "
+            f"({self.rows_per_second:,.0f} rows/s, peak memory {self.peak_memory_mib():.1f} MiB)"
+        )
+
+
+ProgressCallback = Callable[[BulkProgress], None]
+
+
+def detect_format(path: str, explicit: str | None = None) -> str:
+    """Determine the file format from an explicit choice or the file extension.
+
+    Args:
+        path: Input or output path; ``-`` means stdin/stdout.
+        explicit: Format given by the caller, if any.
+
+    Returns:
+        One of FORMATS.
+
+    Raises:
+        ValueError: If the format cannot be determined.
+    """
+    if explicit is not None:
+        return explicit
+    suffix = Path(path).suffix.lstrip(".").lower()
+    if suffix in FORMATS:
+        return suffix
+    if suffix in ("jsonl", "json"):
+        return "ndjson"
+    raise ValueError(f"Cannot infer format of {path!r}, pass one of {', '.join(FORMATS)} explicitly")
+
+
+def read_records(path: str, fmt: str) -> Iterator[dict[str, Any]]:
+    """Stream records from a CSV or NDJSON file one at a time.
+
+    Args:
+        path: File to read; ``-`` reads stdin.
+        fmt: One of FORMATS.
+
+    Yields:
+        One mapping of field name to value per row.
+    """
+    if fmt == "csv":
+        with (
+            open(sys.stdin.fileno(), encoding="utf-8", newline="", closefd=False)
+            if path == "-"
+            else open(path, encoding="utf-8", newline="")
+        ) as text_stream:
+            yield from csv.DictReader(text_stream)
+    else:
+        with open(sys.stdin.fileno(), "rb", closefd=False) if path == "-" else open(path, "rb") as binary_stream:
+            for line in binary_stream:
+                if line.strip():
+                    yield orjson.loads(line)
+
+
+def write_records(path: str, fmt: str, fields: list[str], rows: Iterable[dict[str, Any]]) -> None:
+    """Stream records to a CSV or NDJSON file.
+
+    Args:
+        path: File to write; ``-`` writes stdout.
+        fmt: One of FORMATS.
+        fields: Field names, used as the CSV header.
+        rows: Records to write.
+    """
+    if fmt == "csv":
+        with (
+            open(sys.stdout.fileno(), "w", encoding="utf-8", newline="", closefd=False)
+            if path == "-"
+            else open(path, "w", encoding="utf-8", newline="")
+        ) as text_stream:
+            writer = csv.DictWriter(text_stream, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(sys.stdout.fileno(), "wb", closefd=False) if path == "-" else open(path, "wb") as binary_stream:
+            for row in rows:
+                binary_stream.write(orjson.dumps(row, default=str, option=orjson.OPT_APPEND_NEWLINE))
+
+
+def _copy_batch(model: type[Model], using: str, keys: list[str], batch: tuple[dict[str, Any], ...]) -> None:
+    """Write one batch with PostgreSQL COPY via psycopg 3, each row in the order of ``keys``."""
+    from psycopg import sql
+
+    fields = {field.attname: field for field in model._meta.concrete_fields}
+    statement = sql.SQL("COPY {table} ({columns}) FROM STDIN").format(
+        table=sql.Identifier(model._meta.db_table),
+        columns=sql.SQL(", ").join(sql.Identifier(fields[key].column) for key in keys),
+    )
+    with connections[using].cursor() as cursor, cursor.copy(statement) as copy:
+        for record in batch:
+            copy.write_row(tuple(record.get(key) for key in keys))
+
+
+def import_records(
+    model: type[Model],
+    records: Iterable[dict[str, Any]],
+    *,
+    batch_size: int,
+    method: str = "bulk_create",
+    using: str = "default",
+    on_progress: ProgressCallback | None = None,
+) -> BulkProgress:
+    """Insert records in batches, each batch in its own transaction.
+
+    Args:
+        model: Model to insert into.
+        records: Mappings of field attribute name (e.g. ``author_id``) to value.
+        batch_size: Number of rows per batch and transaction.
+        method: ``bulk_create``, or ``copy`` for PostgreSQL COPY.
+        using: Database alias to write to.
+        on_progress: Called after every committed batch.
+
+    Returns:
+        Final progress totals.
+
+    Raises:
+        ValueError: If COPY is requested on a database other than PostgreSQL, or a record
+            has keys that are not field attribute names of the model.
+    """
+    if method == "copy" and connections[using].vendor != "postgresql":
+        raise ValueError("The copy method requires a PostgreSQL database")
+
+    fields = {field.attname: field for field in model._meta.concrete_fields}
+    nullable = {attname for attname, field in fields.items() if field.null}
+    progress = BulkProgress()
+
+    for raw_batch in batched(records, batch_size):
+        for number, record in enumerate(raw_batch, start=progress.rows + 1):
+            if unknown := record.keys() - fields.keys():
+                names = ", ".join(sorted(unknown))
+                raise ValueError(f"Record {number} has unknown fields for {model._meta.label}: {names}")
+        # CSV cannot tell NULL from an empty string, so empty nullable values become NULL
+        batch = tuple(
+            {key: None if value == "" and key in nullable else value for key, value in record.items()}
+            for record in raw_batch
+        )
+        with transaction.atomic(using=using):
+            if method == "copy":
+                # Records may order or omit keys differently: COPY the batch's keys in field order, missing ones NULL
+                keys = [key for key in fields if any(key in record for record in batch)]
+                _copy_batch(model, using, keys, batch)
+            else:
+                model._default_manager.db_manager(using).bulk_create(
+                    [model(**record) for record in batch],
+                    batch_size=batch_size,
+                )
+        progress.rows += len(batch)
+        if on_progress is not None:
+            on_progress(progress)
+
+    return progress
+
+
+def iter_export_rows(
+    queryset: QuerySet[Any],
+    fields: list[str],
+    *,
+    chunk_size: int,
+    progress: BulkProgress,
+    on_progress: ProgressCallback | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Stream rows from a queryset without loading it into memory.
+
+    Args:
+        queryset: Rows to export.
+        fields: Field attribute names to export.
+        chunk_size: Rows fetched per round trip (server-side cursor on PostgreSQL).
+        progress: Totals updated as rows are produced.
+        on_progress: Called after every ``chunk_size`` rows.
+
+    Yields:
+        One mapping of field name to value per row.
+    """
+    for row in queryset.values(*fields).iterator(chunk_size=chunk_size):
+        yield row
+        progress.rows += 1
+        if on_progress is not None and progress.rows % chunk_size == 0:
+            on_progress(progress)
+
+
+def export_fields(model: type[Model]) -> list[str]:
+    """Return the attribute names of a model's concrete fields.
+
+    Args:
+        model: Model to export.
+
+    Returns:
+        Field attribute names in declaration order.
+    """
+    return [field.attname for field in model._meta.concrete_fields]
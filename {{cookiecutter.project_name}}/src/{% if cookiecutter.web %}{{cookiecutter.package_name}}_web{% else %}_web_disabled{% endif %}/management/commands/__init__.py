@@ -0,0 +1 @@
+"""Django management commands."""
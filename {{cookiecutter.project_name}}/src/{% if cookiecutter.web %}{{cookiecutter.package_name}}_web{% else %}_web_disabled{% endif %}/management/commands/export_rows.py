@@ -0,0 +1,60 @@
+"""Stream rows of a model to a CSV or NDJSON file."""
+
+from typing import Any
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+
+from {{cookiecutter.package_name}}_web.bulk import (
+    FORMATS,
+    BulkProgress,
+    detect_format,
+    export_fields,
+    iter_export_rows,
+    write_records,
+)
+
+
+class Command(BaseCommand):
+    """Export rows with a chunked iterator so memory stays flat for large tables."""
+
+    help = "Stream rows of a model to a CSV or NDJSON file."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Define command arguments."""
+        parser.add_argument("model", help="Model label, e.g. auth.User")
+        parser.add_argument("path", help="Output file, or - for stdout")
+        parser.add_argument("--format", choices=FORMATS, help="Output format (default: from file extension)")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Rows fetched per database round trip")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="Database alias to read from")
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        """Run the export and report throughput.
+
+        Progress goes to stderr so exporting to stdout produces clean output.
+        """
+        try:
+            model = apps.get_model(options["model"])
+            fmt = detect_format(options["path"], options["format"])
+        except (LookupError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1")
+
+        def report(progress: BulkProgress) -> None:
+            if options["verbosity"] >= 1:
+                self.stderr.write(f"Exported {progress}")
+
+        fields = export_fields(model)
+        progress = BulkProgress()
+        rows = iter_export_rows(
+            model._default_manager.db_manager(options["database"]).order_by("pk"),
+            fields,
+            chunk_size=options["chunk_size"],
+            progress=progress,
+            on_progress=report,
+        )
+        write_records(options["path"], fmt, fields, rows)
+
+        self.stderr.write(self.style.SUCCESS(f"Exported {progress} from {model._meta.label}"))
@@ -0,0 +1,64 @@
+"""Stream rows from a CSV or NDJSON file into a model."""
+
+from typing import Any
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+
+from {{cookiecutter.package_name}}_web.bulk import (
+    FORMATS,
+    IMPORT_METHODS,
+    BulkProgress,
+    detect_format,
+    import_records,
+    read_records,
+)
+
+
+class Command(BaseCommand):
+    """Import rows in batched transactions with bulk_create or PostgreSQL COPY."""
+
+    help = "Stream rows from a CSV or NDJSON file into a model in batched transactions."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Define command arguments."""
+        parser.add_argument("model", help="Model label, e.g. auth.User")
+        parser.add_argument("path", help="Input file, or - for stdin")
+        parser.add_argument("--format", choices=FORMATS, help="Input format (default: from file extension)")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per batch and transaction")
+        parser.add_argument(
+            "--method",
+            choices=IMPORT_METHODS,
+            default="bulk_create",
+            help="Write with bulk_create, or with COPY (PostgreSQL only, fastest)",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="Database alias to write to")
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        """Run the import and report throughput."""
+        try:
+            model = apps.get_model(options["model"])
+            fmt = detect_format(options["path"], options["format"])
+        except (LookupError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        def report(progress: BulkProgress) -> None:
+            if options["verbosity"] >= 1:
+                self.stderr.write(f"Imported {progress}")
+
+        try:
+            progress = import_records(
+                model,
+                read_records(options["path"], fmt),
+                batch_size=options["batch_size"],
+                method=options["method"],
+                using=options["database"],
+                on_progress=report,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {progress} into {model._meta.label}"))
@@ -0,0 +1,138 @@
+"""Django middleware."""
+
+from collections.abc import Callable
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+
+from {{cookiecutter.package_name}}.logging import get_logger
+from {{cookiecutter.package_name}}.profiling import TOKEN_HEADER, get_profiler
+from {{cookiecutter.package_name}}_web.queries import (
+    QUERY_BUDGET_ATTR,
+    QueryBudgetExceededError,
+    format_budget_error,
+    record_queries,
+)
+from {{cookiecutter.package_name}}_web.routers import has_written, pinning_scope
+
+logger = get_logger()
+
+
+class QueryCountMiddleware:
+    """Middleware that records SQL query count, duplicates and database time per request.
+
+    Every request emits a structured "Request queries" log line. Requests that
+    exceed their budget (set per view with ``query_budget`` or globally with
+    QUERY_BUDGET) log a warning, or raise QueryBudgetExceededError when
+    QUERY_BUDGET_STRICT is enabled.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        self.get_response = get_response
+        self.default_budget: int | None = getattr(settings, "QUERY_BUDGET", None)
+        self.strict: bool = getattr(settings, "QUERY_BUDGET_STRICT", False)
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        """Process the request and log its query statistics.
+
+        Args:
+            request: The incoming request.
+
+        Returns:
+            The response from the view.
+
+        Raises:
+            QueryBudgetExceededError: If the request exceeds its budget in strict mode.
+        """
+        with record_queries() as recorder:
+            response = self.get_response(request)
+
+        logger.info(
+            "Request queries",
+            method=request.method,
+            path=request.path,
+            status_code=response.status_code,
+            **recorder.as_log_fields(),
+        )
+
+        budget = self.default_budget
+        if request.resolver_match is not None:
+            budget = getattr(request.resolver_match.func, QUERY_BUDGET_ATTR, budget)
+
+        if budget is not None and recorder.count > budget:
+            if self.strict:
+                raise QueryBudgetExceededError(format_budget_error(recorder, budget))
+            logger.warning(
+                "Query budget exceeded",
+                method=request.method,
+                path=request.path,
+                budget=budget,
+                duplicates=recorder.duplicates,
+                **recorder.as_log_fields(),
+            )
+
+        return response
+
+
+class ReplicaPinningMiddleware:
+    """Middleware that keeps a client on the primary database for a while after it writes.
+
+    Unsafe requests (POST, PUT, PATCH, DELETE) and requests carrying the pin cookie read
+    from the primary. When a request writes, the response sets the pin cookie for
+    DATABASE_REPLICA_PIN_SECONDS, so a redirect-after-POST does not read stale data
+    from a lagging replica. Disabled when no replicas are configured.
+    """
+
+    COOKIE_NAME = "db_pin_primary"
+    UNSAFE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        if not getattr(settings, "DATABASE_REPLICAS", []):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.pin_seconds: int = getattr(settings, "DATABASE_REPLICA_PIN_SECONDS", 15)
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        """Pin the request to the primary if needed and remember writes in a cookie.
+
+        Args:
+            request: The incoming request.
+
+        Returns:
+            The response from the view.
+        """
+        with pinning_scope(pinned=request.method in self.UNSAFE_METHODS or self.COOKIE_NAME in request.COOKIES):
+            response = self.get_response(request)
+            wrote = has_written()
+
+        if wrote:
+            response.set_cookie(self.COOKIE_NAME, "1", max_age=self.pin_seconds, httponly=True, samesite="Lax")
+        return response
+
+
+class ProfilingMiddleware:
+    """Middleware that profiles requests as configured by the profiler.
+
+    Disabled unless PROFILING_ENABLED is set, see {{cookiecutter.package_name}}.profiling. Each
+    request runs on its own thread, so its profile only contains its own work.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        self.profiler = get_profiler()
+        if not self.profiler.enabled:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        """Process the request inside a profiling scope.
+
+        Args:
+            request: The incoming request.
+
+        Returns:
+            The response from the view.
+        """
+        with self.profiler.profile_request(request.method or "", request.path, request.headers.get(TOKEN_HEADER)):
+            return self.get_response(request)
@@ -0,0 +1,76 @@
+"""Admin views for timed profiling captures."""
+
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404, HttpRequest, HttpResponseBadRequest, JsonResponse
+from django.http.response import HttpResponseBase
+from django.views.decorators.http import require_GET, require_POST
+
+from {{cookiecutter.package_name}}.profiling import MAX_CAPTURE_SECONDS, get_profiler
+
+
+def _require_superuser(request: HttpRequest) -> None:
+    """Only let superusers through, and only when profiling is enabled."""
+    if not get_profiler().enabled:
+        raise Http404
+    if not request.user.is_superuser:
+        raise PermissionDenied
+
+
+@require_POST
+def capture(request: HttpRequest) -> HttpResponseBase:
+    """Sample every thread of this process for ``seconds`` (10 by default) and write the profile.
+
+    The capture runs in a background thread, so that it does not hold a worker for its
+    duration; the profile is listed once written.
+
+    Args:
+        request: The incoming request.
+
+    Returns:
+        The duration of the capture, accepted.
+    """
+    _require_superuser(request)
+    try:
+        seconds = float(request.GET.get("seconds", 10))
+    except ValueError:
+        return HttpResponseBadRequest("seconds must be a number")
+    if not 0 < seconds <= MAX_CAPTURE_SECONDS:
+        return HttpResponseBadRequest(f"seconds must be between 0 and {MAX_CAPTURE_SECONDS:g}")
+
+    _, path = get_profiler().capture_in_background(seconds)
+    return JsonResponse({"name": path.name, "seconds": seconds}, status=202)
+
+
+@require_GET
+def profiles(request: HttpRequest) -> HttpResponseBase:
+    """List the written profiles, newest first.
+
+    Args:
+        request: The incoming request.
+
+    Returns:
+        File names of the profiles.
+    """
+    _require_superuser(request)
+    return JsonResponse({"profiles": [path.name for path in get_profiler().profiles()]})
+
+
+@require_GET
+def download(request: HttpRequest, name: str) -> HttpResponseBase:
+    """Download a profile.
+
+    Args:
+        request: The incoming request.
+        name: File name of the profile.
+
+    Returns:
+        The profile file.
+
+    Raises:
+        Http404: If there is no profile with this name.
+    """
+    _require_superuser(request)
+    for path in get_profiler().profiles():
+        if path.name == name:
+            return FileResponse(path.open("rb"), as_attachment=True, filename=name)
+    raise Http404("Profile not found")
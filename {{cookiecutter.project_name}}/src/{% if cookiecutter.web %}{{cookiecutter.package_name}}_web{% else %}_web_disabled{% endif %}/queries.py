@@ -0,0 +1,151 @@
+"""SQL query instrumentation for detecting query explosions and N+1 patterns."""
+
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from typing import Any
+
+from django.db import connections
+
+QUERY_BUDGET_ATTR = "query_budget"
+
+
+class QueryBudgetExceededError(AssertionError):
+    """Raised when a block of code executes more SQL queries than its budget."""
+
+
+class QueryRecorder:
+    """Database execute wrapper that records executed SQL and time spent in the database.
+
+    Install it on a connection with ``connection.execute_wrapper(recorder)``, or use
+    :func:`record_queries` to cover every configured database at once.
+    """
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+        self.duration = 0.0
+
+    def __call__(
+        self,
+        execute: Callable[[str, Any, bool, dict[str, Any]], Any],
+        sql: str,
+        params: Any,
+        many: bool,
+        context: dict[str, Any],
+    ) -> Any:
+        """Execute the statement and record it.
+
+        Args:
+            execute: The next wrapper or the cursor's execute method.
+            sql: SQL statement with parameter placeholders.
+            params: Statement parameters.
+            many: Whether this is an executemany() call.
+            context: Connection and cursor the statement runs on.
+
+        Returns:
+            The result of the wrapped execute call.
+        """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.statements.append(sql)
+
+    @property
+    def count(self) -> int:
+        """Number of executed statements."""
+        return len(self.statements)
+
+    @property
+    def duplicates(self) -> dict[str, int]:
+        """Statements executed more than once, mapped to their execution count.
+
+        Statements are compared before parameter substitution, so the same query
+        repeated for every row of a result set (an N+1 pattern) shows up here.
+        """
+        return {sql: times for sql, times in Counter(self.statements).most_common() if times > 1}
+
+    @property
+    def duplicate_count(self) -> int:
+        """Number of executions that repeated an earlier statement."""
+        return sum(times - 1 for times in self.duplicates.values())
+
+    def as_log_fields(self) -> dict[str, Any]:
+        """Summarize the recorded queries as structured log fields.
+
+        Returns:
+            Query count, duplicate query count, and total database time in milliseconds.
+        """
+        return {
+            "query_count": self.count,
+            "duplicate_query_count": self.duplicate_count,
+            "db_time_ms": round(self.duration * 1000, 2),
+        }
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryRecorder]:
+    """Record SQL executed on every configured database inside the block.
+
+    Yields:
+        The recorder collecting the executed statements.
+    """
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
+
+
+def format_budget_error(recorder: QueryRecorder, budget: int) -> str:
+    """Describe a query budget violation, listing the most repeated statements.
+
+    Args:
+        recorder: Recorder holding the executed statements.
+        budget: Maximum number of queries that was allowed.
+
+    Returns:
+        Human-readable error message.
+    """
+    lines = [f"Executed {recorder.count} queries, budget is {budget}."]
+    for sql, times in list(recorder.duplicates.items())[:5]:
+        lines.append(f"  {times}x {sql}")
+    return "\n".join(lines)
+
+
+@contextmanager
+def assert_max_queries(budget: int) -> Iterator[QueryRecorder]:
+    """Fail if the block executes more than ``budget`` SQL queries.
+
+    Args:
+        budget: Maximum number of queries allowed.
+
+    Yields:
+        The recorder collecting the executed statements.
+
+    Raises:
+        QueryBudgetExceededError: If the block exceeds the budget.
+    """
+    with record_queries() as recorder:
+        yield recorder
+    if recorder.count > budget:
+        raise QueryBudgetExceededError(format_budget_error(recorder, budget))
+
+
+def query_budget(max_queries: int) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Set a per-view query budget enforced by QueryCountMiddleware.
+
+    Args:
+        max_queries: Maximum number of queries the view may execute.
+
+    Returns:
+        Decorator that marks the view with its budget.
+    """
+
+    def decorator(view: Callable[..., Any]) -> Callable[..., Any]:
+        setattr(view, QUERY_BUDGET_ATTR, max_queries)
+        return view
+
+    return decorator
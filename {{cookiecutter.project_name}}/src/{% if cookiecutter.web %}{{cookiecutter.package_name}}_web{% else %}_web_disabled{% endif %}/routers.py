@@ -0,0 +1,231 @@
+"""Database routing between the primary and read replicas.
+
+Reads go to a healthy replica chosen round-robin or by lowest latency, writes go
+to the primary. After the first write, the rest of the request (and, through
+ReplicaPinningMiddleware, the client's next requests) reads from the primary
+too, so users always see their own writes. Writes only pin reads inside a
+pinning_scope, so that a management command or a worker thread, which has no
+request to end the pin, does not read from the primary forever after its first
+write.
+"""
+
+import itertools
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.models import Model
+
+from {{cookiecutter.package_name}}.logging import get_logger
+
+logger = get_logger()
+
+SELECTION_STRATEGIES = ("round_robin", "least_latency")
+
+# Replication lag in seconds, 0 when caught up or not a standby
+_POSTGRESQL_LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+_pinned: ContextVar[bool] = ContextVar("pinned_to_primary", default=False)
+_written: ContextVar[bool] = ContextVar("written_to_primary", default=False)
+_scoped: ContextVar[bool] = ContextVar("in_pinning_scope", default=False)
+
+
+def is_pinned_to_primary() -> bool:
+    """Whether reads in the current context go to the primary."""
+    return _pinned.get()
+
+
+def has_written() -> bool:
+    """Whether the current context has routed a write since its pinning scope started."""
+    return _written.get()
+
+
+@contextmanager
+def pinning_scope(pinned: bool = False) -> Iterator[None]:
+    """Start a fresh pinning state, e.g. for one request, and restore the previous one afterwards.
+
+    Args:
+        pinned: Whether reads in the scope start out pinned to the primary.
+
+    Yields:
+        Nothing; query routing inside the block uses the new state.
+    """
+    pinned_token = _pinned.set(pinned)
+    written_token = _written.set(False)
+    scoped_token = _scoped.set(True)
+    try:
+        yield
+    finally:
+        _scoped.reset(scoped_token)
+        _written.reset(written_token)
+        _pinned.reset(pinned_token)
+
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    """Read from the primary inside the block, e.g. right before a write that depends on the read.
+
+    Yields:
+        Nothing; reads inside the block go to the primary.
+    """
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class ReplicaStatus:
+    """Latest health check result for one replica."""
+
+    # Weight of the newest latency sample in the moving average
+    LATENCY_SMOOTHING = 0.3
+
+    def __init__(self, alias: str) -> None:
+        self.alias = alias
+        self.healthy = False
+        self.latency: float | None = None
+        self.lag: float | None = None
+
+    def record(self, latency: float, lag: float, max_lag: float) -> None:
+        """Record a successful check.
+
+        Args:
+            latency: Round trip time of the check in seconds.
+            lag: Replication lag in seconds.
+            max_lag: Lag above which the replica is considered unhealthy.
+        """
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.LATENCY_SMOOTHING * (latency - self.latency)
+        self.lag = lag
+        self.healthy = lag <= max_lag
+
+    def record_failure(self) -> None:
+        """Record a failed check."""
+        self.healthy = False
+
+
+class ReplicaRouter:
+    """Route reads to replicas listed in DATABASE_REPLICAS and writes to the primary.
+
+    Replicas are checked at most every DATABASE_REPLICA_CHECK_INTERVAL seconds, by
+    whichever request finds the results stale. A replica that fails the check or lags
+    more than DATABASE_REPLICA_MAX_LAG seconds gets no reads until a later check
+    passes; with no healthy replica, reads fall back to the primary.
+    """
+
+    def __init__(self) -> None:
+        selection = getattr(settings, "DATABASE_REPLICA_SELECTION", "round_robin")
+        if selection not in SELECTION_STRATEGIES:
+            raise ImproperlyConfigured(
+                f"DATABASE_REPLICA_SELECTION must be one of {', '.join(SELECTION_STRATEGIES)}, got {selection!r}"
+            )
+        self.statuses: dict[str, ReplicaStatus] = {}
+        self.checked_at: float | None = None
+        self._check_lock = threading.Lock()
+        self._round_robin = itertools.count()
+
+    @property
+    def replicas(self) -> list[str]:
+        """Aliases of the configured replicas."""
+        return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+    def check_replica(self, alias: str) -> tuple[float, float]:
+        """Measure the round trip time and replication lag of a replica.
+
+        Args:
+            alias: Replica database alias.
+
+        Returns:
+            Latency and replication lag, both in seconds.
+        """
+        connection = connections[alias]
+        start = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute(_POSTGRESQL_LAG_QUERY if connection.vendor == "postgresql" else "SELECT 0")
+            row = cursor.fetchone()
+        return time.perf_counter() - start, float(row[0]) if row else 0.0
+
+    def refresh(self) -> None:
+        """Re-check every replica, unless another thread is already doing it."""
+        if not self._check_lock.acquire(blocking=False):
+            return
+        try:
+            self.checked_at = time.monotonic()
+            max_lag = getattr(settings, "DATABASE_REPLICA_MAX_LAG", 5.0)
+            for alias in self.replicas:
+                status = self.statuses.setdefault(alias, ReplicaStatus(alias))
+                try:
+                    latency, lag = self.check_replica(alias)
+                except DatabaseError as exc:
+                    status.record_failure()
+                    connections[alias].close()
+                    logger.warning("Replica unavailable", alias=alias, error=str(exc))
+                    continue
+                was_healthy = status.healthy
+                status.record(latency, lag, max_lag)
+                if was_healthy and not status.healthy:
+                    logger.warning("Replica lagging", alias=alias, lag=lag, max_lag=max_lag)
+        finally:
+            self._check_lock.release()
+
+    def healthy_replicas(self) -> list[ReplicaStatus]:
+        """Return replicas that passed their latest check, refreshing stale results first."""
+        interval = getattr(settings, "DATABASE_REPLICA_CHECK_INTERVAL", 5.0)
+        if self.checked_at is None or time.monotonic() - self.checked_at >= interval:
+            self.refresh()
+        return [status for alias in self.replicas if (status := self.statuses.get(alias)) and status.healthy]
+
+    def choose_replica(self) -> str:
+        """Pick the database alias to read from.
+
+        Returns:
+            A healthy replica, or the primary if there is none.
+        """
+        if not self.replicas:
+            return DEFAULT_DB_ALIAS
+        healthy = self.healthy_replicas()
+        if not healthy:
+            return DEFAULT_DB_ALIAS
+        if getattr(settings, "DATABASE_REPLICA_SELECTION", "round_robin") == "least_latency":
+            return min(healthy, key=lambda status: status.latency or 0.0).alias
+        return healthy[next(self._round_robin) % len(healthy)].alias
+
+    def db_for_read(self, model: type[Model], **_hints: Any) -> str:
+        """Route reads to a replica unless the current context is pinned to the primary."""
+        if _pinned.get():
+            return DEFAULT_DB_ALIAS
+        return self.choose_replica()
+
+    def db_for_write(self, model: type[Model], **_hints: Any) -> str:
+        """Route writes to the primary and, inside a pinning scope, pin the rest of the scope to it."""
+        if self.replicas and _scoped.get():
+            _pinned.set(True)
+            _written.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **_hints: Any) -> bool | None:
+        """Allow relations between objects loaded from any database of the pool."""
+        pool = {DEFAULT_DB_ALIAS, *self.replicas}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, _app_label: str, **_hints: Any) -> bool | None:
+        """Never migrate replicas, they receive schema changes through replication."""
+        if db in self.replicas:
+            return False
+        return None
@@ -0,0 +1,32 @@
+"""Django settings for {{cookiecutter.project_name}}.
+
+Settings are assembled with django-split-settings from components shared by
+every environment plus exactly one profile selected by ENVIRONMENT:
+
+- development: DEBUG, django-extensions and django-debug-toolbar
+- test: no dev-only apps, deterministic defaults for the test suite
+- production (unset or any other value): hardened defaults, no dev-only apps
+
+Only the selected profile is evaluated, so dev-only apps and their settings
+are never imported outside of development. Development is opt-in, through
+envs/base.env or Docker Compose: the dev-only apps are dev dependencies, which
+the Docker images leave out.
+"""
+
+from environ import Env
+from split_settings.tools import include
+
+env = Env()
+
+ENVIRONMENT: str = env("ENVIRONMENT", default="production")
+
+_PROFILES = {
+    "development": "development",
+    "test": "test",
+}
+
+include(
+    "components/base.py",
+    "components/security.py",
+    f"environments/{_PROFILES.get(ENVIRONMENT, 'production')}.py",
+)
@@ -0,0 +1 @@
+"""Settings components shared by every environment."""
@@ -1,4 +1,4 @@
-"""Django settings for {{cookiecutter.project_name}}."""
+"""Core Django settings shared by every environment."""
 
 from pathlib import Path
 
@@ -6,11 +6,8 @@ from environ import Env
 
 env = Env()
 
-BASE_DIR = Path(__file__).resolve().parent.parent.parent
-
-SECRET_KEY = env("SECRET_KEY", default="insecure-dev-key-change-in-production")
-
-DEBUG = env.bool("DEBUG", default=True)
+# The project root; an installed package, as in the production image, lives in site-packages, so set APP_ROOT there
+BASE_DIR = Path(env("APP_ROOT", default=str(Path(__file__).resolve().parents[4])))
 
 ALLOWED_HOSTS: list[str] = env.list("ALLOWED_HOSTS", default=["localhost", "127.0.0.1"])
 
@@ -22,13 +19,15 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "corsheaders",
-    "django_extensions",
     "health_check",
     "health_check.db",
+    "{{cookiecutter.package_name}}_web",
 ]
 
 MIDDLEWARE = [
+    "{{cookiecutter.package_name}}_web.middleware.ProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "{{cookiecutter.package_name}}_web.middleware.ReplicaPinningMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -67,19 +66,22 @@ DATABASES = {
     ),
 }
 
-AUTH_PASSWORD_VALIDATORS = [
-    {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
-    {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
-    {"NAME": "django.contrib.auth.password_validation.CommonPasswordValidator"},
-    {"NAME": "django.contrib.auth.password_validation.NumericPasswordValidator"},
-]
-
-PASSWORD_HASHERS = [
-    "django.contrib.auth.hashers.Argon2PasswordHasher",
-    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
-    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
-    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
-]
+# Read replicas, see {{cookiecutter.package_name}}_web.routers. Tests mirror them to the test database.
+DATABASES.update(
+    {
+        f"replica_{index}": {**env.db_url_config(url), "TEST": {"MIRROR": "default"}}
+        for index, url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[]))
+    }
+)
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias.startswith("replica_")]
+DATABASE_ROUTERS = ["{{cookiecutter.package_name}}_web.routers.ReplicaRouter"]
+# "round_robin" or "least_latency"
+DATABASE_REPLICA_SELECTION: str = env("DATABASE_REPLICA_SELECTION", default="round_robin")
+# Replicas lagging more than this many seconds get no reads
+DATABASE_REPLICA_MAX_LAG: float = env.float("DATABASE_REPLICA_MAX_LAG", default=5.0)
+DATABASE_REPLICA_CHECK_INTERVAL: float = env.float("DATABASE_REPLICA_CHECK_INTERVAL", default=5.0)
+# How long a client keeps reading from the primary after a write
+DATABASE_REPLICA_PIN_SECONDS: int = env.int("DATABASE_REPLICA_PIN_SECONDS", default=15)
 
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = env("TIME_ZONE", default="UTC")
@@ -90,18 +92,3 @@ STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
-
-# Django Axes configuration
-AXES_FAILURE_LIMIT = 5
-AXES_COOLOFF_TIME = 1  # hours
-AXES_LOCKOUT_CALLABLE = None
-
-# CSP configuration
-CSP_DEFAULT_SRC = ("'self'",)
-CSP_SCRIPT_SRC = ("'self'",)
-CSP_STYLE_SRC = ("'self'", "'unsafe-inline'")
-CSP_IMG_SRC = ("'self'", "data:")
-
-# CORS configuration
-CORS_ALLOWED_ORIGINS: list[str] = env.list("CORS_ALLOWED_ORIGINS", default=[])
-CORS_ALLOW_CREDENTIALS = env.bool("CORS_ALLOW_CREDENTIALS", default=False)
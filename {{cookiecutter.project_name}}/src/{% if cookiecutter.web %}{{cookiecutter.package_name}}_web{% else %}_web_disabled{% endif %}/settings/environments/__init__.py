@@ -0,0 +1 @@
+"""Per-environment settings profiles."""
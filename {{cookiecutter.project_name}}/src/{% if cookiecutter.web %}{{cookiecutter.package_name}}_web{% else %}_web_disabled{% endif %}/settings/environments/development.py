@@ -0,0 +1,29 @@
+"""Development profile: debugging aids and dev-only apps."""
+
+from environ import Env
+
+from {{cookiecutter.package_name}}_web.settings.components.base import INSTALLED_APPS, MIDDLEWARE
+
+env = Env()
+
+SECRET_KEY = env("SECRET_KEY", default="insecure-dev-key-change-in-production")
+
+DEBUG = env.bool("DEBUG", default=True)
+
+INSTALLED_APPS = [
+    *INSTALLED_APPS,
+    "django_extensions",
+    "debug_toolbar",
+]
+
+MIDDLEWARE = [
+    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "{{cookiecutter.package_name}}_web.middleware.QueryCountMiddleware",
+    *MIDDLEWARE,
+]
+
+INTERNAL_IPS: list[str] = env.list("INTERNAL_IPS", default=["127.0.0.1"])
+
+# Query instrumentation, see {{cookiecutter.package_name}}_web.queries
+QUERY_BUDGET: int | None = env.int("QUERY_BUDGET", default=None)
+QUERY_BUDGET_STRICT = env.bool("QUERY_BUDGET_STRICT", default=False)
@@ -0,0 +1,16 @@
+"""Production profile: hardened defaults, no dev-only apps."""
+
+from environ import Env
+
+env = Env()
+
+SECRET_KEY = env("SECRET_KEY")
+
+DEBUG = False
+
+# TLS is usually terminated by a load balancer in front of the app
+SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
+SECURE_SSL_REDIRECT = env.bool("SECURE_SSL_REDIRECT", default=False)
+SECURE_HSTS_SECONDS = env.int("SECURE_HSTS_SECONDS", default=0)
+SESSION_COOKIE_SECURE = env.bool("SESSION_COOKIE_SECURE", default=True)
+CSRF_COOKIE_SECURE = env.bool("CSRF_COOKIE_SECURE", default=True)
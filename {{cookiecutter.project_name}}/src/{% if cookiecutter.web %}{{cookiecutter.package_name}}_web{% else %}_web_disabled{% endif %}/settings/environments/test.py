@@ -0,0 +1,22 @@
+"""Test profile: no dev-only apps, deterministic defaults for the test suite."""
+
+from environ import Env
+
+from {{cookiecutter.package_name}}_web.settings.components.base import MIDDLEWARE
+
+env = Env()
+
+SECRET_KEY = env("SECRET_KEY", default="test-secret-key-not-for-production")
+
+DEBUG = env.bool("DEBUG", default=False)
+
+EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+MIDDLEWARE = [
+    "{{cookiecutter.package_name}}_web.middleware.QueryCountMiddleware",
+    *MIDDLEWARE,
+]
+
+# Query instrumentation, see {{cookiecutter.package_name}}_web.queries
+QUERY_BUDGET: int | None = env.int("QUERY_BUDGET", default=None)
+QUERY_BUDGET_STRICT = env.bool("QUERY_BUDGET_STRICT", default=False)
@@ -1,9 +1,20 @@
 """URL configuration for {{cookiecutter.project_name}}."""
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 
+from {{cookiecutter.package_name}}_web import profiling
+
 urlpatterns = [
+    # Before the admin site, whose catch-all view would shadow them
+    path("admin/profiling/captures/", profiling.capture, name="profiling-capture"),
+    path("admin/profiling/profiles/", profiling.profiles, name="profiling-profiles"),
+    path("admin/profiling/profiles/<str:name>", profiling.download, name="profiling-download"),
     path("admin/", admin.site.urls),
     path("health/", include("health_check.urls")),
 ]
+
+# Only installed by the development settings profile
+if "debug_toolbar" in settings.INSTALLED_APPS:
+    urlpatterns += [path("__debug__/", include("debug_toolbar.urls"))]
@@ -1,7 +1,16 @@
 import os
 
 from django.core.wsgi import get_wsgi_application
+{%- if cookiecutter.sentry %}
+
+from {{cookiecutter.package_name}}.sentry import init_sentry
+{%- endif %}
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "{{cookiecutter.package_name}}_web.settings")
+{%- if cookiecutter.sentry %}
+
+# Before the application is built, so DjangoIntegration sees every request
+init_sentry()
+{%- endif %}
 
 application = get_wsgi_application()
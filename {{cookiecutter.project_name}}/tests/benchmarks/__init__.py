@@ -0,0 +1 @@
+"""Microbenchmarks with a regression gate."""
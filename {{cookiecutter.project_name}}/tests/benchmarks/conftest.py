@@ -0,0 +1,200 @@
+"""Benchmark fixture and regression gate.
+
+Benchmarks are left out of the default test run; run them with ``./test benchmark``,
+which disables coverage and random ordering. The ``benchmark`` fixture calls a
+function in rounds of at least a few milliseconds and records the fastest round's
+time per call, the one least disturbed by other processes. To compare machines of
+different speeds, and runs on a machine whose load changes, every time is divided
+by the time of a fixed pure-Python workload measured right after it.
+
+A benchmark fails when its normalized time exceeds the one stored in
+``baseline.json`` by more than the tolerance (``--benchmark-tolerance``, 25% by
+default); it is measured again before failing, so one noisy round does not fail
+the run. ``--benchmark-save`` records the results as the new baseline.
+"""
+
+import asyncio
+import gc
+import json
+import time
+from collections.abc import Callable, Coroutine
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+RESULTS = pytest.StashKey[dict[str, dict[str, float]]]()
+BASELINE = pytest.StashKey[dict[str, float]]()
+
+# Each round runs the function enough times to take at least this long
+MIN_ROUND_TIME = 0.005
+ROUNDS = 15
+# Measurements made before declaring a regression
+ATTEMPTS = 3
+
+# A typical API payload: a page of 50 records
+PAYLOAD: dict[str, Any] = {
+    "items": [
+        {"id": index, "name": f"item {index}", "price": index * 1.5, "tags": ["a", "b"], "active": index % 2 == 0}
+        for index in range(50)
+    ],
+    "total": 50,
+    "page": 1,
+}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the benchmark options."""
+    group = parser.getgroup("benchmark")
+    group.addoption("--benchmark-save", action="store_true", help="Record the results as the new baseline")
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown against the baseline, as a fraction (default: 0.25)",
+    )
+    group.addoption("--benchmark-baseline", type=Path, default=BASELINE_PATH, help="Baseline file")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Load the baseline, refusing to time code under coverage, which slows it down unevenly."""
+    if config.getoption("cov_source", None) and not config.getoption("no_cov", False):
+        raise pytest.UsageError("Benchmarks must run without coverage: use ./test benchmark or pass --no-cov")
+    path: Path = config.getoption("benchmark_baseline")
+    config.stash[BASELINE] = json.loads(path.read_text()) if path.exists() else {}
+    config.stash[RESULTS] = {}
+
+
+def measure(run: Callable[[int], object]) -> float:
+    """Fastest time per call of a function over several rounds.
+
+    Args:
+        run: Calls the function under test the given number of times.
+
+    Returns:
+        Seconds per call in the fastest of ROUNDS rounds.
+    """
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        run(iterations)
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_ROUND_TIME:
+            break
+        iterations *= 10 if elapsed < MIN_ROUND_TIME / 10 else 2
+    timings = []
+    # Like timeit, keep garbage collection pauses of earlier tests out of the rounds
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            run(iterations)
+            timings.append((time.perf_counter() - start) / iterations)
+    finally:
+        gc.enable()
+    return min(timings)
+
+
+def reference_workload(iterations: int) -> None:
+    """Fixed pure-Python work whose speed stands for the machine's."""
+    for _ in range(iterations):
+        sum(index * index for index in range(1000))
+
+
+class Benchmark:
+    """Times a function and checks it against the baseline."""
+
+    def __init__(
+        self,
+        name: str,
+        baseline: dict[str, float],
+        results: dict[str, dict[str, float]],
+        tolerance: float,
+        save: bool,
+    ) -> None:
+        self.name = name
+        self.baseline = baseline.get(name)
+        self.results = results
+        self.tolerance = tolerance
+        self.save = save
+
+    def __call__[T](self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Benchmark a function called with the given arguments.
+
+        Returns:
+            The function's result.
+        """
+
+        def run(iterations: int) -> None:
+            for _ in range(iterations):
+                function(*args, **kwargs)
+
+        self._check(run)
+        return function(*args, **kwargs)
+
+    def run_async[T](self, function: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        """Benchmark an async function, awaiting it repeatedly on one event loop.
+
+        Returns:
+            The function's result.
+        """
+
+        async def batch(iterations: int) -> None:
+            for _ in range(iterations):
+                await function()
+
+        with asyncio.Runner(loop_factory=asyncio.new_event_loop) as runner:
+            self._check(lambda iterations: runner.run(batch(iterations)))
+            return runner.run(function())
+
+    def _check(self, run: Callable[[int], object]) -> None:
+        """Measure, retrying on an apparent regression, record the result and fail if it is slower than allowed."""
+        for _ in range(ATTEMPTS):
+            seconds = measure(run)
+            relative = seconds / measure(reference_workload)
+            if self.save or self.baseline is None or relative <= self.baseline * (1 + self.tolerance):
+                break
+        self.results[self.name] = {"seconds": seconds, "relative": relative}
+        if not self.save and self.baseline is not None and relative > self.baseline * (1 + self.tolerance):
+            pytest.fail(
+                f"{self.name} regressed: {relative / self.baseline - 1:+.0%} against the baseline "
+                f"({seconds * 1e6:.1f} µs per call), tolerance {self.tolerance:.0%}"
+            )
+
+
+@pytest.fixture
+def benchmark(request: pytest.FixtureRequest) -> Benchmark:
+    """Benchmark a function and compare it with the baseline.
+
+    Usage:
+        def test_render(benchmark):
+            benchmark(render, payload)
+    """
+    config = request.config
+    return Benchmark(
+        request.node.nodeid.rsplit("/", 1)[-1],
+        config.stash[BASELINE],
+        config.stash[RESULTS],
+        config.getoption("benchmark_tolerance"),
+        config.getoption("benchmark_save"),
+    )
+
+
+def pytest_terminal_summary(terminalreporter: pytest.TerminalReporter, config: pytest.Config) -> None:
+    """Print every benchmark's time and its change against the baseline, and save the baseline if asked to."""
+    results = config.stash.get(RESULTS, {})
+    if not results:
+        return
+    baseline = config.stash[BASELINE]
+    terminalreporter.section("benchmarks")
+    for name, result in sorted(results.items()):
+        change = f"{result['relative'] / baseline[name] - 1:+.1%}" if name in baseline else "new"
+        terminalreporter.write_line(f"{result['seconds'] * 1e6:>12.2f} µs  {change:>8}  {name}")
+    if config.getoption("benchmark_save"):
+        path: Path = config.getoption("benchmark_baseline")
+        saved = {**baseline, **{name: round(result["relative"], 4) for name, result in results.items()}}
+        path.write_text(json.dumps(dict(sorted(saved.items())), indent=2) + "\n")
+        terminalreporter.write_line(f"Saved {len(results)} results to {path}")
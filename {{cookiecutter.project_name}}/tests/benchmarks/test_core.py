@@ -0,0 +1,47 @@
+"""Benchmarks for logging and serialization."""
+
+import json
+import logging
+import os
+from collections.abc import Iterator
+
+import orjson
+import pytest
+import structlog
+from benchmarks.conftest import PAYLOAD, Benchmark
+
+from {{cookiecutter.package_name}}.logging import get_logger
+
+
+@pytest.fixture
+def devnull_logger() -> Iterator[structlog.typing.FilteringBoundLogger]:
+    """The project's logger pipeline at INFO level, as in production, writing to /dev/null."""
+    get_logger()
+    config = structlog.get_config()
+    with open(os.devnull, "w") as sink:
+        yield structlog.wrap_logger(
+            structlog.PrintLogger(sink),
+            processors=config["processors"],
+            wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
+            context_class=config["context_class"],
+        )
+
+
+def test_log_line(benchmark: Benchmark, devnull_logger: structlog.typing.FilteringBoundLogger) -> None:
+    """One structured log line with a few fields, as written by the request logging middleware."""
+    benchmark(devnull_logger.info, "Request completed", method="GET", path="/health", status_code=200, duration_ms=1.2)
+
+
+def test_filtered_log_line(benchmark: Benchmark, devnull_logger: structlog.typing.FilteringBoundLogger) -> None:
+    """A debug line below the log level, which should cost next to nothing."""
+    benchmark(devnull_logger.debug, "Cache hit", key="user:1")
+
+
+def test_orjson_dumps(benchmark: Benchmark) -> None:
+    """Serializing a page of records with orjson."""
+    assert orjson.loads(benchmark(orjson.dumps, PAYLOAD)) == PAYLOAD
+
+
+def test_json_dumps(benchmark: Benchmark) -> None:
+    """The same payload with the standard library, for comparison."""
+    assert json.loads(benchmark(json.dumps, PAYLOAD)) == PAYLOAD
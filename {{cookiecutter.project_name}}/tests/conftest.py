@@ -1,6 +1,8 @@
 """Pytest configuration and fixtures."""
 
+{% if cookiecutter.web -%}
 import os
+{% endif -%}
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -16,12 +18,13 @@ if (_base := _envs_dir / "base.env").exists():
 # Load test environment (overrides base settings)
 if (_test := _envs_dir / "test.env").exists():
     load_dotenv(_test, override=True)
+
+# Duration-balanced parallel runs with pytest-xdist
+pytest_plugins = ["sharding"]
 {%- if cookiecutter.web %}
 
 # Configure Django before pytest-django tries to set up the test database
-os.environ.setdefault(
-    "DJANGO_SETTINGS_MODULE", "{{ cookiecutter.package_name }}_web.settings"
-)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "{{ cookiecutter.package_name }}_web.settings")
 
 import django  # noqa: E402
 
@@ -0,0 +1,200 @@
+"""Duration-balanced parallel test runs with pytest-xdist.
+
+``./test`` runs the unit tests with ``--numprocesses auto``. This plugin sizes the
+worker pool to the machine and to the work: one worker per available CPU, but no
+more than one per ``MIN_WORKER_SECONDS`` of recorded test time, and none at all,
+running in-process, when that leaves a single worker. It then splits the tests
+into one shard per worker, balanced by the durations recorded in
+``.test_durations`` (longest first, each to the least loaded shard), so workers
+finish together instead of one straggling with the slow module.
+
+Every run, serial or parallel, updates ``.test_durations`` with the time each test
+took, setup and teardown included. Tests without a recorded duration count as
+the average one. After a parallel run, the terminal summary compares the wall
+time with the time spent in tests, i.e. what a serial run would have taken.
+
+Each worker is a process of its own that loads ``tests/conftest.py`` itself.
+{%- if cookiecutter.web %} It sets
+up Django, and pytest-django gives it its own test database, suffixed with the
+worker id.
+{%- endif %}
+pytest-cov combines the workers' coverage data into one report.
+"""
+
+import heapq
+import json
+import math
+import os
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+import pytest
+from xdist.scheduler import LoadScopeScheduling
+from xdist.workermanage import WorkerController
+
+DURATIONS_FILE = ".test_durations"
+# Starting a worker takes about this long (imports, Django setup, collection), so
+# fewer seconds of tests than this per worker are better run on fewer workers
+MIN_WORKER_SECONDS = 2.0
+
+
+def load_durations(rootpath: Path) -> dict[str, float]:
+    """Recorded seconds per test node id, empty when none are recorded yet."""
+    path = rootpath / DURATIONS_FILE
+    try:
+        return {nodeid: float(seconds) for nodeid, seconds in json.loads(path.read_text()).items()}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def partition(nodeids: Iterable[str], count: int, durations: Mapping[str, float]) -> list[list[str]]:
+    """Split tests into shards of about equal recorded duration.
+
+    Args:
+        nodeids: Test node ids.
+        count: Number of shards.
+        durations: Recorded seconds per node id; others count as the average.
+
+    Returns:
+        The shards, each in the original test order. The same inputs always give the same shards.
+    """
+    nodeids = list(nodeids)
+    default = sum(durations.values()) / len(durations) if durations else 1.0
+    order = {nodeid: index for index, nodeid in enumerate(nodeids)}
+    # Longest first, ties broken by node id so every process computes the same shards
+    by_duration = sorted(nodeids, key=lambda nodeid: (-durations.get(nodeid, default), nodeid))
+    loads = [(0.0, shard) for shard in range(count)]
+    shards: list[list[str]] = [[] for _ in range(count)]
+    for nodeid in by_duration:
+        load, shard = heapq.heappop(loads)
+        shards[shard].append(nodeid)
+        heapq.heappush(loads, (load + durations.get(nodeid, default), shard))
+    return [sorted(shard, key=order.__getitem__) for shard in shards]
+
+
+class DurationShardScheduling(LoadScopeScheduling):
+    """Sends each worker one shard of tests balanced by recorded duration.
+
+    Shards are the scopes of xdist's ``loadscope`` scheduling, which gives every
+    scope to a single worker.
+    """
+
+    def __init__(self, config: pytest.Config, log: object, durations: Mapping[str, float]) -> None:
+        super().__init__(config, log)
+        self.durations = durations
+        self.shards: dict[str, str] = {}
+
+    def schedule(self) -> None:
+        """Partition the collection once every worker has collected it, then distribute the shards."""
+        if self.collection is None and self.registered_collections:
+            collection = next(iter(self.registered_collections.values()))
+            for index, shard in enumerate(partition(collection, len(self.nodes), self.durations)):
+                self.shards.update(dict.fromkeys(shard, f"shard-{index}"))
+        super().schedule()
+
+    def _split_scope(self, nodeid: str) -> str:
+        return self.shards.get(nodeid, nodeid)
+
+
+def is_controller(config: pytest.Config) -> bool:
+    """Whether this process runs the session, rather than being an xdist worker."""
+    return not hasattr(config, "workerinput")
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on, which can be fewer than the machine has."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def worker_count(cpus: int, durations: Mapping[str, float]) -> int:
+    """Workers worth starting for a test run.
+
+    Args:
+        cpus: CPUs available to the run.
+        durations: Recorded seconds per test node id.
+
+    Returns:
+        One worker per CPU, but no more than one per ``MIN_WORKER_SECONDS`` of recorded
+        test time; 0, for an in-process run, where a single worker would only add its startup time.
+    """
+    workers = cpus
+    if durations:
+        workers = min(workers, math.ceil(sum(durations.values()) / MIN_WORKER_SECONDS))
+    return workers if workers > 1 else 0
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config: pytest.Config) -> int | None:
+    """Size ``--numprocesses auto`` to the available CPUs and the recorded test time."""
+    if os.environ.get("PYTEST_XDIST_AUTO_NUM_WORKERS"):
+        # Explicitly sized: leave it to xdist
+        return None
+    return worker_count(available_cpus(), load_durations(config.rootpath))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config: pytest.Config, log: object) -> DurationShardScheduling | None:
+    """Use duration-balanced shards for xdist's default ``load`` distribution."""
+    if config.getoption("dist") != "load":
+        return None
+    return DurationShardScheduling(config, log, load_durations(config.rootpath))
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Record durations in the process that runs the session."""
+    if is_controller(config):
+        config.pluginmanager.register(DurationRecorder(config), "duration-recorder")
+
+
+class DurationRecorder:
+    """Measures each test and worker, then records the durations and reports the time saved."""
+
+    def __init__(self, config: pytest.Config) -> None:
+        self.config = config
+        self.started = time.perf_counter()
+        self.measured: defaultdict[str, float] = defaultdict(float)
+        self.busy: defaultdict[str, float] = defaultdict(float)
+        # Seconds from the start until each worker had collected the tests
+        self.collected: list[float] = []
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_node_collection_finished(self) -> None:
+        """Time how long a worker took to start and collect the tests."""
+        self.collected.append(time.perf_counter() - self.started)
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        """Add up the time of each test's setup, call and teardown, and of each worker."""
+        self.measured[report.nodeid] += report.duration
+        node: WorkerController | None = getattr(report, "node", None)
+        self.busy[node.gateway.id if node is not None else "main"] += report.duration
+
+    def pytest_sessionfinish(self) -> None:
+        """Record the durations measured in this run, keeping those of tests that did not run."""
+        if not self.measured:
+            return
+        durations = load_durations(self.config.rootpath)
+        durations.update({nodeid: round(seconds, 4) for nodeid, seconds in self.measured.items()})
+        (self.config.rootpath / DURATIONS_FILE).write_text(json.dumps(durations, indent=2, sort_keys=True) + "\n")
+
+    def pytest_terminal_summary(self, terminalreporter: pytest.TerminalReporter) -> None:
+        """Report how long each worker was busy and the wall time running in parallel saved.
+
+        A serial run would have started and collected once, as fast as the fastest
+        worker did, then run every test one after the other.
+        """
+        if not self.config.getoption("numprocesses", None) or not self.busy:
+            return
+        wall = time.perf_counter() - self.started
+        serial = min(self.collected, default=0.0) + sum(self.busy.values())
+        terminalreporter.write_sep("-", "parallel run")
+        terminalreporter.write_line(
+            "busy per worker: " + ", ".join(f"{worker} {seconds:.1f}s" for worker, seconds in sorted(self.busy.items()))
+        )
+        terminalreporter.write_line(
+            f"{len(self.busy)} workers took {wall:.1f}s, about {serial:.1f}s serially: "
+            f"{'saved' if serial >= wall else 'lost'} {abs(serial - wall):.1f}s"
+        )
@@ -0,0 +1,59 @@
+"""Tests for duration-balanced test sharding."""
+
+from sharding import MIN_WORKER_SECONDS, partition, worker_count
+
+
+class TestPartition:
+    """Tests for partition."""
+
+    def test_balances_recorded_durations(self) -> None:
+        """Shards should add up to about the same time, longest tests placed first."""
+        durations = {"a": 5.0, "b": 4.0, "c": 3.0, "d": 3.0, "e": 1.0}
+
+        shards = partition(durations, 2, durations)
+
+        assert shards == [["a", "d"], ["b", "c", "e"]]
+
+    def test_keeps_test_order_within_shards(self) -> None:
+        """Each shard should run its tests in collection order."""
+        shards = partition(["c", "a", "b", "d"], 2, {"a": 2.0, "b": 1.0, "c": 1.0, "d": 2.0})
+
+        assert shards == [["a", "b"], ["c", "d"]]
+
+    def test_unrecorded_tests_count_as_average(self) -> None:
+        """Tests without a recorded duration should weigh as much as the average test."""
+        shards = partition(["slow", "fast", "new"], 2, {"slow": 3.0, "fast": 1.0})
+
+        assert shards == [["slow"], ["fast", "new"]]
+
+    def test_without_durations_balances_counts(self) -> None:
+        """With nothing recorded, shards should hold the same number of tests."""
+        shards = partition([f"test_{index}" for index in range(7)], 3, {})
+
+        assert sorted(len(shard) for shard in shards) == [2, 2, 3]
+
+    def test_ties_do_not_depend_on_test_order(self) -> None:
+        """Tests of equal duration should land in the same shards whatever the collection order."""
+        nodeids = [f"test_{index}" for index in range(10)]
+        durations = dict.fromkeys(nodeids, 1.0)
+
+        shuffled = partition(reversed(nodeids), 3, durations)
+
+        assert [set(shard) for shard in shuffled] == [set(shard) for shard in partition(nodeids, 3, durations)]
+
+
+class TestWorkerCount:
+    """Tests for worker_count."""
+
+    def test_one_worker_per_cpu(self) -> None:
+        """Without recorded durations, every CPU should get a worker."""
+        assert worker_count(8, {}) == 8
+
+    def test_capped_by_recorded_time(self) -> None:
+        """Little recorded work should not start a worker per CPU."""
+        assert worker_count(8, {"a": MIN_WORKER_SECONDS * 3}) == 3
+
+    def test_single_worker_runs_in_process(self) -> None:
+        """A single worker is slower than none, so the tests should run in-process."""
+        assert worker_count(1, {}) == 0
+        assert worker_count(8, {"a": MIN_WORKER_SECONDS / 2}) == 0
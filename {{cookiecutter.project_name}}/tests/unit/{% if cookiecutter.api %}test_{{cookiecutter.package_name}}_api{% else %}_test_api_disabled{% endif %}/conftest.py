@@ -1,15 +1,89 @@
-"""API test fixtures."""
+"""API test fixtures.
 
-from collections.abc import Generator
+The application and its TestClient are shared by the whole session, so the
+lifespan (logging{% if cookiecutter.sentry %}, Sentry{% endif %}) and the client's event loop thread start once
+rather than for every test. Each test gets the shared client through ``client``,
+which restores the dependency overrides and clears the cookies the test left
+behind. Override dependencies through the ``dependency_overrides`` fixture:
 
+    def test_example(client: TestClient, dependency_overrides: DependencyOverrides) -> None:
+        dependency_overrides[get_settings] = lambda: Settings(debug=True)
+        ...
+{%- if cookiecutter.async %}
+
+Async tests can use ``async_client`` instead, which calls the application in the
+test's own event loop and skips the thread hop every TestClient request makes.
+{%- endif %}
+"""
+
+from collections.abc import {% if cookiecutter.async %}AsyncGenerator, {% endif %}Callable, Generator
+from typing import Any
+
+{% if cookiecutter.async -%}
+import httpx
+{% endif -%}
 import pytest
+{%- if cookiecutter.async %}
+import pytest_asyncio
+{%- endif %}
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-from {{cookiecutter.package_name}}_api.main import app
+from {{cookiecutter.package_name}}_api.main import app as main_app
 
+DependencyOverrides = dict[Callable[..., Any], Callable[..., Any]]
 
-@pytest.fixture
-def client() -> Generator[TestClient, None, None]:
-    """Create a test client for the API."""
+
+@pytest.fixture(scope="session")
+def app() -> FastAPI:
+    """The application under test."""
+    return main_app
+
+
+@pytest.fixture(scope="session")
+def session_client(app: FastAPI) -> Generator[TestClient, None, None]:
+    """A test client whose lifespan runs once for the whole session."""
     with TestClient(app) as test_client:
         yield test_client
+
+
+@pytest.fixture
+def dependency_overrides(app: FastAPI) -> Generator[DependencyOverrides, None, None]:
+    """The application's dependency overrides, restored after the test.
+
+    Yields:
+        The overrides mapping, to add a test's overrides to.
+    """
+    saved = dict(app.dependency_overrides)
+    yield app.dependency_overrides
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(saved)
+
+
+@pytest.fixture
+def client(session_client: TestClient, dependency_overrides: DependencyOverrides) -> Generator[TestClient, None, None]:
+    """The shared test client, isolated from other tests.
+
+    Yields:
+        The session's client; its cookies are cleared after the test.
+    """
+    yield session_client
+    session_client.cookies.clear()
+{%- if cookiecutter.async %}
+
+
+@pytest_asyncio.fixture
+async def async_client(
+    app: FastAPI, session_client: TestClient, dependency_overrides: DependencyOverrides
+) -> AsyncGenerator[httpx.AsyncClient, None]:
+    """A client calling the application in the test's event loop.
+
+    Depends on ``session_client`` only so that the lifespan has run.
+
+    Yields:
+        An httpx client sending requests straight to the application.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as test_client:
+        yield test_client
+{%- endif %}
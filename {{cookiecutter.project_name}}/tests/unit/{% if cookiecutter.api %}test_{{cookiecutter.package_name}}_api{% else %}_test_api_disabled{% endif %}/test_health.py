@@ -1,5 +1,8 @@
 """Health endpoint tests."""
 
+{% if cookiecutter.async -%}
+import httpx
+{% endif -%}
 from fastapi.testclient import TestClient
 
 
@@ -12,3 +15,14 @@ def test_health_check(client: TestClient) -> None:
     assert data["status"] == "healthy"
     assert "version" in data
     assert "x-request-id" in response.headers
+{%- if cookiecutter.async %}
+
+
+async def test_health_check_async(async_client: httpx.AsyncClient) -> None:
+    """The health check should answer the same through the application called in the test's event loop."""
+    response = await async_client.get("/health")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+    assert "x-request-id" in response.headers
+{%- endif %}
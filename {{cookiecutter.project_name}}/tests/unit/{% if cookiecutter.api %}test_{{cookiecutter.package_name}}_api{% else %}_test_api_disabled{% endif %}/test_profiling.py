@@ -0,0 +1,134 @@
+"""Profiling middleware and admin endpoint tests."""
+
+import time
+from collections.abc import Generator
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import anyio.to_thread
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from {{cookiecutter.package_name}}.profiling import TOKEN_HEADER, Profiler, get_profiler
+from {{cookiecutter.package_name}}_api.exceptions import configure_exception_handlers
+from {{cookiecutter.package_name}}_api.middleware import ProfilingMiddleware
+from {{cookiecutter.package_name}}_api.routers import profiling
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+TOKEN = "secret"
+HEADERS = {TOKEN_HEADER: TOKEN}
+
+
+@pytest.fixture
+def profiler(tmp_path: Path) -> Profiler:
+    """A profiler writing to a temporary directory."""
+    return Profiler(tmp_path, interval=0.001, routes=("/reports",), token=TOKEN)
+
+
+@pytest.fixture
+def profiled_client(profiler: Profiler) -> Generator[TestClient, None, None]:
+    """Client for an app with profiling enabled."""
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+    configure_exception_handlers(app)
+    app.include_router(profiling.router)
+    app.dependency_overrides[get_profiler] = lambda: profiler
+
+    @app.get("/reports")
+    async def report() -> dict[str, str]:
+        deadline = time.perf_counter() + 0.03
+        while time.perf_counter() < deadline:
+            pass
+        return {"status": "done"}
+
+    @app.get("/items")
+    async def items() -> list[str]:
+        return []
+
+    with TestClient(app) as client:
+        yield client
+
+
+class TestProfilingMiddleware:
+    """Tests for ProfilingMiddleware."""
+
+    def test_profiles_configured_route(self, profiled_client: TestClient, profiler: Profiler) -> None:
+        """Requests to a profiled route should write a profile with the endpoint's frames."""
+        assert profiled_client.get("/reports").status_code == 200
+
+        [path] = profiler.profiles()
+        assert path.name.endswith("-GET-reports.speedscope.json")
+        assert '"name":"profiled_client.<locals>.report"' in path.read_text()
+
+    def test_profiles_requests_with_token(self, profiled_client: TestClient, profiler: Profiler) -> None:
+        """Only requests with the right token header should be profiled."""
+        profiled_client.get("/items")
+        profiled_client.get("/items", headers={TOKEN_HEADER: "wrong"})
+        assert profiler.profiles() == []
+
+        profiled_client.get("/items", headers=HEADERS)
+        assert len(profiler.profiles()) == 1
+
+    def test_writes_from_a_worker_thread(
+        self, profiled_client: TestClient, profiler: Profiler, mocker: "MockerFixture"
+    ) -> None:
+        """Profiles should be written off the event loop."""
+        run_sync = mocker.spy(anyio.to_thread, "run_sync")
+
+        profiled_client.get("/items", headers=HEADERS)
+
+        assert any(call.args[0] == profiler.write for call in run_sync.call_args_list)
+        assert len(profiler.profiles()) == 1
+
+    def test_not_installed_by_default(self, client: TestClient) -> None:
+        """The main app should not expose the admin endpoints unless profiling is enabled."""
+        assert client.post("/admin/profiling/captures", headers=HEADERS).status_code == 404
+
+
+class TestProfilingEndpoints:
+    """Tests for the admin profiling endpoints."""
+
+    @pytest.mark.parametrize("headers", [{}, {TOKEN_HEADER: "wrong"}])
+    def test_requires_token(self, profiled_client: TestClient, headers: dict[str, str]) -> None:
+        """Requests without the right token should be forbidden."""
+        response = profiled_client.get("/admin/profiling/profiles", headers=headers)
+
+        assert response.status_code == 403
+
+    def test_capture_list_and_download(
+        self, profiled_client: TestClient, profiler: Profiler, mocker: "MockerFixture"
+    ) -> None:
+        """A capture should run in the background, then be listed and downloadable."""
+        capture_in_background = mocker.spy(profiler, "capture_in_background")
+
+        response = profiled_client.post("/admin/profiling/captures", params={"seconds": 0.05}, headers=HEADERS)
+
+        assert response.status_code == 202
+        capture = response.json()
+        assert capture == {"name": capture["name"], "seconds": 0.05}
+        assert capture["name"].endswith("-capture.speedscope.json")
+        capture_in_background.spy_return[0].join()
+
+        listed = profiled_client.get("/admin/profiling/profiles", headers=HEADERS).json()
+        assert listed == {"profiles": [capture["name"]]}
+
+        download = profiled_client.get(f"/admin/profiling/profiles/{capture['name']}", headers=HEADERS)
+        assert download.status_code == 200
+        assert download.json()["name"] == "capture"
+
+    @pytest.mark.parametrize("seconds", [0, 61])
+    def test_rejects_capture_duration(self, profiled_client: TestClient, seconds: int) -> None:
+        """Capture durations should be positive and bounded."""
+        response = profiled_client.post("/admin/profiling/captures", params={"seconds": seconds}, headers=HEADERS)
+
+        assert response.status_code == 422
+
+    @pytest.mark.parametrize("name", ["missing.speedscope.json", "..%2F..%2Fetc%2Fpasswd"])
+    def test_download_unknown_profile(self, profiled_client: TestClient, name: str) -> None:
+        """Only files in the profile directory should be served."""
+        response = profiled_client.get(f"/admin/profiling/profiles/{name}", headers=HEADERS)
+
+        assert response.status_code == 404
@@ -0,0 +1,260 @@
+"""Rate limiting tests."""
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+{%- if cookiecutter.api_auth %}
+from pytest_mock import MockerFixture
+{%- endif %}
+from starlette.types import Scope
+{% if cookiecutter.api_auth %}
+from {{cookiecutter.package_name}}_api.auth import CurrentUserDep, create_access_token
+from {{cookiecutter.package_name}}_api.auth import dependencies as auth_dependencies
+{%- endif %}
+from {{cookiecutter.package_name}}_api.middleware import RateLimitMiddleware
+from {{cookiecutter.package_name}}_api.rate_limit import (
+    GCRA_SCRIPT,
+    Decision,
+    MemoryBackend,
+    RateLimiter,
+    RedisBackend,
+    gcra,
+)
+
+
+def run[T](coroutine: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on a new event loop."""
+    return asyncio.run(coroutine, loop_factory=asyncio.new_event_loop)
+
+
+class Clock:
+    """A clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def http_scope(path: str = "/items", headers: dict[str, str] | None = None, client: str = "10.0.0.1") -> Scope:
+    """The scope of a request."""
+    raw_headers = [(name.encode(), value.encode()) for name, value in (headers or {}).items()]
+    return {"type": "http", "path": path, "headers": raw_headers, "client": (client, 50000)}
+
+
+class TestGcra:
+    """Tests for the GCRA decision."""
+
+    def test_burst_then_rate(self) -> None:
+        """A client should make ``burst`` requests at once, then one per interval."""
+        backend = MemoryBackend(clock=(clock := Clock()))
+
+        decisions = [run(backend.acquire("a", 0.5, 3)) for _ in range(4)]
+
+        assert [decision.allowed for decision in decisions] == [True, True, True, False]
+        assert [decision.remaining for decision in decisions] == [2, 1, 0, 0]
+        assert decisions[3].retry_after == pytest.approx(0.5)
+        clock.now += 0.5
+        assert run(backend.acquire("a", 0.5, 3)).allowed
+        assert not run(backend.acquire("a", 0.5, 3)).allowed
+
+    def test_refills_over_time(self) -> None:
+        """An idle client's bucket should be full again after ``burst`` intervals."""
+        backend = MemoryBackend(clock=(clock := Clock()))
+        for _ in range(3):
+            run(backend.acquire("a", 1.0, 3))
+
+        clock.now += 10
+
+        assert run(backend.acquire("a", 1.0, 3)).remaining == 2
+
+    def test_clients_have_their_own_buckets(self) -> None:
+        """One client's requests should not count against another's."""
+        backend = MemoryBackend(clock=Clock())
+        run(backend.acquire("a", 1.0, 1))
+
+        assert not run(backend.acquire("a", 1.0, 1)).allowed
+        assert run(backend.acquire("b", 1.0, 1)).allowed
+
+    def test_drops_full_buckets(self) -> None:
+        """Past ``max_keys`` clients, the buckets that are full again should be dropped."""
+        backend = MemoryBackend(max_keys=2, clock=(clock := Clock()))
+        run(backend.acquire("a", 1.0, 5))
+        run(backend.acquire("b", 1.0, 5))
+        clock.now += 2
+
+        run(backend.acquire("c", 1.0, 5))
+
+        assert len(backend) == 1
+
+    def test_cost(self) -> None:
+        """A request costing several should take as many from the bucket."""
+        backend = MemoryBackend(clock=Clock())
+
+        decisions = [run(backend.acquire("a", 1.0, 5, cost)) for cost in (3, 2, 1)]
+
+        assert [(decision.allowed, decision.remaining) for decision in decisions] == [(True, 2), (True, 0), (False, 0)]
+
+    def test_cost_over_the_burst(self) -> None:
+        """A request costing more than the burst should wait for a full bucket, then hold the client back."""
+        tat, decision = gcra(1000.0, 1000.0, 1.0, 2, cost=5)
+
+        assert (tat, decision) == (1005.0, Decision(True, 0, 0.0, 5.0))
+        assert gcra(tat, 1002.0, 1.0, 2, cost=5)[1] == Decision(False, 0, 3.0, 3.0)
+
+    def test_rejection_leaves_the_bucket_alone(self) -> None:
+        """A rejected request should not push the client's next admission further."""
+        tat, decision = gcra(1002.0, 1000.0, 1.0, 2)
+
+        assert (tat, decision) == (1002.0, Decision(False, 0, 1.0, 2.0))
+
+
+class FakeRedis:
+    """Answers the GCRA script like Redis, from bytes."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[list[str], list[Any]]] = []
+        self.scripts: list[str] = []
+
+    def register_script(self, script: str) -> Any:
+        self.scripts.append(script)
+
+        async def call(keys: list[str], args: list[Any]) -> list[Any]:
+            self.calls.append((keys, args))
+            return [0, 0, b"0.25", b"1.5"]
+
+        return call
+
+
+def test_redis_backend() -> None:
+    """The Redis backend should run the GCRA script on the client's key and decode its reply."""
+    redis = FakeRedis()
+    backend = RedisBackend(redis, prefix="test:")
+
+    decision = run(backend.acquire("ip:10.0.0.1", 0.1, 20))
+
+    assert redis.scripts == [GCRA_SCRIPT]
+    assert redis.calls == [(["test:ip:10.0.0.1"], ["0.1", 20, 1])]
+    assert decision == Decision(False, 0, 0.25, 1.5)
+
+
+class TestClientKey:
+    """Tests for telling clients apart."""
+
+    def test_ip_address(self) -> None:
+        """Without credentials, clients should be told apart by IP address."""
+        limiter = RateLimiter(MemoryBackend(), rate=1, burst=1)
+
+        assert limiter.client_key(http_scope()) == ("ip", "ip:10.0.0.1")
+
+    def test_api_key(self) -> None:
+        """The API key header, when configured, should name the client, hashed."""
+        limiter = RateLimiter(MemoryBackend(), rate=1, burst=1, api_key_header="X-API-Key")
+
+        kind, key = limiter.client_key(http_scope(headers={"x-api-key": "secret-key"}))
+
+        assert kind == "key"
+        assert "secret-key" not in key
+        assert key == limiter.client_key(http_scope(headers={"x-api-key": "secret-key"}, client="10.0.0.2"))[1]
+
+    def test_ignores_api_keys_unless_configured(self) -> None:
+        """Without a configured header, API keys should not name clients."""
+        limiter = RateLimiter(MemoryBackend(), rate=1, burst=1)
+
+        assert limiter.client_key(http_scope(headers={"x-api-key": "secret-key"}))[0] == "ip"
+{%- if cookiecutter.api_auth %}
+
+    def test_token_subject(self) -> None:
+        """A valid bearer token should name the client by its subject, and be kept verified."""
+        limiter = RateLimiter(MemoryBackend(), rate=1, burst=1)
+        token = create_access_token({"sub": "user@example.com"})
+        scope = http_scope(headers={"authorization": f"Bearer {token}"})
+
+        assert limiter.client_key(scope) == ("user", "user:user@example.com")
+        assert scope["state"]["verified_token"][0] == token
+
+    def test_invalid_token(self) -> None:
+        """An invalid token should leave the client to be named by IP address."""
+        limiter = RateLimiter(MemoryBackend(), rate=1, burst=1)
+
+        assert limiter.client_key(http_scope(headers={"authorization": "Bearer invalid"}))[0] == "ip"
+{%- endif %}
+
+
+class FailingBackend:
+    """A backend whose store is down."""
+
+    async def acquire(self, key: str, interval: float, burst: int, cost: int = 1) -> Decision:
+        raise ConnectionError("Redis is down")
+
+
+def limited_client(limiter: RateLimiter) -> TestClient:
+    """Client for an app limited by the given limiter."""
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+
+    @app.get("/items")
+    async def items() -> dict[str, bool]:
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health() -> dict[str, bool]:
+        return {"ok": True}
+    {%- if cookiecutter.api_auth %}
+
+    @app.get("/me")
+    async def me(user: CurrentUserDep) -> dict[str, str]:
+        return {"sub": user.sub}
+    {%- endif %}
+
+    return TestClient(app)
+
+
+class TestRateLimitMiddleware:
+    """Tests for RateLimitMiddleware."""
+
+    def test_rejects_with_retry_after(self) -> None:
+        """Requests over the rate should be answered 429 with the seconds to wait, and counted."""
+        limiter = RateLimiter(MemoryBackend(), rate=0.1, burst=2)
+        client = limited_client(limiter)
+
+        statuses = [client.get("/items").status_code for _ in range(3)]
+        rejected = client.get("/items")
+
+        assert statuses == [200, 200, 429]
+        assert rejected.headers["retry-after"] in {"9", "10"}
+        assert rejected.json()["error"] == "Too many requests"
+        assert limiter.metrics.allowed == 2
+        assert limiter.metrics.rejected == {"ip": 2}
+
+    def test_exempt_paths(self) -> None:
+        """Requests to exempt paths should never be limited."""
+        client = limited_client(RateLimiter(MemoryBackend(), rate=0.1, burst=1, exempt_paths=("/health",)))
+
+        assert [client.get("/health").status_code for _ in range(3)] == [200] * 3
+
+    def test_admits_when_the_backend_fails(self) -> None:
+        """An outage of the backend should not take the API down."""
+        limiter = RateLimiter(FailingBackend(), rate=0.1, burst=1)
+        client = limited_client(limiter)
+
+        assert [client.get("/items").status_code for _ in range(2)] == [200, 200]
+        assert limiter.metrics.backend_errors == 2
+{%- if cookiecutter.api_auth %}
+
+    def test_token_is_verified_once(self, mocker: MockerFixture) -> None:
+        """The token verified to key the limit should not be verified again by the route."""
+        verify = mocker.spy(auth_dependencies, "verify_token")
+        client = limited_client(RateLimiter(MemoryBackend(), rate=10, burst=10))
+        token = create_access_token({"sub": "user@example.com"})
+
+        response = client.get("/me", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.json() == {"sub": "user@example.com"}
+        verify.assert_not_called()
+{%- endif %}
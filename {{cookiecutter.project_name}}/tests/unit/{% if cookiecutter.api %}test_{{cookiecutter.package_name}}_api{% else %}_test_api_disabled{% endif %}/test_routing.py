@@ -0,0 +1,139 @@
+"""Tests for the schema route class."""
+
+from collections.abc import Generator
+from unittest.mock import MagicMock, patch
+
+import fastapi.routing
+import pytest
+from fastapi import APIRouter, FastAPI, Response, status
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from {{cookiecutter.package_name}}_api.routing import SchemaRoute, schema_model
+from {{cookiecutter.package_name}}_api.schemas.base import BaseSchema
+
+
+class Item(BaseSchema):
+    """An item with an optional field."""
+
+    id: int
+    name: str
+    unit_price: float
+    note: str | None = None
+
+
+class SecretItem(Item):
+    """An item with a field the Item response model should not answer."""
+
+    internal_note: str
+
+
+ITEMS = [Item(id=index, name=f"item {index}", unit_price=index * 1.5) for index in range(3)]
+
+
+def items_router(route_class: type[APIRoute]) -> APIRouter:
+    """The same endpoints on a router of the given route class."""
+    router = APIRouter(route_class=route_class)
+
+    @router.get("/items", response_model=list[Item])
+    async def list_items() -> list[Item]:
+        return ITEMS
+
+    @router.get("/items/sync", response_model=list[Item])
+    def list_items_sync() -> list[Item]:
+        return ITEMS
+
+    @router.post("/items", response_model=Item, status_code=status.HTTP_201_CREATED, response_model_exclude_none=True)
+    async def create_item() -> Item:
+        return ITEMS[1]
+
+    @router.get("/items/dict", response_model=Item)
+    async def item_dict() -> dict[str, object]:
+        return {"id": 1, "name": "item 1", "unit_price": 1.5, "extra": True}
+
+    @router.get("/items/secret", response_model=Item)
+    async def secret_item() -> Item:
+        return SecretItem(id=1, name="item 1", unit_price=1.5, internal_note="hidden")
+
+    @router.get("/items/header", response_model=Item)
+    async def item_with_header(response: Response) -> Item:
+        response.headers["x-item"] = "1"
+        return ITEMS[1]
+
+    return router
+
+
+def make_client(route_class: type[APIRoute]) -> TestClient:
+    """A client for an app serving items through routes of the given class."""
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.include_router(items_router(route_class))
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def standard() -> TestClient:
+    """Client for the endpoints on FastAPI's own routes."""
+    return make_client(APIRoute)
+
+
+@pytest.fixture(scope="module")
+def fast() -> TestClient:
+    """Client for the endpoints on schema routes."""
+    return make_client(SchemaRoute)
+
+
+@pytest.fixture
+def serialize_response() -> Generator[MagicMock, None, None]:
+    """FastAPI's response serialization, spied on."""
+    with patch.object(fastapi.routing, "serialize_response", wraps=fastapi.routing.serialize_response) as spy:
+        yield spy
+
+
+@pytest.mark.parametrize(
+    ("method", "path"),
+    [
+        ("GET", "/items"),
+        ("GET", "/items/sync"),
+        ("POST", "/items"),
+        ("GET", "/items/dict"),
+        ("GET", "/items/secret"),
+        ("GET", "/items/header"),
+    ],
+)
+def test_answers_as_fastapi_does(standard: TestClient, fast: TestClient, method: str, path: str) -> None:
+    """Every endpoint should answer the same status, content type and body as on FastAPI's own routes."""
+    expected = standard.request(method, path)
+    response = fast.request(method, path)
+
+    assert response.status_code == expected.status_code
+    assert response.headers["content-type"] == expected.headers["content-type"]
+    assert response.content == expected.content
+    assert response.headers.get("x-item") == expected.headers.get("x-item")
+
+
+@pytest.mark.parametrize(("method", "path"), [("GET", "/items"), ("GET", "/items/sync"), ("POST", "/items")])
+def test_skips_fastapi_serialization(fast: TestClient, serialize_response: MagicMock, method: str, path: str) -> None:
+    """Schema instances should be written to JSON without FastAPI validating and dumping them again."""
+    assert fast.request(method, path).is_success
+    serialize_response.assert_not_called()
+
+
+@pytest.mark.parametrize("path", ["/items/dict", "/items/secret", "/items/header"])
+def test_falls_back_to_fastapi(fast: TestClient, serialize_response: MagicMock, path: str) -> None:
+    """Untrusted values and routes setting headers on an injected response should take FastAPI's path."""
+    assert fast.get(path).is_success
+    serialize_response.assert_called_once()
+
+
+def test_openapi_is_unchanged(standard: TestClient, fast: TestClient) -> None:
+    """The schema routes should document the same API."""
+    assert fast.get("/openapi.json").json() == standard.get("/openapi.json").json()
+
+
+def test_schema_model() -> None:
+    """Only schemas and lists of them should be served by the schema route."""
+    assert schema_model(Item) == (Item, False)
+    assert schema_model(list[Item]) == (Item, True)
+    assert schema_model(dict[str, Item]) is None
+    assert schema_model(int) is None
@@ -0,0 +1,230 @@
+"""Tests for the Lambda event factory and the API clients' replay."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+from common.http import (
+    EVENT_FORMATS,
+    ApiClient,
+    AsyncApiClient,
+    EventFactory,
+    EventRequest,
+    load_events,
+    logged_events,
+    main,
+    random_events,
+    save_events,
+)
+
+BODY = bytes(range(256))
+
+
+class TestEventFactory:
+    """Tests for EventFactory."""
+
+    @pytest.mark.parametrize("event_format", EVENT_FORMATS)
+    def test_round_trips_the_request(self, event_format: str) -> None:
+        """The request read out of an event should be the one it was created from."""
+        event = EventFactory(event_format).create("post", "/items", BODY, {"x-trace": "1"}, {"q": "a b&c"})
+
+        request = EventRequest.from_event(event)
+
+        assert event["isBase64Encoded"]
+        assert (request.method, request.path, request.body) == ("POST", "/items", BODY)
+        assert request.query == [("q", "a b&c")]
+        assert ("x-trace", "1") in request.headers
+
+    @pytest.mark.parametrize(
+        ("event_format", "multi_value", "expected"),
+        [
+            ("alb", False, [("x-tag", "b")]),
+            ("alb", True, [("x-tag", "a"), ("x-tag", "b")]),
+            ("apigw-v1", False, [("x-tag", "a"), ("x-tag", "b")]),
+            ("apigw-v2", False, [("x-tag", "a,b")]),
+            ("function-url", False, [("x-tag", "a,b")]),
+        ],
+    )
+    def test_repeated_headers(self, event_format: str, multi_value: bool, expected: list[tuple[str, str]]) -> None:
+        """A repeated header should be kept, joined or cut to its last value, as each format does."""
+        event = EventFactory(event_format, multi_value=multi_value).create("GET", "/", headers={"x-tag": ["a", "b"]})
+
+        assert [header for header in EventRequest.from_event(event).headers if header[0] == "x-tag"] == expected
+
+    def test_alb_query_string_is_url_encoded(self) -> None:
+        """The load balancer passes query parameters on without decoding them."""
+        event = EventFactory("alb").create("GET", "/", query_params={"q": "a b&c"})
+
+        assert event["queryStringParameters"] == {"q": "a+b%26c"}
+
+    def test_http_api_cookies(self) -> None:
+        """HTTP API and Function URL events carry cookies apart from the headers."""
+        event = EventFactory("apigw-v2").create("GET", "/", headers={"cookie": "a=1; b=2"})
+
+        assert event["cookies"] == ["a=1", "b=2"]
+        assert "cookie" not in event["headers"]
+        assert ("cookie", "a=1; b=2") in EventRequest.from_event(event).headers
+
+    def test_events_do_not_share_headers(self) -> None:
+        """Changing one event's headers should leave the next events alone."""
+        factory = EventFactory("alb")
+        factory.create("GET", "/")["headers"]["x-changed"] = "1"
+
+        assert "x-changed" not in factory.create("GET", "/")["headers"]
+
+    def test_create_alb_event(self) -> None:
+        """ApiClient.create_alb_event should build the same ALB events as before."""
+        event = ApiClient.create_alb_event("GET", "/health", body={"a": 1}, query_params={"page": "2"})
+
+        assert event["requestContext"]["elb"]["targetGroupArn"].startswith("arn:aws:elasticloadbalancing:")
+        assert event["headers"]["content-type"] == "application/json"
+        assert event["queryStringParameters"] == {"page": "2"}
+        assert (event["body"], event["isBase64Encoded"]) == ('{"a": 1}', False)
+
+    def test_rejects_unknown_format(self) -> None:
+        """An unknown event format should be refused."""
+        with pytest.raises(ValueError, match="Unknown event format"):
+            EventFactory("sqs")
+
+
+class TestRandomEvents:
+    """Tests for random_events."""
+
+    def test_is_reproducible_with_a_seed(self) -> None:
+        """The same seed should give the same corpus."""
+        routes = [("GET", "/health"), ("POST", "/items")]
+
+        assert random_events(50, routes, seed=1) == random_events(50, routes, seed=1)
+
+    def test_covers_formats_and_bodies(self) -> None:
+        """A corpus should mix every format, and bodies only on requests that carry one."""
+        events = random_events(500, [("GET", "/health"), ("POST", "/items")], seed=2, binary_ratio=0.5)
+        requests = [EventRequest.from_event(event) for event in events]
+
+        assert {"alb", "apigw-v1", "apigw-v2"} <= {_format(event) for event in events}
+        assert all(request.body == b"" for request in requests if request.method == "GET")
+        assert {event["isBase64Encoded"] for event in events} == {False, True}
+
+
+def _format(event: dict[str, Any]) -> str:
+    """Format of an event."""
+    if "version" in event:
+        return "apigw-v2"
+    return "alb" if "elb" in event["requestContext"] else "apigw-v1"
+
+
+class TestEventFiles:
+    """Tests for storing and extracting events."""
+
+    def test_save_then_load(self, tmp_path: Path) -> None:
+        """Saved events should load back unchanged."""
+        events = random_events(20, [("POST", "/items")], seed=3)
+        path = tmp_path / "events.jsonl"
+
+        save_events(path, events)
+
+        assert load_events(path) == events
+
+    def test_loads_a_json_array(self, tmp_path: Path) -> None:
+        """A corpus may also be a JSON array."""
+        events = random_events(2, seed=4)
+        path = tmp_path / "events.json"
+        path.write_text(json.dumps(events))
+
+        assert load_events(path) == events
+
+    def test_extracts_logged_events(self) -> None:
+        """Only the events logged by the handler should be extracted, whatever precedes the log record."""
+        event = EventFactory("apigw-v2").create("GET", "/health")
+        lines = [
+            "2024-12-21T12:00:00 stream " + json.dumps({"level": "INFO", "message": event}),
+            json.dumps({"level": "INFO", "message": "Request completed"}),
+            "START RequestId: 1234 Version: $LATEST",
+            "{not json",
+        ]
+
+        assert logged_events(lines) == [event]
+
+
+def rie_and_server(requests: list[httpx.Request]) -> httpx.MockTransport:
+    """A transport answering like the RIE, with an ALB response of multi-value headers, and like the API."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.endswith("/invocations"):
+            headers = {"content-type": ["application/json"]}
+            return httpx.Response(200, json={"statusCode": 200, "multiValueHeaders": headers, "body": '{"ok": true}'})
+        return httpx.Response(201, json={"ok": True})
+
+    return httpx.MockTransport(handler)
+
+
+class TestInvoke:
+    """Tests for replaying events with the API clients."""
+
+    EVENT = EventFactory("function-url").create("POST", "/items", {"a": 1}, query_params={"q": "1"})
+
+    def test_sends_the_event_to_the_rie(self) -> None:
+        """In lambda mode the event should be sent as is."""
+        requests: list[httpx.Request] = []
+        with ApiClient(transport=rie_and_server(requests)) as client:
+            response = client.invoke(self.EVENT)
+
+        assert json.loads(requests[0].content) == self.EVENT
+        assert (response["status_code"], response["body"]) == (200, {"ok": True})
+
+    def test_replays_the_request_against_a_url(self) -> None:
+        """In direct HTTP mode the request the event stands for should be sent to the base URL."""
+        requests: list[httpx.Request] = []
+        with ApiClient("https://api.example.com", lambda_mode=False, transport=rie_and_server(requests)) as client:
+            response = client.invoke(self.EVENT)
+
+        assert response["status_code"] == 201
+        assert str(requests[0].url) == "https://api.example.com/items?q=1"
+        assert requests[0].headers["host"] == "api.example.com"
+        assert json.loads(requests[0].content) == {"a": 1}
+
+    def test_async_client(self) -> None:
+        """AsyncApiClient should replay events the same way."""
+        requests: list[httpx.Request] = []
+
+        async def invoke() -> dict[str, Any]:
+            transport = rie_and_server(requests)
+            async with AsyncApiClient("https://api.example.com", lambda_mode=False, transport=transport) as client:
+                return await client.invoke(self.EVENT)
+
+        assert asyncio.run(invoke(), loop_factory=asyncio.new_event_loop)["status_code"] == 201
+        assert requests[0].url.path == "/items"
+
+
+class TestMain:
+    """Tests for the command line entry point."""
+
+    def test_writes_a_random_corpus(self, tmp_path: Path) -> None:
+        """The corpus should hold the events asked for."""
+        output = tmp_path / "events.jsonl"
+
+        argv = ["--count", "30", "--route", "put /items", "--format", "apigw-v1", "--output", str(output)]
+        assert main(argv) == 0
+
+        events = load_events(output)
+        assert len(events) == 30
+        assert {(event["httpMethod"], event["path"]) for event in events} == {("PUT", "/items")}
+
+    def test_extracts_logged_events(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """With --from-logs, the events found in the log should be written, exiting with 1 when there are none."""
+        log = tmp_path / "lambda.log"
+        log.write_text(json.dumps({"message": ApiClient.create_alb_event("GET", "/health")}) + "\n")
+
+        assert main(["--from-logs", str(log)]) == 0
+        assert json.loads(capsys.readouterr().out)["path"] == "/health"
+        log.write_text("no events\n")
+        assert main(["--from-logs", str(log)]) == 1
+
+    def test_rejects_malformed_routes(self) -> None:
+        """A route should be a method and a path."""
+        with pytest.raises(SystemExit):
+            main(["--route", "health"])
@@ -0,0 +1,97 @@
+"""Tests for the Docker image check."""
+
+import json
+from collections.abc import Sequence
+
+import httpx
+import pytest
+from common.image import DEPENDENCIES, PROJECT, main
+
+SERVICE = next(iter(DEPENDENCIES))
+
+
+class FakeDocker:
+    """Records commands and answers ``docker image inspect`` with a fixed size."""
+
+    def __init__(self, size: int = 150_000_000) -> None:
+        self.size = size
+        self.commands: list[list[str]] = []
+        self.targets: set[str] = set()
+
+    def __call__(self, command: Sequence[str], env: dict[str, str]) -> str:
+        """Run one command."""
+        self.commands.append(list(command))
+        self.targets.add(env["DOCKER_TARGET"])
+        return f"{self.size}\n" if command[1] == "image" else ""
+
+
+def health_client(unhealthy: int = 0) -> httpx.Client:
+    """A client whose health checks fail ``unhealthy`` times before answering 200.
+
+    Lambda invocations, POSTed to the Runtime Interface Emulator, fail like an
+    invocation whose handler raised.
+    """
+    healthy = iter([False] * unhealthy)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        ok = next(healthy, True)
+        if request.method == "POST":
+            return httpx.Response(200, json={"statusCode": 200} if ok else {"errorMessage": "Init failed"})
+        return httpx.Response(200 if ok else 503)
+
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+class TestMain:
+    """Tests for the command line entry point."""
+
+    @pytest.mark.parametrize("service", list(DEPENDENCIES))
+    def test_reports_size_and_startup(self, service: str, capsys: pytest.CaptureFixture[str]) -> None:
+        """The report should hold the image size and the time to the first healthy response."""
+        docker = FakeDocker()
+
+        status = main([service], run=docker, client=health_client(unhealthy=2))
+
+        report = json.loads(capsys.readouterr().out)[0]
+        assert status == 0
+        assert report["image"] == f"{PROJECT}-{service}:production"
+        assert report["size_mb"] == 150.0
+        assert report["startup_seconds"] >= report["first_response_seconds"] >= 0
+        assert report["warm_response_seconds"] >= 0
+        assert docker.targets == {"production"}
+        assert docker.commands[0] == ["docker", "compose", "build", service]
+        assert docker.commands[-1] == ["docker", "compose", "rm", "--stop", "--force", service]
+
+    def test_compares_targets(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Each target given should be built and measured."""
+        docker = FakeDocker()
+        argv = [SERVICE, "--docker-target", "development", "--docker-target", "production"]
+
+        main(argv, run=docker, client=health_client())
+
+        images = [report["image"] for report in json.loads(capsys.readouterr().out)]
+        assert images == [f"{PROJECT}-{SERVICE}:development", f"{PROJECT}-{SERVICE}:production"]
+        assert docker.targets == {"development", "production"}
+
+    def test_measures_every_service_by_default(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Without arguments, every service with an image of its own should be measured."""
+        assert main([], run=FakeDocker(), client=health_client()) == 0
+
+        assert [report["service"] for report in json.loads(capsys.readouterr().out)] == list(DEPENDENCIES)
+
+    @pytest.mark.parametrize(
+        ("budget", "expected"),
+        [(["--max-size-mb", "100"], 1), (["--max-size-mb", "200"], 0), (["--max-startup", "0"], 1)],
+    )
+    def test_fails_over_budget(self, budget: list[str], expected: int) -> None:
+        """The exit status should reflect the size and startup budgets."""
+        assert main([SERVICE, *budget], run=FakeDocker(), client=health_client()) == expected
+
+    def test_removes_the_container_when_never_healthy(self) -> None:
+        """A service that never turns healthy should time out and still be removed."""
+        docker = FakeDocker()
+
+        with pytest.raises(TimeoutError):
+            main([SERVICE, "--timeout", "0"], run=docker, client=health_client(unhealthy=1_000))
+
+        assert docker.commands[-1][:3] == ["docker", "compose", "rm"]
@@ -0,0 +1,233 @@
+"""Tests for the load generator."""
+
+import asyncio
+import json
+from collections.abc import Coroutine
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+from common.http import AsyncApiClient
+from common.load import LoadReport, RequestSpec, Sample, main, percentile, run_load
+
+LATENCY = 0.01
+
+
+def run[T](main: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on a new event loop, leaving the thread's current loop alone for other tests."""
+    return asyncio.run(main, loop_factory=asyncio.new_event_loop)
+
+
+class StubServer:
+    """Transport answering after LATENCY, tracking how many requests are in flight.
+
+    ``/fail`` answers 500 and ``/refused`` raises a connection error.
+    """
+
+    def __init__(self, latency: float = LATENCY) -> None:
+        self.latency = latency
+        self.in_flight = 0
+        self.peak = 0
+        self.paths: list[str] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        """Handle one request."""
+        self.paths.append(request.url.path)
+        if request.url.path == "/refused":
+            raise httpx.ConnectError("Connection refused", request=request)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        if request.url.path == "/fail":
+            return httpx.Response(500, json={"error": "Internal server error"})
+        return httpx.Response(200, json={"status": "healthy"})
+
+
+def client_for(server: StubServer, **kwargs: Any) -> AsyncApiClient:
+    """A direct HTTP client whose requests go to the stub server."""
+    options = {"base_url": "http://testserver", "lambda_mode": False, **kwargs}
+    return AsyncApiClient(**options, transport=httpx.MockTransport(server))
+
+
+async def load(server: StubServer, mix: list[RequestSpec], **kwargs: Any) -> dict[str, Any]:
+    """Load the stub server and summarize the results."""
+    async with client_for(server) as client:
+        report = await run_load(client, mix, **kwargs)
+    return report.to_dict()
+
+
+class TestRequestSpec:
+    """Tests for RequestSpec.parse."""
+
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("GET /health", RequestSpec("GET", "/health")),
+            ("post /api/v1/items?limit=5 3", RequestSpec("POST", "/api/v1/items?limit=5", 3.0)),
+            (" GET  /health  0.5 ", RequestSpec("GET", "/health", 0.5)),
+        ],
+    )
+    def test_parse(self, text: str, expected: RequestSpec) -> None:
+        """The weight should be optional and the method case-insensitive."""
+        assert RequestSpec.parse(text) == expected
+
+    @pytest.mark.parametrize("text", ["/health", "GET health", "", "GET /health 1 2"])
+    def test_rejects_malformed(self, text: str) -> None:
+        """A method and an absolute path are required."""
+        with pytest.raises(ValueError, match="METHOD /path"):
+            RequestSpec.parse(text)
+
+
+class TestReport:
+    """Tests for the report summary."""
+
+    def test_percentiles(self) -> None:
+        """Percentiles should use the nearest rank."""
+        values = [float(value) for value in range(1, 101)]
+
+        assert [percentile(values, percent) for percent in (50, 95, 99, 100)] == [50.0, 95.0, 99.0, 100.0]
+        assert percentile([], 50) == 0.0
+
+    def test_summary(self) -> None:
+        """Failures are exceptions and 5xx responses; 4xx responses are not."""
+        samples = [
+            Sample("GET /a", 0.010, 200),
+            Sample("GET /a", 0.020, 404),
+            Sample("GET /b", 0.030, 503),
+            Sample("GET /b", 0.040, error="ReadTimeout"),
+        ]
+
+        summary = LoadReport("http://testserver", 2, None, 2.0, samples).to_dict()
+
+        assert summary["requests"] == 4
+        assert summary["throughput_rps"] == 2.0
+        assert summary["errors"] == 2
+        assert summary["error_rate"] == 0.5
+        assert summary["status_codes"] == {"200": 1, "404": 1, "503": 1}
+        assert summary["exceptions"] == {"ReadTimeout": 1}
+        assert summary["latency_ms"] == {"mean": 25.0, "p50": 20.0, "p95": 40.0, "p99": 40.0, "max": 40.0}
+        assert summary["requests_by_name"]["GET /a"]["errors"] == 0
+        assert summary["requests_by_name"]["GET /b"]["errors"] == 2
+
+    def test_goodput(self) -> None:
+        """Goodput should count the successful responses, only those within the objective if set."""
+        samples = [Sample("GET /a", latency, status) for latency, status in [(0.01, 200), (0.2, 200), (0.01, 503)]]
+
+        assert LoadReport("http://testserver", 2, None, 1.0, samples).to_dict()["goodput_rps"] == 2.0
+        summary = LoadReport("http://testserver", 2, None, 1.0, samples, slo=0.1).to_dict()
+        assert summary["goodput_rps"] == 1.0
+        assert summary["slo_ms"] == 100.0
+
+
+class TestRunLoad:
+    """Tests for run_load."""
+
+    def test_closed_loop_keeps_concurrency_busy(self) -> None:
+        """Each client should send its next request as soon as the previous one returns."""
+        server = StubServer()
+
+        summary = run(load(server, [RequestSpec("GET", "/health")], duration=0.2, concurrency=5))
+
+        assert summary["mode"] == "closed"
+        assert server.peak == 5
+        # 5 clients x 0.2 s / 10 ms, minus scheduling overhead
+        assert summary["requests"] >= 50
+        assert summary["errors"] == 0
+        assert summary["latency_ms"]["p50"] >= LATENCY * 1000
+
+    def test_open_loop_keeps_the_rate(self) -> None:
+        """Requests should start on schedule, however fast the server answers."""
+        server = StubServer()
+
+        summary = run(load(server, [RequestSpec("GET", "/health")], duration=0.2, concurrency=10, rate=100))
+
+        assert summary["mode"] == "open"
+        assert summary["requests"] == 20
+
+    def test_open_loop_counts_queueing_as_latency(self) -> None:
+        """When the server falls behind, latency should include the wait for a free slot."""
+        server = StubServer(latency=0.05)
+
+        summary = run(load(server, [RequestSpec("GET", "/health")], duration=0.1, concurrency=1, rate=100))
+
+        assert summary["requests"] == 10
+        assert server.peak == 1
+        # The last request was due at 90 ms but only started after nine others took 50 ms each
+        assert summary["latency_ms"]["max"] >= 400
+
+    def test_mix_and_errors(self) -> None:
+        """Requests should follow the weights, and failures should be reported by kind."""
+        server = StubServer(latency=0)
+        mix = [RequestSpec("GET", "/health", 8), RequestSpec("GET", "/fail", 1), RequestSpec("GET", "/refused", 1)]
+
+        summary = run(load(server, mix, duration=0.2, concurrency=2, seed=1))
+
+        by_name = summary["requests_by_name"]
+        assert by_name["GET /health"]["requests"] > 3 * by_name["GET /fail"]["requests"] > 0
+        assert by_name["GET /fail"]["errors"] == by_name["GET /fail"]["requests"]
+        assert summary["exceptions"] == {"ConnectError": by_name["GET /refused"]["requests"]}
+        assert 0.1 < summary["error_rate"] < 0.35
+
+
+class TestLambdaMode:
+    """Tests for AsyncApiClient against the Lambda Runtime Interface Emulator."""
+
+    def test_sends_alb_events(self) -> None:
+        """Requests should be wrapped in ALB events and Lambda responses unwrapped."""
+        events: list[dict[str, Any]] = []
+
+        def rie(request: httpx.Request) -> httpx.Response:
+            events.append(json.loads(request.content))
+            return httpx.Response(
+                200,
+                json={"statusCode": 201, "headers": {"content-type": "application/json"}, "body": '{"id": 1}'},
+            )
+
+        async def send() -> dict[str, Any]:
+            async with AsyncApiClient(transport=httpx.MockTransport(rie)) as client:
+                return await client.request("POST", "/items", body={"name": "item"})
+
+        response = run(send())
+
+        assert response["status_code"] == 201
+        assert response["body"] == {"id": 1}
+        assert events[0]["httpMethod"] == "POST"
+        assert events[0]["path"] == "/items"
+
+
+class TestMain:
+    """Tests for the command line entry point."""
+
+    def test_writes_report(self, tmp_path: Path) -> None:
+        """The JSON report should be written to --output."""
+        server = StubServer(latency=0)
+        output = tmp_path / "report.json"
+        argv = [
+            *["--url", "http://testserver", "--duration", "0.05", "--mix", "GET /health", "--slo", "50"],
+            *["--output", str(output)],
+        ]
+
+        status = run(main(argv, client_factory=partial(AsyncApiClient, transport=httpx.MockTransport(server))))
+
+        report = json.loads(output.read_text())
+        assert status == 0
+        assert report["requests"] == len(server.paths) > 0
+        assert report["slo_ms"] == 50.0
+
+    @pytest.mark.parametrize(("max_error_rate", "expected"), [("0", 1), ("1", 0)])
+    def test_fails_above_error_rate(self, tmp_path: Path, max_error_rate: str, expected: int) -> None:
+        """The exit status should reflect --max-error-rate."""
+        server = StubServer(latency=0)
+        argv = [
+            *["--url", "http://testserver", "--duration", "0.05", "--mix", "GET /fail"],
+            *["--output", str(tmp_path / "report.json"), "--max-error-rate", max_error_rate],
+        ]
+
+        status = run(main(argv, client_factory=partial(AsyncApiClient, transport=httpx.MockTransport(server))))
+
+        assert status == expected
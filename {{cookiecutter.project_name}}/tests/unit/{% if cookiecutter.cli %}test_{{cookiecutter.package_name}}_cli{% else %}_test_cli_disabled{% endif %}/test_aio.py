@@ -0,0 +1,233 @@
+"""Tests for async command support."""
+
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+from collections.abc import Coroutine, Iterator
+from typing import Any
+
+import httpx
+import pytest
+import typer
+from typer.testing import CliRunner
+
+from {{cookiecutter.package_name}}_cli.aio import async_command, gather_bounded, http_client, run
+
+runner = CliRunner()
+
+# Keep-alive HTTP server answering every request with the ordinal of the connection
+# it came in on; prints its port once listening
+_STUB_SERVER = """
+import asyncio
+import itertools
+
+connections = itertools.count()
+
+
+async def handle(reader, writer):
+    connection = str(next(connections)).encode()
+    response = b"HTTP/1.1 200 OK\\r\\nContent-Length: %d\\r\\n\\r\\n%s" % (len(connection), connection)
+    try:
+        while await reader.readuntil(b"\\r\\n\\r\\n"):
+            writer.write(response)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        writer.close()
+
+
+async def main():
+    server = await asyncio.start_server(handle, "127.0.0.1", 0, backlog=1024)
+    print(server.sockets[0].getsockname()[1], flush=True)
+    await server.serve_forever()
+
+
+asyncio.run(main())
+"""
+
+# Async command that waits forever and reports whether its client was closed
+_SLEEPING_COMMAND = """
+import asyncio
+
+import typer
+
+from {{cookiecutter.package_name}}_cli.aio import async_command, http_client
+
+app = typer.Typer()
+
+
+@app.command()
+@async_command
+async def wait() -> None:
+    client = http_client()
+    print("started", flush=True)
+    try:
+        await asyncio.sleep(60)
+    finally:
+        print(f"cancelled, client open: {not client.is_closed}", flush=True)
+
+
+app()
+"""
+
+
+@pytest.fixture(scope="module")
+def stub_server() -> Iterator[str]:
+    """Base URL of a stub server that answers immediately."""
+    server = subprocess.Popen([sys.executable, "-c", _STUB_SERVER], stdout=subprocess.PIPE, text=True)  # noqa: S603
+    assert server.stdout is not None
+    yield f"http://127.0.0.1:{server.stdout.readline().strip()}"
+    server.terminate()
+    server.wait()
+
+
+class TestAsyncCommand:
+    """Tests for async_command."""
+
+    def test_runs_coroutine_with_typer_options(self) -> None:
+        """Typer should parse the coroutine function's parameters and the result should be printed."""
+        app = typer.Typer()
+
+        @app.command()
+        @async_command
+        async def greet(name: str, times: int = 1) -> None:
+            await asyncio.sleep(0)
+            typer.echo(" ".join([f"hello {name}"] * times))
+
+        result = runner.invoke(app, ["world", "--times", "2"])
+
+        assert result.exit_code == 0, result.output
+        assert result.stdout == "hello world hello world\n"
+
+    def test_runs_on_uvloop_when_installed(self) -> None:
+        """Commands should run on uvloop when it is installed."""
+        pytest.importorskip("uvloop")
+
+        async def loop_module() -> str:
+            return type(asyncio.get_running_loop()).__module__
+
+        assert run(loop_module()).startswith("uvloop")
+
+    def test_http_client_is_shared_and_closed(self) -> None:
+        """The command should get one client, closed when it returns."""
+
+        @async_command
+        async def command() -> httpx.AsyncClient:
+            client = http_client()
+            assert http_client() is client
+            return client
+
+        client = command()
+
+        assert client.is_closed
+
+    def test_http_client_requires_command(self) -> None:
+        """http_client should fail loudly outside an async command."""
+        with pytest.raises(RuntimeError):
+            http_client()
+
+    def test_pools_connections(self, stub_server: str) -> None:
+        """Concurrent requests should reuse at most as many connections as run at once."""
+
+        @async_command
+        async def command() -> list[str]:
+            client = http_client()
+            responses = await gather_bounded((client.get(stub_server) for _ in range(200)), limit=5)
+            return [response.text for response in responses]
+
+        assert len(set(command())) <= 5
+
+    def test_ctrl_c_cancels_and_cleans_up(self) -> None:
+        """SIGINT should cancel the command, close its client and exit with status 130."""
+        process = subprocess.Popen(  # noqa: S603
+            [sys.executable, "-c", _SLEEPING_COMMAND],
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        assert process.stdout is not None
+        assert process.stdout.readline() == "started\n"
+
+        process.send_signal(signal.SIGINT)
+        stdout, stderr = process.communicate(timeout=10)
+
+        assert process.returncode == 130
+        assert stdout == "cancelled, client open: True\n"
+        assert "Interrupted." in stderr
+
+
+class TestGatherBounded:
+    """Tests for gather_bounded."""
+
+    def test_returns_results_in_order(self) -> None:
+        """Results should follow input order, not completion order."""
+
+        async def delayed(value: int) -> int:
+            await asyncio.sleep((10 - value) / 1000)
+            return value
+
+        assert run(gather_bounded([delayed(value) for value in range(10)], limit=10)) == list(range(10))
+
+    def test_limits_concurrency(self) -> None:
+        """No more than limit awaitables should run at once."""
+        running = peak = 0
+
+        async def task() -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+
+        run(gather_bounded((task() for _ in range(50)), limit=4))
+
+        assert peak == 4
+
+    def test_consumes_generator_lazily(self) -> None:
+        """Coroutines should be created only when a slot frees up."""
+        created = 0
+
+        async def task() -> None:
+            await asyncio.sleep(0)
+
+        def tasks() -> Iterator[Coroutine[Any, Any, None]]:
+            nonlocal created
+            for _ in range(100):
+                created += 1
+                yield task()
+
+        async def check() -> int:
+            gathering = asyncio.ensure_future(gather_bounded(tasks(), limit=3))
+            await asyncio.sleep(0)
+            seen = created
+            await gathering
+            return seen
+
+        assert run(check()) <= 4
+
+    def test_failure_cancels_the_rest(self) -> None:
+        """The first error should propagate and cancel the awaitables still running."""
+        cancelled = 0
+
+        async def task(value: int) -> int:
+            nonlocal cancelled
+            if value == 3:
+                raise ValueError("bad value")
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled += 1
+                raise
+            return value
+
+        with pytest.raises(ValueError, match="bad value"):
+            run(gather_bounded([task(value) for value in range(100)], limit=5))
+
+        assert cancelled == 4
+
+    @pytest.mark.parametrize("limit", [0, -1])
+    def test_rejects_limit_below_one(self, limit: int) -> None:
+        """A limit below one would start no worker and return no results."""
+        with pytest.raises(ValueError, match="limit must be at least 1"):
+            run(gather_bounded([], limit=limit))
@@ -0,0 +1,173 @@
+"""Tests for the process command."""
+
+import json
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from typer.testing import CliRunner
+
+from {{cookiecutter.package_name}}_cli import app
+from {{cookiecutter.package_name}}_cli.processing import Checkpoint, ExecutorKind, process_records
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+runner = CliRunner()
+
+
+def double(record: str) -> int:
+    """Double a number given as text."""
+    return int(record) * 2
+
+
+def add_total(record: dict[str, int]) -> dict[str, int]:
+    """Add the sum of a and b to the record."""
+    return {**record, "total": record["a"] + record["b"]}
+
+
+def skip_odd(record: str) -> str | None:
+    """Drop odd numbers."""
+    return record if int(record) % 2 == 0 else None
+
+
+def fail_on_25(record: str) -> int:
+    """Double a number, failing on 25."""
+    if record == "25":
+        raise RuntimeError("bad record")
+    return int(record) * 2
+
+
+def sleep_then_echo(record: str) -> str:
+    """Answer after a delay that shrinks as the record grows, so later records finish first."""
+    time.sleep((10 - int(record)) / 200)
+    return record
+
+
+@pytest.fixture
+def numbers(tmp_path: Path) -> Path:
+    """An input file with the numbers 0 to 99, one per line."""
+    path = tmp_path / "numbers.txt"
+    path.write_text("".join(f"{number}\n" for number in range(100)))
+    return path
+
+
+def process(*args: str) -> list[str]:
+    """Run the process command and return its output lines."""
+    result = runner.invoke(app, ["process", "--no-progress", *args])
+    assert result.exit_code == 0, result.output
+    return result.stdout.splitlines()
+
+
+class TestProcessCommand:
+    """Tests for the process command."""
+
+    @pytest.mark.parametrize("executor", list(ExecutorKind))
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_ordered(self, numbers: Path, executor: ExecutorKind, jobs: str) -> None:
+        """Results should be written in input order by default."""
+        lines = process(f"{__name__}:double", str(numbers), "-j", jobs, "--executor", executor, "--chunk-size", "7")
+
+        assert lines == [str(number * 2) for number in range(100)]
+
+    def test_unordered(self, tmp_path: Path) -> None:
+        """--unordered should write chunks as they finish."""
+        path = tmp_path / "input.txt"
+        path.write_text("".join(f"{number}\n" for number in range(10)))
+
+        lines = process(
+            f"{__name__}:sleep_then_echo",
+            *[str(path), "-j", "10", "--executor", "thread", "--chunk-size", "1", "--unordered"],
+        )
+
+        assert sorted(lines, key=int) == [str(number) for number in range(10)]
+        assert lines != sorted(lines, key=int)
+
+    def test_ndjson(self, tmp_path: Path) -> None:
+        """NDJSON records should be decoded and results encoded, skipping blank lines."""
+        path = tmp_path / "input.ndjson"
+        path.write_text('{"a": 1, "b": 2}\n\n{"a": 3, "b": 4}\n')
+
+        lines = process(f"{__name__}:add_total", str(path), "--format", "ndjson", "-j", "2")
+
+        assert [json.loads(line) for line in lines] == [{"a": 1, "b": 2, "total": 3}, {"a": 3, "b": 4, "total": 7}]
+
+    def test_stdin_to_file(self, tmp_path: Path) -> None:
+        """Records should be read from stdin and written to --output."""
+        output = tmp_path / "output.txt"
+
+        result = runner.invoke(
+            app,
+            ["process", "--no-progress", f"{__name__}:skip_odd", "-o", str(output), "-j", "1"],
+            input="1\n2\n3\n4\n",
+        )
+
+        assert result.exit_code == 0, result.output
+        assert output.read_text() == "2\n4\n"
+        assert "Processed 4 records, 2 of them returning None and not written," in result.stderr
+
+    def test_counts_records_only_for_progress(self, numbers: Path, mocker: "MockerFixture") -> None:
+        """The input should not be read an extra time to size a progress bar that is not shown."""
+        count_records = mocker.patch("{{cookiecutter.package_name}}_cli.commands.process.count_records", return_value=100)
+
+        process(f"{__name__}:double", str(numbers))
+        assert not count_records.called
+        assert runner.invoke(app, ["process", f"{__name__}:double", str(numbers)]).exit_code == 0
+        count_records.assert_called_once_with(str(numbers))
+
+    def test_resumes_from_checkpoint(self, numbers: Path, tmp_path: Path) -> None:
+        """A failed run should resume after its last completed chunk without duplicating output."""
+        output = tmp_path / "output.txt"
+        checkpoint = tmp_path / "checkpoint.json"
+        args = [str(numbers), "-o", str(output), "--checkpoint", str(checkpoint), "-j", "1", "--chunk-size", "10"]
+
+        failed = runner.invoke(app, ["process", "--no-progress", f"{__name__}:fail_on_25", *args])
+
+        assert failed.exit_code != 0
+        assert json.loads(checkpoint.read_text())["done_through"] == 2
+        assert output.read_text().splitlines() == [str(number * 2) for number in range(20)]
+
+        process(f"{__name__}:double", *args)
+
+        assert output.read_text().splitlines() == [str(number * 2) for number in range(100)]
+
+    def test_rejects_checkpoint_with_other_chunk_size(self, numbers: Path, tmp_path: Path) -> None:
+        """Resuming with a different chunk size would misidentify chunks."""
+        checkpoint = tmp_path / "checkpoint.json"
+        Checkpoint(checkpoint, 10).mark_done(0)
+
+        result = runner.invoke(
+            app, ["process", f"{__name__}:double", str(numbers), "--checkpoint", str(checkpoint), "--chunk-size", "5"]
+        )
+
+        assert result.exit_code == 2
+        assert "--chunk-size 10" in result.output
+
+    @pytest.mark.parametrize("path", ["no_colon", "no_such_module:function", f"{__name__}:missing"])
+    def test_rejects_bad_function(self, numbers: Path, path: str) -> None:
+        """A function path that cannot be imported should be a usage error."""
+        result = runner.invoke(app, ["process", path, str(numbers)])
+
+        assert result.exit_code == 2
+
+
+class TestProcessRecords:
+    """Tests for process_records."""
+
+    def test_bounds_records_in_flight(self) -> None:
+        """Input should be consumed only a few chunks ahead of the output."""
+        consumed = 0
+
+        def records() -> Iterator[str]:
+            nonlocal consumed
+            for number in range(1000):
+                consumed += 1
+                yield str(number)
+
+        chunks = process_records(double, records(), jobs=2, executor=ExecutorKind.THREAD, chunk_size=10)
+        next(chunks)
+
+        assert consumed <= 2 * 2 * 10 + 10
+        chunks.close()
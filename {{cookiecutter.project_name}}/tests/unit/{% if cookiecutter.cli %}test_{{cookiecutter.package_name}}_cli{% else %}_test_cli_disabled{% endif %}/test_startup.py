@@ -0,0 +1,79 @@
+"""Tests for lazy command loading, which keeps the CLI quick to start."""
+
+import inspect
+import json
+import os
+import subprocess
+import sys
+from importlib import import_module
+
+import pytest
+
+from {{cookiecutter.package_name}}_cli.__main__ import CommandGroup
+
+# Runs the CLI in-process and reports which modules it imported
+_IMPORT_PROBE = """
+import json
+import sys
+
+from {{cookiecutter.package_name}}_cli.__main__ import app
+
+try:
+    app(sys.argv[1:])
+except SystemExit:
+    pass
+print(json.dumps(sorted(sys.modules)), file=sys.stderr)
+"""
+
+
+def run_cli(*args: str, code: str | None = None) -> subprocess.CompletedProcess[str]:
+    """Run the CLI in a fresh interpreter.
+
+    Args:
+        *args: CLI arguments.
+        code: Python source to run instead of ``python -m {{cookiecutter.package_name}}_cli``.
+
+    Returns:
+        The completed process.
+    """
+    command = [sys.executable, "-c", code] if code else [sys.executable, "-m", "{{cookiecutter.package_name}}_cli"]
+    return subprocess.run(  # noqa: S603
+        [*command, *args],
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def imported_modules(*args: str) -> list[str]:
+    """Return the modules imported while running the CLI with the given arguments."""
+    return list(json.loads(run_cli(*args, code=_IMPORT_PROBE).stderr.splitlines()[-1]))
+
+
+class TestLazyCommands:
+    """Tests for lazily registered commands."""
+
+    @pytest.mark.parametrize("name", list(CommandGroup.lazy_commands))
+    def test_registered_help_matches_command(self, name: str) -> None:
+        """The help shown before loading should match the command's docstring."""
+        import_path, help_text = CommandGroup.lazy_commands[name]
+        module_name, _, function_name = import_path.partition(":")
+
+        function = getattr(import_module(module_name), function_name)
+
+        assert inspect.getdoc(function) == help_text
+
+    def test_help_does_not_import_commands(self) -> None:
+        """--help should list commands without importing them."""
+        modules = imported_modules("--help")
+
+        assert "{{cookiecutter.package_name}}_cli.commands.about" not in modules
+
+    def test_version_skips_logging_setup(self) -> None:
+        """version should not pay for structlog or rich."""
+        modules = imported_modules("version")
+
+        assert "{{cookiecutter.package_name}}_cli.commands.about" in modules
+        assert "structlog" not in modules
+        assert "rich" not in modules
@@ -0,0 +1,38 @@
+"""Web test fixtures."""
+
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager
+
+import pytest
+
+from {{cookiecutter.package_name}}.logging import get_logger
+from {{cookiecutter.package_name}}_web import queries
+
+logger = get_logger()
+
+
+@pytest.fixture(autouse=True)
+def query_recorder(request: pytest.FixtureRequest) -> Generator[queries.QueryRecorder, None, None]:
+    """Record SQL executed by each test and log it as structured fields.
+
+    Yields:
+        The recorder collecting the statements executed by the test.
+    """
+    with queries.record_queries() as recorder:
+        yield recorder
+    if recorder.count:
+        logger.info("Test queries", test=request.node.nodeid, **recorder.as_log_fields())
+
+
+@pytest.fixture
+def assert_max_queries() -> Callable[[int], AbstractContextManager[queries.QueryRecorder]]:
+    """Assert that a block stays within a query budget.
+
+    Usage:
+        with assert_max_queries(3):
+            client.get("/articles/")
+
+    Returns:
+        Context manager factory taking the maximum number of queries.
+    """
+    return queries.assert_max_queries
@@ -0,0 +1,184 @@
+"""Tests for the bulk import and export management commands."""
+
+import csv
+from datetime import UTC, datetime, timedelta
+from io import StringIO
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import orjson
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError
+
+from {{cookiecutter.package_name}}_web.bulk import detect_format, import_records, read_records
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+EXPIRE_DATE = "2030-01-01T00:00:00+00:00"
+
+
+def write_ndjson(path: Path, count: int) -> Path:
+    """Write ``count`` session rows as NDJSON."""
+    with path.open("wb") as stream:
+        for i in range(count):
+            row = {"session_key": f"key-{i:08d}", "session_data": f"data {i}", "expire_date": EXPIRE_DATE}
+            stream.write(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE))
+    return path
+
+
+def write_csv(path: Path, count: int) -> Path:
+    """Write ``count`` session rows as CSV."""
+    with path.open("w", newline="") as stream:
+        writer = csv.writer(stream)
+        writer.writerow(["session_key", "session_data", "expire_date"])
+        writer.writerows([f"key-{i:08d}", f"data {i}", EXPIRE_DATE] for i in range(count))
+    return path
+
+
+class TestReaders:
+    """Tests for format detection and streaming readers."""
+
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [("rows.csv", "csv"), ("rows.ndjson", "ndjson"), ("rows.jsonl", "ndjson")],
+    )
+    def test_detect_format_from_extension(self, path: str, expected: str) -> None:
+        """The format should be inferred from common extensions."""
+        assert detect_format(path) == expected
+
+    def test_detect_format_rejects_unknown_extension(self) -> None:
+        """Unknown extensions should require an explicit format."""
+        with pytest.raises(ValueError, match="Cannot infer format"):
+            detect_format("rows.txt")
+
+    def test_reads_csv_and_ndjson_alike(self, tmp_path: Path) -> None:
+        """Both formats should yield the same records."""
+        from_csv = list(read_records(str(write_csv(tmp_path / "rows.csv", 3)), "csv"))
+        from_ndjson = list(read_records(str(write_ndjson(tmp_path / "rows.ndjson", 3)), "ndjson"))
+
+        assert from_csv == from_ndjson
+        assert from_csv[0]["session_key"] == "key-00000000"
+
+
+@pytest.mark.django_db(transaction=True)
+class TestImportRows:
+    """Tests for the import_rows command."""
+
+    def test_imports_in_batches(self, tmp_path: Path) -> None:
+        """Rows should be written in batches, reporting progress after each one."""
+        stdout, stderr = StringIO(), StringIO()
+
+        call_command(
+            "import_rows",
+            "sessions.Session",
+            str(write_csv(tmp_path / "rows.csv", 5)),
+            batch_size=2,
+            stdout=stdout,
+            stderr=stderr,
+        )
+
+        assert Session.objects.count() == 5
+        assert Session.objects.get(session_key="key-00000004").expire_date == datetime(2030, 1, 1, tzinfo=UTC)
+        assert stderr.getvalue().count("Imported") == 3
+        assert "Imported 5 rows" in stdout.getvalue()
+        assert "rows/s" in stdout.getvalue()
+
+    def test_failed_batch_rolls_back_only_that_batch(self, tmp_path: Path) -> None:
+        """Batches committed before a failure should be kept."""
+        path = write_ndjson(tmp_path / "rows.ndjson", 4)
+        with path.open("ab") as stream:
+            stream.write(orjson.dumps({"session_key": "key-00000000", "session_data": "", "expire_date": EXPIRE_DATE}))
+
+        with pytest.raises(IntegrityError):
+            call_command("import_rows", "sessions.Session", str(path), batch_size=2, stderr=StringIO())
+
+        assert Session.objects.count() == 4
+
+    def test_records_may_order_keys_differently(self, tmp_path: Path) -> None:
+        """Each value should land in the field named by its key, whatever the key order."""
+        path = tmp_path / "rows.ndjson"
+        path.write_bytes(
+            orjson.dumps({"session_key": "first", "session_data": "data 1", "expire_date": EXPIRE_DATE})
+            + b"\n"
+            + orjson.dumps({"expire_date": EXPIRE_DATE, "session_data": "data 2", "session_key": "second"})
+        )
+
+        call_command("import_rows", "sessions.Session", str(path), stderr=StringIO())
+
+        assert Session.objects.get(session_key="second").session_data == "data 2"
+
+    def test_unknown_fields(self, tmp_path: Path) -> None:
+        """Records with keys that are not fields of the model should fail with a command error naming them."""
+        path = write_ndjson(tmp_path / "rows.ndjson", 2)
+        with path.open("ab") as stream:
+            stream.write(orjson.dumps({"session_key": "extra", "colour": "red", "size": 1}))
+
+        with pytest.raises(CommandError, match=r"Record 3 has unknown fields for sessions\.Session: colour, size"):
+            call_command("import_rows", "sessions.Session", str(path), batch_size=2, stderr=StringIO())
+
+        assert Session.objects.count() == 2
+
+    def test_copy_writes_rows_in_column_order(self, mocker: "MockerFixture") -> None:
+        """COPY rows should follow the column list whatever the key order of each record, missing keys NULL."""
+        connections = mocker.patch("{{cookiecutter.package_name}}_web.bulk.connections")
+        connections.__getitem__.return_value.vendor = "postgresql"
+        cursor = connections.__getitem__.return_value.cursor.return_value.__enter__.return_value
+        records = [
+            {"session_key": "first", "session_data": "data 1", "expire_date": EXPIRE_DATE},
+            {"expire_date": EXPIRE_DATE, "session_key": "second"},
+        ]
+
+        import_records(Session, records, batch_size=2, method="copy")
+
+        copy = cursor.copy.return_value.__enter__.return_value
+        assert [call.args[0] for call in copy.write_row.call_args_list] == [
+            ("first", "data 1", EXPIRE_DATE),
+            ("second", None, EXPIRE_DATE),
+        ]
+
+    def test_copy_requires_postgresql(self, tmp_path: Path) -> None:
+        """COPY should be rejected on other databases."""
+        with pytest.raises(CommandError, match="requires a PostgreSQL database"):
+            call_command("import_rows", "sessions.Session", str(write_csv(tmp_path / "rows.csv", 1)), method="copy")
+
+    def test_unknown_model(self, tmp_path: Path) -> None:
+        """Unknown model labels should fail with a command error."""
+        with pytest.raises(CommandError):
+            call_command("import_rows", "sessions.Missing", str(write_csv(tmp_path / "rows.csv", 1)))
+
+
+@pytest.mark.django_db
+class TestExportRows:
+    """Tests for the export_rows command."""
+
+    @pytest.fixture
+    def sessions(self) -> None:
+        """Create a few sessions to export."""
+        expire_date = datetime.now(UTC) + timedelta(days=1)
+        Session.objects.bulk_create(
+            Session(session_key=f"key-{i:08d}", session_data=f"data {i}", expire_date=expire_date) for i in range(5)
+        )
+
+    @pytest.mark.parametrize("fmt", ["csv", "ndjson"])
+    def test_round_trip(self, tmp_path: Path, sessions: None, fmt: str) -> None:
+        """Exported rows should import back unchanged."""
+        path = tmp_path / f"rows.{fmt}"
+        original = list(Session.objects.order_by("pk").values())
+
+        call_command("export_rows", "sessions.Session", str(path), chunk_size=2, stderr=StringIO())
+        Session.objects.all().delete()
+        call_command("import_rows", "sessions.Session", str(path), stdout=StringIO(), stderr=StringIO())
+
+        assert list(Session.objects.order_by("pk").values()) == original
+
+    def test_reports_progress_to_stderr(self, tmp_path: Path, sessions: None) -> None:
+        """Progress should be reported per chunk on stderr."""
+        stderr = StringIO()
+
+        call_command("export_rows", "sessions.Session", str(tmp_path / "rows.ndjson"), chunk_size=2, stderr=stderr)
+
+        assert stderr.getvalue().count("Exported") == 3
+        assert "Exported 5 rows" in stderr.getvalue()
@@ -133,3 +133,11 @@ class TestDjangoIntegration:
         from django.contrib import admin
 
         assert admin.site is not None
+
+    def test_test_database_per_worker(self, worker_id: str) -> None:
+        """Each xdist worker should test against its own database, in memory or suffixed with its id."""
+        from django.db import connection
+
+        name = str(connection.settings_dict["NAME"])
+
+        assert worker_id == "master" or "mode=memory" in name or name.endswith(f"_{worker_id}")
@@ -0,0 +1,101 @@
+"""Tests for the profiling middleware and admin views."""
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+from django.test import Client, RequestFactory
+
+from {{cookiecutter.package_name}}.profiling import TOKEN_HEADER, Profiler
+from {{cookiecutter.package_name}}_web.middleware import ProfilingMiddleware
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+TOKEN = "secret"
+
+
+@pytest.fixture
+def profiler(tmp_path: Path, mocker: "MockerFixture") -> Profiler:
+    """An enabled profiler writing to a temporary directory, used by the middleware and views."""
+    profiler = Profiler(tmp_path, interval=0.001, routes=("/reports/",), token=TOKEN)
+    mocker.patch("{{cookiecutter.package_name}}_web.middleware.get_profiler", return_value=profiler)
+    mocker.patch("{{cookiecutter.package_name}}_web.profiling.get_profiler", return_value=profiler)
+    return profiler
+
+
+def view(request: HttpRequest) -> HttpResponse:
+    """View that does nothing."""
+    return HttpResponse("ok")
+
+
+class TestProfilingMiddleware:
+    """Tests for ProfilingMiddleware."""
+
+    def test_not_used_when_disabled(self, tmp_path: Path, mocker: "MockerFixture") -> None:
+        """The middleware should remove itself unless profiling is enabled."""
+        disabled = Profiler(tmp_path, enabled=False)
+        mocker.patch("{{cookiecutter.package_name}}_web.middleware.get_profiler", return_value=disabled)
+
+        with pytest.raises(MiddlewareNotUsed):
+            ProfilingMiddleware(view)
+
+    def test_profiles_route_and_token(self, profiler: Profiler) -> None:
+        """Profiled routes and requests carrying the token should be written."""
+        middleware = ProfilingMiddleware(view)
+        factory = RequestFactory()
+
+        middleware(factory.get("/items/"))
+        assert profiler.profiles() == []
+
+        middleware(factory.get("/reports/"))
+        middleware(factory.get("/items/", headers={TOKEN_HEADER: TOKEN}))
+        assert len(profiler.profiles()) == 2
+
+
+@pytest.mark.django_db
+class TestProfilingViews:
+    """Tests for the admin profiling views."""
+
+    def test_requires_superuser(self, client: Client, profiler: Profiler) -> None:
+        """Anonymous users and staff who are not superusers should be refused."""
+        assert client.get("/admin/profiling/profiles/").status_code == 403
+
+        client.force_login(User.objects.create_user("staff", is_staff=True))
+        assert client.get("/admin/profiling/profiles/").status_code == 403
+
+    def test_not_found_when_disabled(self, admin_client: Client, tmp_path: Path, mocker: "MockerFixture") -> None:
+        """The views should not exist unless profiling is enabled."""
+        disabled = Profiler(tmp_path, enabled=False)
+        mocker.patch("{{cookiecutter.package_name}}_web.profiling.get_profiler", return_value=disabled)
+
+        assert admin_client.get("/admin/profiling/profiles/").status_code == 404
+
+    def test_capture_list_and_download(self, admin_client: Client, profiler: Profiler, mocker: "MockerFixture") -> None:
+        """A capture should run in the background, then be listed and downloadable."""
+        capture = mocker.spy(profiler, "capture_in_background")
+
+        response = admin_client.post("/admin/profiling/captures/?seconds=0.05")
+
+        assert response.status_code == 202
+        name = response.json()["name"]
+        assert response.json() == {"name": name, "seconds": 0.05}
+        assert name.endswith("-capture.speedscope.json")
+        capture.spy_return[0].join()
+        assert admin_client.get("/admin/profiling/profiles/").json() == {"profiles": [name]}
+
+        download = admin_client.get(f"/admin/profiling/profiles/{name}")
+        assert download.status_code == 200
+        assert b'"name":"capture"' in b"".join(download.streaming_content)  # type: ignore[arg-type]
+
+    @pytest.mark.parametrize("seconds", ["0", "61", "soon"])
+    def test_rejects_capture_duration(self, admin_client: Client, profiler: Profiler, seconds: str) -> None:
+        """Capture durations should be positive, bounded numbers."""
+        assert admin_client.post(f"/admin/profiling/captures/?seconds={seconds}").status_code == 400
+
+    def test_download_unknown_profile(self, admin_client: Client, profiler: Profiler) -> None:
+        """Only files in the profile directory should be served."""
+        assert admin_client.get("/admin/profiling/profiles/missing.json").status_code == 404
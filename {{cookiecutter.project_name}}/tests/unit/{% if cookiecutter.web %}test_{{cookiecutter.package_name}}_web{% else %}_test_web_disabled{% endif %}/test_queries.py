@@ -0,0 +1,164 @@
+"""Tests for SQL query instrumentation."""
+
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from typing import TYPE_CHECKING
+
+import pytest
+from django.contrib.auth.models import User
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory
+from django.urls import ResolverMatch
+
+from {{cookiecutter.package_name}}_web.middleware import QueryCountMiddleware
+from {{cookiecutter.package_name}}_web.queries import (
+    QueryBudgetExceededError,
+    QueryRecorder,
+    query_budget,
+    record_queries,
+)
+
+if TYPE_CHECKING:
+    from pytest_django.fixtures import SettingsWrapper
+    from pytest_mock import MockerFixture
+
+AssertMaxQueries = Callable[[int], AbstractContextManager[QueryRecorder]]
+
+
+def list_users(request: HttpRequest) -> HttpResponse:
+    """View that runs one query per user, the classic N+1 pattern."""
+    names = [User.objects.get(pk=pk).username for pk in User.objects.values_list("pk", flat=True)]
+    return HttpResponse(",".join(names))
+
+
+def budgeted_list_users(budget: int) -> Callable[[HttpRequest], HttpResponse]:
+    """Wrap list_users in a new view, so the budget does not leak into other tests."""
+
+    def view(request: HttpRequest) -> HttpResponse:
+        return list_users(request)
+
+    return query_budget(budget)(view)
+
+
+@pytest.fixture
+def users() -> list[User]:
+    """Create a few users to query."""
+    return [User.objects.create(username=f"user{i}") for i in range(3)]
+
+
+def make_request(view: Callable[[HttpRequest], HttpResponse]) -> HttpRequest:
+    """Build a request already resolved to the given view."""
+    request = RequestFactory().get("/users/")
+    request.resolver_match = ResolverMatch(view, (), {})
+    return request
+
+
+@pytest.mark.django_db
+class TestRecordQueries:
+    """Tests for record_queries and QueryRecorder."""
+
+    def test_counts_queries_and_duplicates(self, users: list[User]) -> None:
+        """Repeated statements should be reported as duplicates."""
+        with record_queries() as recorder:
+            list_users(HttpRequest())
+
+        assert recorder.count == 4
+        assert recorder.duplicate_count == 2
+        assert len(recorder.duplicates) == 1
+        assert recorder.duration > 0
+
+    def test_log_fields(self, users: list[User]) -> None:
+        """Log fields should summarize count, duplicates and DB time."""
+        with record_queries() as recorder:
+            User.objects.count()
+
+        fields = recorder.as_log_fields()
+
+        assert fields["query_count"] == 1
+        assert fields["duplicate_query_count"] == 0
+        assert fields["db_time_ms"] >= 0
+
+
+@pytest.mark.django_db
+class TestAssertMaxQueries:
+    """Tests for the assert_max_queries fixture."""
+
+    def test_passes_within_budget(self, assert_max_queries: AssertMaxQueries, users: list[User]) -> None:
+        """Blocks within budget should pass."""
+        with assert_max_queries(4):
+            list_users(HttpRequest())
+
+    def test_fails_over_budget(self, assert_max_queries: AssertMaxQueries, users: list[User]) -> None:
+        """Blocks over budget should fail and list the repeated statement."""
+        with (
+            pytest.raises(QueryBudgetExceededError, match="Executed 4 queries, budget is 1") as exc_info,
+            assert_max_queries(1),
+        ):
+            list_users(HttpRequest())
+
+        assert "3x SELECT" in str(exc_info.value)
+
+
+@pytest.mark.django_db
+class TestQueryCountMiddleware:
+    """Tests for QueryCountMiddleware."""
+
+    def test_logs_query_stats(self, mocker: "MockerFixture", users: list[User]) -> None:
+        """Each request should log its query statistics."""
+        mock_logger = mocker.patch("{{cookiecutter.package_name}}_web.middleware.logger")
+        middleware = QueryCountMiddleware(list_users)
+
+        response = middleware(make_request(list_users))
+
+        assert response.status_code == 200
+        mock_logger.info.assert_called_once()
+        fields = mock_logger.info.call_args.kwargs
+        assert fields["query_count"] == 4
+        assert fields["duplicate_query_count"] == 2
+        assert fields["path"] == "/users/"
+
+    def test_warns_over_view_budget(
+        self,
+        mocker: "MockerFixture",
+        settings: "SettingsWrapper",
+        users: list[User],
+    ) -> None:
+        """Exceeding a per-view budget should log a warning outside strict mode."""
+        settings.QUERY_BUDGET_STRICT = False
+        mock_logger = mocker.patch("{{cookiecutter.package_name}}_web.middleware.logger")
+        view = budgeted_list_users(2)
+        middleware = QueryCountMiddleware(view)
+
+        response = middleware(make_request(view))
+
+        assert response.status_code == 200
+        mock_logger.warning.assert_called_once()
+        assert mock_logger.warning.call_args.kwargs["budget"] == 2
+
+    def test_raises_over_default_budget_in_strict_mode(
+        self,
+        settings: "SettingsWrapper",
+        users: list[User],
+    ) -> None:
+        """Strict mode should fail requests over the global budget."""
+        settings.QUERY_BUDGET = 2
+        settings.QUERY_BUDGET_STRICT = True
+        middleware = QueryCountMiddleware(list_users)
+
+        with pytest.raises(QueryBudgetExceededError):
+            middleware(make_request(list_users))
+
+    def test_view_budget_overrides_default(
+        self,
+        settings: "SettingsWrapper",
+        users: list[User],
+    ) -> None:
+        """A per-view budget should take precedence over QUERY_BUDGET."""
+        settings.QUERY_BUDGET = 1
+        settings.QUERY_BUDGET_STRICT = True
+        view = budgeted_list_users(10)
+        middleware = QueryCountMiddleware(view)
+
+        response = middleware(make_request(view))
+
+        assert response.status_code == 200
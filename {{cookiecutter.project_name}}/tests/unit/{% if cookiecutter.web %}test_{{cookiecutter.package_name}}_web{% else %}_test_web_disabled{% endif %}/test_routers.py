@@ -0,0 +1,219 @@
+"""Tests for read replica routing."""
+
+from collections.abc import Generator
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory
+
+from {{cookiecutter.package_name}}_web.middleware import ReplicaPinningMiddleware
+from {{cookiecutter.package_name}}_web.routers import (
+    ReplicaRouter,
+    is_pinned_to_primary,
+    pinning_scope,
+    use_primary,
+)
+
+if TYPE_CHECKING:
+    from pytest_django import DjangoDbBlocker
+    from pytest_django.fixtures import SettingsWrapper
+    from pytest_mock import MockerFixture
+
+
+def add_databases(databases: dict[str, dict[str, object]]) -> None:
+    """Register extra database aliases at runtime."""
+    # configure_settings fills in defaults but insists on a default alias
+    configured = connections.configure_settings({DEFAULT_DB_ALIAS: {}, **databases})
+    connections.settings.update({alias: configured[alias] for alias in databases})
+
+
+def remove_databases(aliases: list[str]) -> None:
+    """Close and unregister database aliases added with add_databases."""
+    for alias in aliases:
+        connections[alias].close()
+        del connections[alias]
+        del connections.settings[alias]
+
+
+@pytest.fixture
+def replicas(
+    tmp_path: Path, settings: "SettingsWrapper", django_db_blocker: "DjangoDbBlocker"
+) -> Generator[list[str], None, None]:
+    """Configure two SQLite stand-ins as replicas, checked on every routing decision.
+
+    Yields:
+        The replica aliases.
+    """
+    aliases = ["replica_0", "replica_1"]
+    add_databases({alias: {"ENGINE": "django.db.backends.sqlite3", "NAME": str(tmp_path / alias)} for alias in aliases})
+    settings.DATABASE_REPLICAS = aliases
+    settings.DATABASE_REPLICA_CHECK_INTERVAL = 0
+    with django_db_blocker.unblock():
+        yield aliases
+    remove_databases(aliases)
+
+
+@pytest.fixture
+def router(replicas: list[str]) -> ReplicaRouter:
+    """A router with fresh replica health state."""
+    return ReplicaRouter()
+
+
+class TestReplicaRouter:
+    """Tests for ReplicaRouter."""
+
+    def test_without_replicas_everything_goes_to_primary(self) -> None:
+        """With no replicas configured, reads and writes use the primary and nothing is pinned."""
+        router = ReplicaRouter()
+
+        with pinning_scope():
+            assert router.db_for_read(User) == DEFAULT_DB_ALIAS
+            assert router.db_for_write(User) == DEFAULT_DB_ALIAS
+            assert not is_pinned_to_primary()
+
+    def test_round_robin(self, router: ReplicaRouter) -> None:
+        """Reads should alternate between healthy replicas."""
+        with pinning_scope():
+            chosen = [router.db_for_read(User) for _ in range(4)]
+
+        assert chosen == ["replica_0", "replica_1", "replica_0", "replica_1"]
+
+    def test_least_latency(self, router: ReplicaRouter, mocker: "MockerFixture", settings: "SettingsWrapper") -> None:
+        """Reads should go to the replica with the lowest measured latency."""
+        settings.DATABASE_REPLICA_SELECTION = "least_latency"
+        latencies = {"replica_0": 0.020, "replica_1": 0.002}
+        mocker.patch.object(router, "check_replica", side_effect=lambda alias: (latencies[alias], 0.0))
+
+        with pinning_scope():
+            assert router.db_for_read(User) == "replica_1"
+
+    def test_write_pins_reads_to_primary(self, router: ReplicaRouter) -> None:
+        """After a write, reads in the same scope should go to the primary."""
+        with pinning_scope():
+            assert router.db_for_read(User) != DEFAULT_DB_ALIAS
+            assert router.db_for_write(User) == DEFAULT_DB_ALIAS
+            assert router.db_for_read(User) == DEFAULT_DB_ALIAS
+
+        with pinning_scope():
+            assert router.db_for_read(User) != DEFAULT_DB_ALIAS
+
+    def test_write_outside_scope_does_not_pin(self, router: ReplicaRouter) -> None:
+        """Outside a pinning scope, e.g. in a management command, a write should not pin later reads."""
+        assert router.db_for_write(User) == DEFAULT_DB_ALIAS
+
+        assert not is_pinned_to_primary()
+        assert router.db_for_read(User) != DEFAULT_DB_ALIAS
+
+    def test_use_primary(self, router: ReplicaRouter) -> None:
+        """use_primary should route reads to the primary only inside the block."""
+        with pinning_scope():
+            with use_primary():
+                assert router.db_for_read(User) == DEFAULT_DB_ALIAS
+            assert router.db_for_read(User) != DEFAULT_DB_ALIAS
+
+    def test_lagging_replica_is_skipped(self, router: ReplicaRouter, mocker: "MockerFixture") -> None:
+        """Replicas lagging more than DATABASE_REPLICA_MAX_LAG should get no reads."""
+        lags = {"replica_0": 30.0, "replica_1": 0.5}
+        mocker.patch.object(router, "check_replica", side_effect=lambda alias: (0.001, lags[alias]))
+
+        with pinning_scope():
+            assert {router.db_for_read(User) for _ in range(4)} == {"replica_1"}
+
+    def test_falls_back_to_primary_when_all_replicas_lag(self, router: ReplicaRouter, mocker: "MockerFixture") -> None:
+        """With no healthy replica, reads should go to the primary."""
+        mocker.patch.object(router, "check_replica", return_value=(0.001, 60.0))
+
+        with pinning_scope():
+            assert router.db_for_read(User) == DEFAULT_DB_ALIAS
+
+    def test_unreachable_replica_is_skipped(
+        self, replicas: list[str], tmp_path: Path, settings: "SettingsWrapper"
+    ) -> None:
+        """Replicas that fail their check should get no reads."""
+        add_databases(
+            {"replica_broken": {"ENGINE": "django.db.backends.sqlite3", "NAME": str(tmp_path / "missing" / "db")}}
+        )
+        settings.DATABASE_REPLICAS = ["replica_broken"]
+        try:
+            with pinning_scope():
+                assert ReplicaRouter().db_for_read(User) == DEFAULT_DB_ALIAS
+        finally:
+            remove_databases(["replica_broken"])
+
+    def test_querysets_are_routed(self, replicas: list[str]) -> None:
+        """The ORM should use the configured router."""
+        with pinning_scope():
+            assert User.objects.all().db in replicas
+            with use_primary():
+                assert User.objects.all().db == DEFAULT_DB_ALIAS
+
+    def test_replicas_are_never_migrated(self, router: ReplicaRouter) -> None:
+        """Replicas should receive schema changes through replication only."""
+        assert router.allow_migrate("replica_0", "auth") is False
+        assert router.allow_migrate(DEFAULT_DB_ALIAS, "auth") is None
+
+    def test_rejects_unknown_selection(self, settings: "SettingsWrapper") -> None:
+        """An unknown selection strategy should fail loudly."""
+        settings.DATABASE_REPLICA_SELECTION = "random"
+
+        with pytest.raises(ImproperlyConfigured):
+            ReplicaRouter()
+
+
+def create_user(request: HttpRequest) -> HttpResponse:
+    """View that writes to the database."""
+    User.objects.create(username="writer")
+    return HttpResponse(status=201)
+
+
+def read_pin(request: HttpRequest) -> HttpResponse:
+    """View that reports whether its reads go to the primary."""
+    return HttpResponse(str(is_pinned_to_primary()))
+
+
+@pytest.mark.django_db
+class TestReplicaPinningMiddleware:
+    """Tests for ReplicaPinningMiddleware."""
+
+    def test_not_used_without_replicas(self) -> None:
+        """The middleware should remove itself when no replicas are configured."""
+        with pytest.raises(MiddlewareNotUsed):
+            ReplicaPinningMiddleware(read_pin)
+
+    def test_write_sets_pin_cookie(self, replicas: list[str], settings: "SettingsWrapper") -> None:
+        """A request that writes should pin the client to the primary for a while."""
+        settings.DATABASE_REPLICA_PIN_SECONDS = 30
+
+        response = ReplicaPinningMiddleware(create_user)(RequestFactory().post("/users/"))
+
+        cookie = response.cookies[ReplicaPinningMiddleware.COOKIE_NAME]
+        assert cookie["max-age"] == 30
+        assert not is_pinned_to_primary()
+
+    def test_read_does_not_set_pin_cookie(self, replicas: list[str]) -> None:
+        """A request that only reads should not pin the client."""
+        response = ReplicaPinningMiddleware(read_pin)(RequestFactory().get("/users/"))
+
+        assert response.content == b"False"
+        assert ReplicaPinningMiddleware.COOKIE_NAME not in response.cookies
+
+    def test_pin_cookie_reads_from_primary(self, replicas: list[str]) -> None:
+        """A pinned client should read from the primary."""
+        request = RequestFactory().get("/users/")
+        request.COOKIES[ReplicaPinningMiddleware.COOKIE_NAME] = "1"
+
+        response = ReplicaPinningMiddleware(read_pin)(request)
+
+        assert response.content == b"True"
+
+    def test_unsafe_methods_read_from_primary(self, replicas: list[str]) -> None:
+        """Unsafe requests should read from the primary even before they write."""
+        response = ReplicaPinningMiddleware(read_pin)(RequestFactory().post("/users/"))
+
+        assert response.content == b"True"
+        assert ReplicaPinningMiddleware.COOKIE_NAME not in response.cookies
@@ -0,0 +1,90 @@
+"""Tests for the environment-specific Django settings profiles."""
+
+import json
+import os
+import subprocess
+import sys
+from typing import Any
+
+import pytest
+
+# Runs in a fresh interpreter so each profile pays its own imports and setup
+_SETUP_PROBE = """
+import json
+import sys
+import tracemalloc
+
+tracemalloc.start()
+import django
+django.setup()
+
+print(json.dumps({"peak_kib": tracemalloc.get_traced_memory()[1] // 1024, "modules": sorted(sys.modules)}))
+"""
+
+DEV_ONLY_MODULES = ("debug_toolbar", "django_extensions")
+
+
+def probe_django_setup(environment: str | None) -> dict[str, Any]:
+    """Run django.setup() in a subprocess under the given settings profile.
+
+    Args:
+        environment: Value for the ENVIRONMENT variable selecting the profile, None to leave it unset.
+
+    Returns:
+        Traced peak Python memory allocated during setup in KiB, and imported module names.
+    """
+    probe_env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "{{cookiecutter.package_name}}_web.settings",
+        "SECRET_KEY": "probe-secret-key-not-for-production",
+        "PYTHONPATH": os.pathsep.join(sys.path),
+    }
+    probe_env.pop("ENVIRONMENT", None)
+    if environment is not None:
+        probe_env["ENVIRONMENT"] = environment
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", _SETUP_PROBE],
+        env=probe_env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return dict(json.loads(result.stdout))
+
+
+class TestSettingsProfiles:
+    """Tests for profile selection via ENVIRONMENT."""
+
+    def test_test_profile_is_active(self) -> None:
+        """The test suite should run under the test profile."""
+        from django.conf import settings
+
+        assert settings.ENVIRONMENT == "test"
+        assert "debug_toolbar" not in settings.INSTALLED_APPS
+
+    def test_development_profile_installs_dev_apps(self) -> None:
+        """The development profile should install dev-only apps."""
+        modules = probe_django_setup("development")["modules"]
+
+        for module in DEV_ONLY_MODULES:
+            assert module in modules
+
+    @pytest.mark.parametrize("environment", [None, "production", "staging"], ids=["unset", "production", "staging"])
+    def test_non_development_profiles_never_import_dev_apps(self, environment: str | None) -> None:
+        """Production, the default, and unknown environments should never import dev-only apps."""
+        modules = probe_django_setup(environment)["modules"]
+
+        for module in DEV_ONLY_MODULES:
+            assert module not in modules
+
+
+@pytest.mark.slow
+class TestSettingsStartupCost:
+    """Import and memory comparison between settings profiles."""
+
+    def test_production_setup_is_cheaper_than_development(self) -> None:
+        """Production django.setup() should import less and use less memory than development."""
+        development, production = probe_django_setup("development"), probe_django_setup("production")
+
+        assert len(production["modules"]) < len(development["modules"])
+        assert production["peak_kib"] < development["peak_kib"]
@@ -0,0 +1,830 @@
+"""HTTP client utilities for integration, smoke and load tests.
+
+Also builds the Lambda events that API Gateway, ALB and Function URLs send, and
+stores and replays them. To write a randomized corpus for load, fuzz and replay
+tests, or extract the events the deployed handler logged:
+
+    PYTHONPATH=tests uv run python -m common.http --count 10000 --route "GET /health" --output events.jsonl
+    aws logs tail /aws/lambda/my-function --since 1h > lambda.log
+    PYTHONPATH=tests uv run python -m common.http --from-logs lambda.log --output events.jsonl
+"""
+
+import argparse
+import base64
+import contextlib
+import json
+import random
+import string
+import sys
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ClassVar, Final
+from urllib.parse import parse_qsl, quote_plus, unquote_plus, urlencode
+
+import httpx
+
+Event = dict[str, Any]
+# Header and query parameter values, a list for a name given more than once
+Values = Mapping[str, str | Sequence[str]]
+
+EVENT_FORMATS: Final = ("alb", "apigw-v1", "apigw-v2", "function-url")
+DEFAULT_HEADERS: Final[dict[str, str]] = {
+    "host": "localhost",
+    "user-agent": "ApiClient/1.0",
+    "accept": "application/json",
+    "content-type": "application/json",
+}
+ACCOUNT_ID: Final = "123456789012"
+REQUEST_TIME_EPOCH: Final = 1703160000000
+# Random values include characters that need URL-encoding; random bytes map onto them
+TOKEN_CHARACTERS: Final = string.ascii_letters + string.digits + "-_.~ %&=+/"
+TOKEN_TABLE: Final = bytes(ord(TOKEN_CHARACTERS[byte % len(TOKEN_CHARACTERS)]) for byte in range(256))
+
+
+def _lists(values: Values) -> dict[str, list[str]]:
+    """Header or query parameter values as lists."""
+    return {name: [value] if isinstance(value, str) else list(value) for name, value in values.items()}
+
+
+def _url_encoded(values: Values) -> dict[str, list[str]]:
+    """Query parameter values as lists, names and values URL-encoded."""
+    return {quote_plus(name): [quote_plus(value) for value in values] for name, values in _lists(values).items()}
+
+
+def _last(values: Values) -> dict[str, str]:
+    """Header or query parameter values, the last one for a repeated name."""
+    return {name: value if isinstance(value, str) else value[-1] for name, value in values.items()}
+
+
+def _joined(values: Values) -> dict[str, str]:
+    """Header or query parameter values, comma-joined for a repeated name."""
+    return {name: value if isinstance(value, str) else ",".join(value) for name, value in values.items()}
+
+
+class EventFactory:
+    """Builds Lambda HTTP events in one of the formats Mangum handles.
+
+    The parts of an event that do not depend on the request, its request context
+    and the default headers in the shapes the format wants, are built once with the
+    factory. Each event is a copy of that template with the request filled in. Its
+    header and query parameter dicts are its own, but the nested request context
+    and multi-value lists are shared with the template: deep-copy an event before
+    changing those.
+
+    Attributes:
+        event_format: One of EVENT_FORMATS.
+        multi_value: Whether events carry ``multiValueHeaders`` and
+            ``multiValueQueryStringParameters``: always for API Gateway v1, for an
+            ALB when its target group has multi-value headers enabled.
+    """
+
+    def __init__(
+        self,
+        event_format: str = "alb",
+        multi_value: bool = False,
+        default_headers: Mapping[str, str] | None = None,
+    ) -> None:
+        """Compile the event template.
+
+        Args:
+            event_format: One of EVENT_FORMATS.
+            multi_value: For an ALB, whether its target group has multi-value headers enabled.
+            default_headers: Headers of every event, DEFAULT_HEADERS by default.
+
+        Raises:
+            ValueError: If the event format is unknown.
+        """
+        if event_format not in EVENT_FORMATS:
+            raise ValueError(f"Unknown event format: {event_format}")
+        self.event_format = event_format
+        self.multi_value = multi_value or event_format == "apigw-v1"
+        self._headers = dict(DEFAULT_HEADERS if default_headers is None else default_headers)
+        self._multi_headers = _lists(self._headers)
+        user_agent = self._headers.get("user-agent", "")
+        if event_format == "function-url":
+            api_id, domain = "abcdefghijklmnopqrstuvwxyz012345", "lambda-url.us-east-1.on.aws"
+        else:
+            api_id, domain = "abc123xyz", "execute-api.us-east-1.amazonaws.com"
+        context: dict[str, Any] = {
+            "accountId": ACCOUNT_ID,
+            "apiId": api_id,
+            "domainName": f"{api_id}.{domain}",
+            "domainPrefix": api_id,
+            "requestId": "c6af9ac6-7b61-11e6-9a41-93e8deadbeef",
+        }
+        self._context: dict[str, Any] = {}
+        self._http: dict[str, str] = {}
+        match event_format:
+            case "alb":
+                target_group = f"arn:aws:elasticloadbalancing:us-east-1:{ACCOUNT_ID}:targetgroup/test/1234567890123456"
+                self._context = {"elb": {"targetGroupArn": target_group}}
+                self._build = self._alb
+            case "apigw-v1":
+                self._context = {
+                    **context,
+                    "extendedRequestId": "test-extended-request-id",
+                    "identity": {"sourceIp": "127.0.0.1", "userAgent": user_agent},
+                    "protocol": "HTTP/1.1",
+                    "requestTime": "21/Dec/2024:12:00:00 +0000",
+                    "requestTimeEpoch": REQUEST_TIME_EPOCH,
+                    "resourceId": "abc123",
+                    "stage": "test",
+                }
+                self._build = self._apigw_v1
+            case _:
+                self._context = {
+                    **context,
+                    "routeKey": "$default",
+                    "stage": "$default",
+                    "time": "21/Dec/2024:12:00:00 +0000",
+                    "timeEpoch": REQUEST_TIME_EPOCH,
+                }
+                self._http = {"protocol": "HTTP/1.1", "sourceIp": "127.0.0.1", "userAgent": user_agent}
+                self._build = self._http_v2
+
+    def create(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | str | bytes | None = None,
+        headers: Values | None = None,
+        query_params: Values | None = None,
+    ) -> Event:
+        """Create an event.
+
+        Args:
+            method: HTTP method (GET, POST, etc.).
+            path: Request path (e.g., /health).
+            body: Request body (dict will be JSON-encoded, bytes base64-encoded).
+            headers: HTTP headers, with a list of values for a header sent more than once.
+            query_params: Query string parameters, with a list of values for a repeated one.
+
+        Returns:
+            Event dictionary suitable for Lambda invocation.
+        """
+        if body is None or isinstance(body, str):
+            return self._build(method.upper(), path, body, False, headers, query_params)
+        if isinstance(body, bytes):
+            return self._build(method.upper(), path, base64.b64encode(body).decode(), True, headers, query_params)
+        return self._build(method.upper(), path, json.dumps(body), False, headers, query_params)
+
+    def _alb(
+        self,
+        method: str,
+        path: str,
+        body: str | None,
+        is_base64: bool,
+        headers: Values | None,
+        query: Values | None,
+    ) -> Event:
+        """An ALB event; the load balancer passes the query string on URL-encoded."""
+        encoded = _url_encoded(query) if query else {}
+        if self.multi_value:
+            return {
+                "requestContext": self._context,
+                "httpMethod": method,
+                "path": path,
+                "multiValueQueryStringParameters": encoded,
+                "multiValueHeaders": {**self._multi_headers, **_lists(headers)} if headers else {**self._multi_headers},
+                "body": body or "",
+                "isBase64Encoded": is_base64,
+            }
+        # Without multi-value headers, the load balancer passes the last value on
+        return {
+            "requestContext": self._context,
+            "httpMethod": method,
+            "path": path,
+            "queryStringParameters": _last(encoded) if encoded else {},
+            "headers": {**self._headers, **_last(headers)} if headers else {**self._headers},
+            "body": body or "",
+            "isBase64Encoded": is_base64,
+        }
+
+    def _apigw_v1(
+        self,
+        method: str,
+        path: str,
+        body: str | None,
+        is_base64: bool,
+        headers: Values | None,
+        query: Values | None,
+    ) -> Event:
+        """An API Gateway REST API event, with single and multi-value headers and parameters."""
+        return {
+            "resource": path,
+            "path": path,
+            "httpMethod": method,
+            "headers": {**self._headers, **_last(headers)} if headers else {**self._headers},
+            "multiValueHeaders": {**self._multi_headers, **_lists(headers)} if headers else {**self._multi_headers},
+            "queryStringParameters": _last(query) if query else None,
+            "multiValueQueryStringParameters": _lists(query) if query else None,
+            "pathParameters": None,
+            "stageVariables": None,
+            "requestContext": {**self._context, "httpMethod": method, "path": f"/test{path}", "resourcePath": path},
+            "body": body,
+            "isBase64Encoded": is_base64,
+        }
+
+    def _http_v2(
+        self,
+        method: str,
+        path: str,
+        body: str | None,
+        is_base64: bool,
+        headers: Values | None,
+        query: Values | None,
+    ) -> Event:
+        """An API Gateway HTTP API or Function URL event: repeated values comma-joined, cookies apart."""
+        joined = {**self._headers, **_joined(headers)} if headers else {**self._headers}
+        event: Event = {
+            "version": "2.0",
+            "routeKey": "$default",
+            "rawPath": path,
+            "rawQueryString": urlencode(query, doseq=True) if query else "",
+            "headers": joined,
+            "requestContext": {**self._context, "http": {**self._http, "method": method, "path": path}},
+            "isBase64Encoded": is_base64,
+        }
+        if "cookie" in joined:
+            event["cookies"] = joined.pop("cookie").split("; ")
+        if query:
+            event["queryStringParameters"] = _joined(query)
+        if body is not None:
+            event["body"] = body
+        return event
+
+
+# Builds the events of ApiClient.create_alb_event
+ALB_EVENTS: Final = EventFactory("alb")
+
+
+@dataclass(frozen=True)
+class EventRequest:
+    """The HTTP request a Lambda event stands for, whatever its format.
+
+    Attributes:
+        method: HTTP method.
+        path: Request path.
+        headers: Header names and values, a name repeated for each of its values.
+        query: Query parameter names and values, decoded.
+        body: Request body, base64-decoded.
+    """
+
+    # Headers that belonged to the connection the event came in on
+    CONNECTION_HEADERS: ClassVar[frozenset[str]] = frozenset({"host", "content-length", "connection"})
+
+    method: str
+    path: str
+    headers: list[tuple[str, str]]
+    query: list[tuple[str, str]]
+    body: bytes
+
+    @classmethod
+    def from_event(cls, event: Event) -> "EventRequest":
+        """Read the request out of an event in any of EVENT_FORMATS.
+
+        Args:
+            event: API Gateway, ALB or Function URL event.
+
+        Returns:
+            The request.
+        """
+        if event.get("version") == "2.0":
+            http = event["requestContext"]["http"]
+            method, path = http["method"], http["path"]
+            headers = list(event.get("headers", {}).items())
+            if event.get("cookies"):
+                headers.append(("cookie", "; ".join(event["cookies"])))
+            query = parse_qsl(event.get("rawQueryString", ""), keep_blank_values=True)
+        else:
+            method, path = event["httpMethod"], event["path"]
+            multi_headers = event.get("multiValueHeaders") or _lists(event.get("headers") or {})
+            headers = [(name, value) for name, values in multi_headers.items() for value in values]
+            multi_query = event.get("multiValueQueryStringParameters") or _lists(
+                event.get("queryStringParameters") or {}
+            )
+            query = [(name, value) for name, values in multi_query.items() for value in values]
+            if "elb" in event["requestContext"]:
+                query = [(unquote_plus(name), unquote_plus(value)) for name, value in query]
+        body = event.get("body") or ""
+        content = base64.b64decode(body) if event.get("isBase64Encoded") else body.encode()
+        return cls(method, path, headers, query, content)
+
+    def to_httpx(self, base_url: str) -> httpx.Request:
+        """The request, to send to another server.
+
+        Args:
+            base_url: URL the path is appended to.
+
+        Returns:
+            The request, without the headers of the connection the event came in on.
+        """
+        return httpx.Request(
+            self.method,
+            f"{base_url.rstrip('/')}{self.path}",
+            headers=[(name, value) for name, value in self.headers if name.lower() not in self.CONNECTION_HEADERS],
+            params=tuple(self.query),
+            content=self.body,
+        )
+
+
+def _token(rng: random.Random, length: int) -> str:
+    """A random string of ``length`` characters from TOKEN_CHARACTERS."""
+    return rng.randbytes(length).translate(TOKEN_TABLE).decode()
+
+
+def random_events(
+    count: int,
+    routes: Sequence[tuple[str, str]] = (("GET", "/health"),),
+    formats: Sequence[str] = EVENT_FORMATS,
+    seed: int | None = None,
+    max_body_bytes: int = 1024,
+    binary_ratio: float = 0.1,
+) -> list[Event]:
+    """Generate a randomized event corpus for load, fuzz and replay tests.
+
+    Each event has a random format and route, up to three query parameters and
+    extra headers with random values, some headers repeated, and, unless it is a
+    GET or HEAD, a JSON body or, with probability ``binary_ratio``, random bytes.
+    ALB events come with and without multi-value headers.
+
+    Args:
+        count: Number of events.
+        routes: HTTP methods and paths to pick from.
+        formats: Event formats to pick from.
+        seed: Seed of the random generator, for a reproducible corpus.
+        max_body_bytes: Upper bound of the body sizes.
+        binary_ratio: Fraction of the bodies that are random bytes.
+
+    Returns:
+        The events.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    factories = [EventFactory(event_format) for event_format in formats]
+    if "alb" in formats:
+        factories.append(EventFactory("alb", multi_value=True))
+    events = []
+    for _ in range(count):
+        method, path = rng.choice(routes)
+        query: dict[str, str] = {}
+        headers: dict[str, str | list[str]] = {}
+        for index in range(rng.randint(0, 3)):
+            query[f"q{index}"] = _token(rng, rng.randint(0, 16))
+            value = _token(rng, rng.randint(1, 32)).strip() or "-"
+            headers[f"x-random-{index}"] = [value, value[::-1]] if rng.random() < 0.2 else value
+        body: dict[str, Any] | bytes | None = None
+        if method not in {"GET", "HEAD"}:
+            size = rng.randint(0, max_body_bytes)
+            body = rng.randbytes(size) if rng.random() < binary_ratio else {"value": rng.randbytes(size // 2).hex()}
+        events.append(rng.choice(factories).create(method, path, body, headers, query))
+    return events
+
+
+def save_events(path: Path, events: Iterable[Event]) -> None:
+    """Write events as JSON Lines, one event per line."""
+    with path.open("w") as file:
+        file.writelines(json.dumps(event) + "\n" for event in events)
+
+
+def load_events(path: Path) -> list[Event]:
+    """Read events from a JSON array or JSON Lines file."""
+    text = path.read_text()
+    if text.lstrip().startswith("["):
+        events: list[Event] = json.loads(text)
+        return events
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def logged_events(lines: Iterable[str]) -> list[Event]:
+    """Extract the events the Lambda handler logged.
+
+    The handler logs each event it receives as the message of a JSON log record.
+    A line may have a prefix before the record, like the timestamp and log stream
+    that ``aws logs tail`` adds.
+
+    Args:
+        lines: Log lines.
+
+    Returns:
+        The API Gateway, ALB and Function URL events found, in order.
+    """
+    events = []
+    for line in lines:
+        start = line.find("{")
+        if start < 0:
+            continue
+        try:
+            record = json.loads(line[start:])
+        except json.JSONDecodeError:
+            continue
+        message = record.get("message") if isinstance(record, dict) else None
+        if isinstance(message, dict) and "requestContext" in message:
+            events.append(message)
+    return events
+
+
+class ApiClient:
+    """HTTP client for testing Lambda API endpoints.
+
+    Supports two modes:
+    - Lambda invoke mode: Calls Lambda via Docker Compose's Runtime Interface Emulator
+    - Direct HTTP mode: Calls deployed Lambda via API Gateway/Function URL
+
+    Attributes:
+        base_url: The base URL of the API endpoint.
+        lambda_mode: Whether to use Lambda invoke format (for Docker Compose testing).
+        events: Builds the events sent in lambda_mode.
+    """
+
+    # Default Lambda RIE endpoint in Docker Compose
+    LAMBDA_RIE_URL: Final[str] = "http://localhost:9000/2015-03-31/functions/function/invocations"
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        lambda_mode: bool = True,
+        timeout: float = 30.0,
+        event_format: str = "alb",
+        transport: httpx.BaseTransport | None = None,
+    ) -> None:
+        """Initialize the API client.
+
+        Args:
+            base_url: The base URL for direct HTTP mode. Ignored in lambda_mode.
+            lambda_mode: If True, use Lambda invoke format via RIE.
+            timeout: Request timeout in seconds.
+            event_format: Format of the events sent in lambda_mode, one of EVENT_FORMATS.
+            transport: Transport to send requests with, e.g. an ``httpx.MockTransport``.
+        """
+        self.base_url = base_url or self.LAMBDA_RIE_URL
+        self.lambda_mode = lambda_mode
+        self.timeout = timeout
+        self.events = ALB_EVENTS if event_format == "alb" else EventFactory(event_format)
+        self._client = httpx.Client(timeout=timeout, transport=transport)
+
+    def close(self) -> None:
+        """Close the underlying HTTP client."""
+        self._client.close()
+
+    def __enter__(self) -> "ApiClient":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Context manager exit."""
+        self.close()
+
+    @staticmethod
+    def create_alb_event(
+        method: str,
+        path: str,
+        body: dict[str, Any] | str | None = None,
+        headers: dict[str, str] | None = None,
+        query_params: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """Create an ALB (Application Load Balancer) event for Lambda invocation.
+
+        Args:
+            method: HTTP method (GET, POST, etc.).
+            path: Request path (e.g., /health).
+            body: Request body (dict will be JSON-encoded).
+            headers: HTTP headers.
+            query_params: Query string parameters.
+
+        Returns:
+            ALB event dictionary suitable for Lambda invocation.
+        """
+        return ALB_EVENTS.create(method, path, body, headers, query_params)
+
+    def _invoke_lambda(self, event: dict[str, Any]) -> httpx.Response:
+        """Invoke Lambda via RIE.
+
+        Args:
+            event: Lambda event payload.
+
+        Returns:
+            HTTP response from the Lambda function.
+        """
+        return self._client.post(
+            self.LAMBDA_RIE_URL,
+            json=event,
+        )
+
+    @staticmethod
+    def _parse_lambda_response(response: httpx.Response) -> dict[str, Any]:
+        """Parse Lambda invocation response.
+
+        Args:
+            response: HTTP response from Lambda RIE.
+
+        Returns:
+            Parsed response with statusCode, headers, and body.
+        """
+        lambda_result = response.json()
+
+        # Lambda response format
+        status_code = lambda_result.get("statusCode", 500)
+        headers = lambda_result.get("headers") or {
+            # Answering an event with multi-value headers, Mangum sends only those
+            name: ",".join(values)
+            for name, values in lambda_result.get("multiValueHeaders", {}).items()
+        }
+        body = lambda_result.get("body", "")
+
+        # Decode base64 body if needed
+        if lambda_result.get("isBase64Encoded", False):
+            body = base64.b64decode(body).decode("utf-8")
+
+        # Parse JSON body if applicable
+        content_type = headers.get("content-type", "")
+        if "application/json" in content_type and body:
+            with contextlib.suppress(json.JSONDecodeError):
+                body = json.loads(body)
+
+        return {
+            "status_code": status_code,
+            "headers": headers,
+            "body": body,
+            "raw_response": lambda_result,
+        }
+
+    @staticmethod
+    def _parse_http_response(response: httpx.Response) -> dict[str, Any]:
+        """Parse a direct HTTP response.
+
+        Args:
+            response: HTTP response from the API.
+
+        Returns:
+            Parsed response with status_code, headers, and body.
+        """
+        content_type = response.headers.get("content-type", "")
+        body = response.json() if content_type.startswith("application/json") else response.text
+        return {
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "body": body,
+            "raw_response": response,
+        }
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | str | None = None,
+        headers: dict[str, str] | None = None,
+        query_params: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """Make an HTTP request to the API.
+
+        Args:
+            method: HTTP method (GET, POST, etc.).
+            path: Request path (e.g., /health).
+            body: Request body (dict will be JSON-encoded).
+            headers: HTTP headers.
+            query_params: Query string parameters.
+
+        Returns:
+            Response dictionary with status_code, headers, and body.
+        """
+        if self.lambda_mode:
+            event = self.events.create(
+                method=method,
+                path=path,
+                body=body,
+                headers=headers,
+                query_params=query_params,
+            )
+            response = self._invoke_lambda(event)
+            return self._parse_lambda_response(response)
+        else:
+            # Direct HTTP mode for deployed Lambda
+            response = self._client.request(
+                method=method,
+                url=f"{self.base_url.rstrip('/')}{path}",
+                json=body if isinstance(body, dict) else None,
+                content=body if isinstance(body, str) else None,
+                headers=headers,
+                params=query_params,
+            )
+            return self._parse_http_response(response)
+
+    def invoke(self, event: Event) -> dict[str, Any]:
+        """Replay a Lambda event, e.g. one recorded from the deployed function.
+
+        In lambda_mode the event is sent to the RIE as is; otherwise the request it
+        stands for is sent to base_url.
+
+        Args:
+            event: API Gateway, ALB or Function URL event.
+
+        Returns:
+            Response dictionary with status_code, headers, and body.
+        """
+        if self.lambda_mode:
+            return self._parse_lambda_response(self._invoke_lambda(event))
+        request = EventRequest.from_event(event).to_httpx(self.base_url)
+        return self._parse_http_response(self._client.send(request))
+
+    def get(
+        self,
+        path: str,
+        headers: dict[str, str] | None = None,
+        query_params: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """Make a GET request."""
+        return self.request("GET", path, headers=headers, query_params=query_params)
+
+    def post(
+        self,
+        path: str,
+        body: dict[str, Any] | str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """Make a POST request."""
+        return self.request("POST", path, body=body, headers=headers)
+
+    def health_check(self) -> dict[str, Any]:
+        """Check the /health endpoint.
+
+        Returns:
+            Health check response.
+        """
+        return self.get("/health")
+
+
+class AsyncApiClient:
+    """Async counterpart of ApiClient, for sending many requests concurrently.
+
+    All requests share one pooled ``httpx.AsyncClient``, so keep-alive connections
+    are reused instead of opening one per request. Responses are parsed like
+    ApiClient's.
+
+    Attributes:
+        base_url: The base URL of the API endpoint.
+        lambda_mode: Whether to use Lambda invoke format (for Docker Compose testing).
+        events: Builds the events sent in lambda_mode.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        lambda_mode: bool = True,
+        timeout: float = 30.0,
+        max_connections: int = 100,
+        transport: httpx.AsyncBaseTransport | None = None,
+        event_format: str = "alb",
+    ) -> None:
+        """Initialize the API client.
+
+        Args:
+            base_url: The base URL for direct HTTP mode. Ignored in lambda_mode.
+            lambda_mode: If True, use Lambda invoke format via RIE.
+            timeout: Request timeout in seconds.
+            max_connections: Size of the connection pool.
+            transport: Transport to send requests with, e.g. an ``httpx.ASGITransport``.
+            event_format: Format of the events sent in lambda_mode, one of EVENT_FORMATS.
+        """
+        self.base_url = base_url or ApiClient.LAMBDA_RIE_URL
+        self.lambda_mode = lambda_mode
+        self.events = ALB_EVENTS if event_format == "alb" else EventFactory(event_format)
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+
+    async def close(self) -> None:
+        """Close the underlying HTTP client."""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncApiClient":
+        """Context manager entry."""
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Context manager exit."""
+        await self.close()
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | str | None = None,
+        headers: dict[str, str] | None = None,
+        query_params: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """Make an HTTP request to the API.
+
+        Args:
+            method: HTTP method (GET, POST, etc.).
+            path: Request path (e.g., /health).
+            body: Request body (dict will be JSON-encoded).
+            headers: HTTP headers.
+            query_params: Query string parameters.
+
+        Returns:
+            Response dictionary with status_code, headers, and body.
+        """
+        if self.lambda_mode:
+            event = self.events.create(
+                method=method,
+                path=path,
+                body=body,
+                headers=headers,
+                query_params=query_params,
+            )
+            return ApiClient._parse_lambda_response(await self._client.post(ApiClient.LAMBDA_RIE_URL, json=event))
+        response = await self._client.request(
+            method=method,
+            url=f"{self.base_url.rstrip('/')}{path}",
+            json=body if isinstance(body, dict) else None,
+            content=body if isinstance(body, str) else None,
+            headers=headers,
+            params=query_params,
+        )
+        return ApiClient._parse_http_response(response)
+
+    async def invoke(self, event: Event) -> dict[str, Any]:
+        """Replay a Lambda event, e.g. one recorded from the deployed function.
+
+        In lambda_mode the event is sent to the RIE as is; otherwise the request it
+        stands for is sent to base_url.
+
+        Args:
+            event: API Gateway, ALB or Function URL event.
+
+        Returns:
+            Response dictionary with status_code, headers, and body.
+        """
+        if self.lambda_mode:
+            return ApiClient._parse_lambda_response(await self._client.post(ApiClient.LAMBDA_RIE_URL, json=event))
+        request = EventRequest.from_event(event).to_httpx(self.base_url)
+        return ApiClient._parse_http_response(await self._client.send(request))
+
+
+def parse_route(text: str) -> tuple[str, str]:
+    """Parse ``METHOD /path``.
+
+    Raises:
+        argparse.ArgumentTypeError: If the text is malformed.
+    """
+    match text.split():
+        case [method, path] if path.startswith("/"):
+            return method.upper(), path
+    raise argparse.ArgumentTypeError(f"expected 'METHOD /path', got {text!r}")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description="Write a randomized or recorded Lambda event corpus as JSON Lines")
+    parser.add_argument("--count", type=int, default=1000, help="Number of random events")
+    parser.add_argument(
+        "--route",
+        action="append",
+        type=parse_route,
+        help="'METHOD /path' to pick from, repeatable; GET /health by default",
+    )
+    parser.add_argument(
+        "--format",
+        action="append",
+        choices=EVENT_FORMATS,
+        dest="formats",
+        help="Event format, repeatable; all by default",
+    )
+    parser.add_argument("--seed", type=int, help="Seed for a reproducible corpus")
+    parser.add_argument("--max-body-bytes", type=int, default=1024, help="Upper bound of the body sizes")
+    parser.add_argument("--from-logs", type=Path, help="Extract the events the handler logged instead, '-' for stdin")
+    parser.add_argument("--output", type=Path, help="Write the events here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Write the event corpus.
+
+    Returns:
+        Exit status: 1 if no event was written, else 0.
+    """
+    args = parse_args(argv)
+    if args.from_logs:
+        stdin = str(args.from_logs) == "-"
+        with contextlib.nullcontext(sys.stdin) if stdin else args.from_logs.open() as lines:
+            events = logged_events(lines)
+    else:
+        events = random_events(
+            args.count,
+            routes=args.route or [("GET", "/health")],
+            formats=args.formats or EVENT_FORMATS,
+            seed=args.seed,
+            max_body_bytes=args.max_body_bytes,
+        )
+    if args.output:
+        save_events(args.output, events)
+    else:
+        sys.stdout.writelines(json.dumps(event) + "\n" for event in events)
+    return 0 if events else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
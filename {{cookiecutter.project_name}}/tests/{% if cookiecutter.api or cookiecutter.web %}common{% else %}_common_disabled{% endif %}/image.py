@@ -0,0 +1,204 @@
+"""Size and startup time of the Docker images.
+
+Builds a service's Docker target, ``production`` by default, reads the image size,
+then starts the service in Docker Compose, its dependencies already running, and
+times it from ``docker compose up`` to the first healthy response. The first
+response itself is timed too, and a second one for comparison: the first is where
+lazy initialization happens{% if cookiecutter.api_lambda %}, and on the Lambda Runtime Interface Emulator it
+is the cold start, the handler module being imported on the first invocation{% endif %}.
+Reports it all as JSON, and exits with status 1 when a budget is exceeded:
+
+    ./test image {{ 'web' if cookiecutter.web else ('lambda-api' if cookiecutter.api_lambda else 'api') }} --max-size-mb 250 --max-startup 10
+    ./test image {{ 'lambda-api' if cookiecutter.api_lambda else ('web' if cookiecutter.web else 'api') }} --docker-target development --docker-target production
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+
+import httpx
+from common.http import ApiClient
+from common.load import TARGETS
+
+PROJECT = "{{cookiecutter.project_name}}"
+# Docker Compose services with an image of their own, and the services they depend on
+DEPENDENCIES: dict[str, tuple[str, ...]] = {
+{%- if cookiecutter.web %}
+    "web": ("postgresql", "redis"),
+{%- endif %}
+{%- if cookiecutter.api and not cookiecutter.api_lambda %}
+    "api": ({{ '"postgresql",' if cookiecutter.web }}),
+{%- endif %}
+{%- if cookiecutter.api_lambda %}
+    "lambda-api": (),
+{%- endif %}
+}
+DOCKER_TARGETS = ("development", "production")
+
+Runner = Callable[[Sequence[str], dict[str, str]], str]
+
+
+def run_command(command: Sequence[str], env: dict[str, str]) -> str:
+    """Run a command, failing on a non-zero exit status.
+
+    Returns:
+        The command's standard output.
+    """
+    return subprocess.run(command, env=env, check=True, stdout=subprocess.PIPE, text=True).stdout  # noqa: S603
+
+
+@dataclass(frozen=True)
+class ImageReport:
+    """Measurements of one service's image.
+
+    Attributes:
+        service: Docker Compose service.
+        image: Image name and tag.
+        size_bytes: Uncompressed image size.
+        startup_seconds: From starting the container to its first healthy response.
+        first_response_seconds: Duration of the first healthy request.
+        warm_response_seconds: Duration of the request after it.
+    """
+
+    service: str
+    image: str
+    size_bytes: int
+    startup_seconds: float
+    first_response_seconds: float
+    warm_response_seconds: float
+
+    @property
+    def size_mb(self) -> float:
+        """Image size in megabytes."""
+        return self.size_bytes / 1_000_000
+
+    def to_dict(self) -> dict[str, object]:
+        """The report as JSON-serializable data, durations rounded to the millisecond."""
+        return {
+            key: round(value, 3) if isinstance(value, float) else value
+            for key, value in {**asdict(self), "size_mb": round(self.size_mb, 1)}.items()
+        }
+
+
+def check_health(client: httpx.Client, service: str) -> bool:
+    """Send one health check to a service.
+
+    Returns:
+        Whether it answered 200.
+
+    Raises:
+        httpx.TransportError: If the service could not be reached.
+    """
+    base_url, lambda_mode, health_path = TARGETS[service]
+    if not lambda_mode:
+        return client.get(base_url + health_path).status_code == httpx.codes.OK
+    response = client.post(ApiClient.LAMBDA_RIE_URL, json=ApiClient.create_alb_event("GET", health_path))
+    # A failed invocation answers 200 too, with an error instead of an HTTP response
+    return response.status_code == httpx.codes.OK and response.json().get("statusCode") == httpx.codes.OK
+
+
+def wait_healthy(client: httpx.Client, service: str, timeout: float, interval: float = 0.05) -> float:
+    """Poll a service's health check until it answers 200.
+
+    Returns:
+        Duration of the request that answered 200, in seconds.
+
+    Raises:
+        TimeoutError: If it has not answered 200 within ``timeout`` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        started = time.perf_counter()
+        try:
+            if check_health(client, service):
+                return time.perf_counter() - started
+        except httpx.TransportError:
+            pass
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"{service} not healthy after {timeout:.0f}s")
+        time.sleep(interval)
+
+
+def measure(service: str, target: str, run: Runner, client: httpx.Client, timeout: float) -> ImageReport:
+    """Build a service's image and time its startup.
+
+    Args:
+        service: Docker Compose service.
+        target: Dockerfile target to build.
+        run: Runs a command with the given environment and returns its output.
+        client: Client sending the health checks.
+        timeout: Seconds to wait for the service to become healthy.
+
+    Returns:
+        The image's size and startup times.
+    """
+    env = {**os.environ, "DOCKER_TARGET": target}
+    image = f"{PROJECT}-{service}:{target}"
+    run(["docker", "compose", "build", service], env)
+    size = int(run(["docker", "image", "inspect", "--format", "{% raw %}{{.Size}}{% endraw %}", image], env).strip())
+    if DEPENDENCIES[service]:
+        run(["docker", "compose", "up", "--detach", "--wait", *DEPENDENCIES[service]], env)
+    try:
+        started = time.perf_counter()
+        run(["docker", "compose", "up", "--detach", "--no-deps", "--force-recreate", service], env)
+        first = wait_healthy(client, service, timeout)
+        startup = time.perf_counter() - started
+        warm = wait_healthy(client, service, timeout)
+    finally:
+        run(["docker", "compose", "rm", "--stop", "--force", service], env)
+    return ImageReport(service, image, size, startup, first, warm)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0] if __doc__ else None)
+    parser.add_argument("services", nargs="*", choices=list(DEPENDENCIES), help="Services to measure; all by default")
+    parser.add_argument(
+        "--docker-target",
+        action="append",
+        choices=DOCKER_TARGETS,
+        help="Dockerfile target to measure, repeatable to compare them; production by default",
+    )
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for a healthy response")
+    parser.add_argument("--max-size-mb", type=float, help="Exit with status 1 when an image is larger")
+    parser.add_argument("--max-startup", type=float, help="Exit with status 1 when a service starts slower, in seconds")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None, run: Runner = run_command, client: httpx.Client | None = None) -> int:
+    """Measure the images and print the reports.
+
+    Args:
+        argv: Command line arguments, ``sys.argv`` by default.
+        run: Runs a command with the given environment and returns its output.
+        client: Client sending the health checks.
+
+    Returns:
+        Exit status: 1 if an image exceeds a budget, else 0.
+    """
+    args = parse_args(argv)
+    with client or httpx.Client(timeout=args.timeout) as http:
+        reports = [
+            measure(service, target, run, http, args.timeout)
+            for service in args.services or DEPENDENCIES
+            for target in args.docker_target or ["production"]
+        ]
+    print(json.dumps([report.to_dict() for report in reports], indent=2))
+    over = [
+        report
+        for report in reports
+        if (args.max_size_mb is not None and report.size_mb > args.max_size_mb)
+        or (args.max_startup is not None and report.startup_seconds > args.max_startup)
+    ]
+    for report in over:
+        print(f"{report.image}: over budget", file=sys.stderr)
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+"""Load generation against a running server.
+
+Sends a weighted mix of requests through AsyncApiClient and reports throughput,
+latency percentiles and error rates as JSON. Without a rate, ``concurrency``
+clients send requests back to back (closed loop). With a rate, requests start on
+a fixed schedule whatever the server's latency (open loop), at most
+``concurrency`` at a time; latency is measured from the scheduled start, so time
+spent waiting for a free slot counts against the server.
+
+Run it with ``./test load`` against a Docker Compose service or any URL:
+
+    ./test load --target {{ 'web' if cookiecutter.web else ('lambda-api' if cookiecutter.api_lambda else 'api') }} --duration 30 --concurrency 50
+    ./test load --url https://example.com --rate 200 --mix "GET /health 9" --mix "GET /docs 1"
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from common.http import AsyncApiClient
+
+# Docker Compose services: base URL, whether it is the Lambda RIE, and the health path
+TARGETS: dict[str, tuple[str, bool, str]] = {
+{%- if cookiecutter.web %}
+    "web": ("http://localhost:8000", False, "/health/"),
+{%- endif %}
+{%- if cookiecutter.api and not cookiecutter.api_lambda %}
+    "api": ("http://localhost:{{ '8001' if cookiecutter.web else '8000' }}", False, "/health"),
+{%- endif %}
+{%- if cookiecutter.api_lambda %}
+    "lambda-api": ("", True, "/health"),
+{%- endif %}
+}
+
+
+@dataclass(frozen=True)
+class RequestSpec:
+    """One kind of request in the mix.
+
+    Attributes:
+        method: HTTP method.
+        path: Request path, with the query string if any.
+        weight: Relative frequency in the mix.
+        body: Request body (dict will be JSON-encoded).
+        headers: HTTP headers.
+    """
+
+    method: str
+    path: str
+    weight: float = 1.0
+    body: dict[str, Any] | str | None = None
+    headers: dict[str, str] | None = None
+
+    @property
+    def name(self) -> str:
+        """Label of the request in the report."""
+        return f"{self.method} {self.path}"
+
+    @classmethod
+    def parse(cls, text: str) -> "RequestSpec":
+        """Parse ``METHOD /path`` or ``METHOD /path weight``.
+
+        Args:
+            text: Request description.
+
+        Returns:
+            The request spec.
+
+        Raises:
+            ValueError: If the text is malformed.
+        """
+        match text.split():
+            case [method, path] if path.startswith("/"):
+                return cls(method.upper(), path)
+            case [method, path, weight] if path.startswith("/"):
+                return cls(method.upper(), path, float(weight))
+        raise ValueError(f"Expected 'METHOD /path [weight]', got {text!r}")
+
+
+@dataclass
+class Sample:
+    """Outcome of one request."""
+
+    name: str
+    latency: float
+    status_code: int | None = None
+    error: str | None = None
+
+    @property
+    def failed(self) -> bool:
+        """Whether the request raised or the server answered with a 5xx status."""
+        return self.error is not None or (self.status_code is not None and self.status_code >= 500)
+
+    def good(self, slo: float | None = None) -> bool:
+        """Whether the server answered successfully, within ``slo`` seconds if given."""
+        return self.status_code is not None and self.status_code < 400 and (slo is None or self.latency <= slo)
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted values, 0 for no values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def latency_summary(samples: list[Sample]) -> dict[str, float]:
+    """Latency percentiles of some samples, in milliseconds."""
+    latencies = sorted(sample.latency * 1000 for sample in samples)
+    return {
+        "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "p50": round(percentile(latencies, 50), 3),
+        "p95": round(percentile(latencies, 95), 3),
+        "p99": round(percentile(latencies, 99), 3),
+        "max": round(latencies[-1], 3) if latencies else 0.0,
+    }
+
+
+@dataclass
+class LoadReport:
+    """Results of a load test."""
+
+    target: str
+    concurrency: int
+    rate: float | None
+    elapsed: float
+    samples: list[Sample] = field(default_factory=list)
+    slo: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summarize the samples: totals, throughput, goodput, error rate and latency, overall and per request.
+
+        Goodput counts the successful responses, within the latency objective if one is set:
+        an overloaded server may keep its throughput up with answers that come too late.
+        """
+        by_name: dict[str, list[Sample]] = defaultdict(list)
+        for sample in self.samples:
+            by_name[sample.name].append(sample)
+        failed = sum(sample.failed for sample in self.samples)
+        good = sum(sample.good(self.slo) for sample in self.samples)
+        return {
+            "target": self.target,
+            "mode": "closed" if self.rate is None else "open",
+            "concurrency": self.concurrency,
+            "rate": self.rate,
+            "elapsed_s": round(self.elapsed, 3),
+            "requests": len(self.samples),
+            "throughput_rps": round(len(self.samples) / self.elapsed, 2) if self.elapsed else 0.0,
+            "slo_ms": round(self.slo * 1000, 3) if self.slo is not None else None,
+            "goodput_rps": round(good / self.elapsed, 2) if self.elapsed else 0.0,
+            "errors": failed,
+            "error_rate": round(failed / len(self.samples), 4) if self.samples else 0.0,
+            "status_codes": dict(
+                sorted(Counter(str(sample.status_code) for sample in self.samples if sample.status_code).items())
+            ),
+            "exceptions": dict(Counter(sample.error for sample in self.samples if sample.error)),
+            "latency_ms": latency_summary(self.samples),
+            "requests_by_name": {
+                name: {
+                    "requests": len(samples),
+                    "errors": sum(sample.failed for sample in samples),
+                    "latency_ms": latency_summary(samples),
+                }
+                for name, samples in sorted(by_name.items())
+            },
+        }
+
+
+async def run_load(
+    client: AsyncApiClient,
+    mix: list[RequestSpec],
+    duration: float,
+    concurrency: int = 10,
+    rate: float | None = None,
+    seed: int | None = None,
+    slo: float | None = None,
+) -> LoadReport:
+    """Send requests from a mix for a while and collect their outcomes.
+
+    Args:
+        client: Client to send the requests with.
+        mix: Requests to choose from, by weight.
+        duration: Seconds to keep starting requests for.
+        concurrency: Maximum number of requests in flight.
+        rate: Requests started per second (open loop); None sends back to back (closed loop).
+        seed: Seed of the request choice, for a reproducible sequence.
+        slo: Latency objective in seconds, above which a response does not count as goodput.
+
+    Returns:
+        The outcome of every request.
+    """
+    loop = asyncio.get_running_loop()
+    choose = random.Random(seed).choices  # noqa: S311
+    weights = [spec.weight for spec in mix]
+    samples: list[Sample] = []
+
+    async def send(spec: RequestSpec, scheduled: float) -> None:
+        try:
+            response = await client.request(spec.method, spec.path, body=spec.body, headers=spec.headers)
+        except Exception as exc:
+            samples.append(Sample(spec.name, loop.time() - scheduled, error=type(exc).__name__))
+        else:
+            samples.append(Sample(spec.name, loop.time() - scheduled, response["status_code"]))
+
+    start = loop.time()
+    deadline = start + duration
+    if rate is None:
+
+        async def worker() -> None:
+            while (now := loop.time()) < deadline:
+                await send(choose(mix, weights)[0], now)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    else:
+        slots = asyncio.Semaphore(concurrency)
+
+        async def bounded(spec: RequestSpec, scheduled: float) -> None:
+            async with slots:
+                await send(spec, scheduled)
+
+        async with asyncio.TaskGroup() as group:
+            for index in range(math.ceil(duration * rate)):
+                scheduled = start + index / rate
+                await asyncio.sleep(max(scheduled - loop.time(), 0))
+                group.create_task(bounded(choose(mix, weights)[0], scheduled))
+
+    return LoadReport(client.base_url, concurrency, rate, loop.time() - start, samples, slo)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0] if __doc__ else None)
+    where = parser.add_mutually_exclusive_group()
+    where.add_argument(
+        "--target", choices=list(TARGETS), default=next(iter(TARGETS)), help="Docker Compose service to load"
+    )
+    where.add_argument("--url", help="Base URL of a server to load, e.g. a deployed Function URL")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to send requests for")
+    parser.add_argument("--concurrency", type=int, default=10, help="Maximum requests in flight")
+    parser.add_argument("--rate", type=float, help="Requests per second (open loop); back to back if unset")
+    parser.add_argument(
+        "--mix",
+        action="append",
+        type=RequestSpec.parse,
+        help="Request as 'METHOD /path [weight]', repeatable; the health check by default",
+    )
+    parser.add_argument("--mix-file", type=Path, help="JSON list of {method, path, weight, body, headers}")
+    parser.add_argument("--seed", type=int, help="Seed of the request choice")
+    parser.add_argument("--slo", type=float, help="Latency objective in ms; slower responses are not goodput")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Request timeout in seconds")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here instead of stdout")
+    parser.add_argument(
+        "--max-error-rate", type=float, default=0.0, help="Exit with status 1 above this share of failed requests"
+    )
+    return parser.parse_args(argv)
+
+
+async def main(
+    argv: list[str] | None = None,
+    client_factory: Callable[..., AsyncApiClient] = AsyncApiClient,
+) -> int:
+    """Run a load test from command line arguments and print or write its report.
+
+    Args:
+        argv: Command line arguments, ``sys.argv`` by default.
+        client_factory: Builds the client from AsyncApiClient's arguments.
+
+    Returns:
+        Exit status: 1 if the error rate exceeds ``--max-error-rate``, else 0.
+    """
+    args = parse_args(argv)
+    if args.url:
+        base_url, lambda_mode, health_path = args.url, False, "/health"
+    else:
+        base_url, lambda_mode, health_path = TARGETS[args.target]
+    mix = args.mix or [RequestSpec("GET", health_path)]
+    if args.mix_file:
+        mix = [RequestSpec(**spec) for spec in json.loads(args.mix_file.read_text())]
+
+    client = client_factory(
+        base_url=base_url or None, lambda_mode=lambda_mode, timeout=args.timeout, max_connections=args.concurrency
+    )
+    async with client:
+        slo = args.slo / 1000 if args.slo is not None else None
+        report = await run_load(client, mix, args.duration, args.concurrency, args.rate, args.seed, slo)
+    summary = report.to_dict()
+    output = json.dumps(summary, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+    return 1 if summary["error_rate"] > args.max_error_rate else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))